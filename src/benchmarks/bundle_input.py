@@ -0,0 +1,38 @@
+import argparse
+import time
+
+from ..jroh import bundle, parser
+from .spec_generator import SpecConfig, generate_specs
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--namespace_count", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    yaml_file_path_2_file_data = generate_specs(
+        SpecConfig(namespace_count=args.namespace_count)
+    )
+    bundle_file_path_2_file_data = {
+        "specs.jrohb": bundle.dump_bundle(
+            parser.parse_files(yaml_file_path_2_file_data).file_path_2_results
+        )
+    }
+    yaml_time = _measure(yaml_file_path_2_file_data, args.repeat)
+    bundle_time = _measure(bundle_file_path_2_file_data, args.repeat)
+    print(
+        f"files={args.namespace_count} yaml_time={yaml_time * 1e3:.1f}ms bundle_time={bundle_time * 1e3:.1f}ms speedup={yaml_time / bundle_time:.1f}x"
+    )
+
+
+def _measure(file_path_2_file_data: dict[str, str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        parser.parse_files(file_path_2_file_data)
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+if __name__ == "__main__":
+    main()
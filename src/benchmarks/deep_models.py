@@ -0,0 +1,50 @@
+import argparse
+import json
+import time
+
+from ..jroh import parser, resolver
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--depths", type=int, nargs="+", default=[1000, 10000])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    for depth in args.depths:
+        specs = parser.parse_files({"deep.json": _generate_spec(depth)}).specs
+        times = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            resolver.resolve_specs(specs)
+            times.append(time.perf_counter() - t)
+        resolve_time = min(times)
+        print(
+            f"depth={depth} resolve_time={resolve_time * 1e3:.1f}ms time_per_model={resolve_time / depth * 1e6:.2f}us"
+        )
+
+
+def _generate_spec(depth: int) -> str:
+    # a chain of structs, each one containing the next, with the last one referring
+    # back to the first through an optional field
+    raw_models: dict[str, dict] = {}
+    for i in range(depth):
+        raw_fields: dict[str, dict] = {
+            "Name": {"type": "string"},
+            "Next": {"type": f"Model{(i + 1) % depth}"},
+        }
+        if i == depth - 1:
+            raw_fields["Next"]["is_optional"] = True
+        raw_models[f"Model{i}"] = {"type": "struct", "fields": raw_fields}
+    raw_spec = {
+        "namespace": "Deep",
+        "services": {"Test": {"version": "1.0.0"}},
+        "methods": {
+            "Do-It": {"service_id": "Test", "params": {"X": {"type": "Model0"}}}
+        },
+        "models": raw_models,
+    }
+    return json.dumps(raw_spec)
+
+
+if __name__ == "__main__":
+    main()
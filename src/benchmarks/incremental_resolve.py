@@ -0,0 +1,44 @@
+import argparse
+import time
+
+from ..jroh import parser, resolver
+from .spec_generator import SpecConfig, generate_specs
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--namespace_count", type=int, default=50)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    file_path_2_file_data = generate_specs(
+        SpecConfig(namespace_count=args.namespace_count)
+    )
+    specs = parser.parse_files(file_path_2_file_data).specs
+    times = []
+    for _ in range(args.repeat):
+        t = time.perf_counter()
+        resolver.resolve_specs(specs)
+        times.append(time.perf_counter() - t)
+    print(f"full resolve_time={min(times) * 1e3:.1f}ms")
+    # each namespace refers to the one before, so the first file changed affects
+    # the fewest namespaces, and the last one all of them
+    file_paths = list(file_path_2_file_data.keys())
+    for file_path in (file_paths[0], file_paths[len(file_paths) // 2], file_paths[-1]):
+        incremental_resolver = resolver.IncrementalResolver()
+        for spec in specs:
+            incremental_resolver.add_spec(spec)
+        incremental_resolver.resolve()
+        times = []
+        for _ in range(args.repeat):
+            spec = parser.parse_files(
+                {file_path: file_path_2_file_data[file_path]}
+            ).specs[0]
+            t = time.perf_counter()
+            incremental_resolver.replace_spec(spec)
+            incremental_resolver.resolve()
+            times.append(time.perf_counter() - t)
+        print(f"file_path={file_path} resolve_time={min(times) * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
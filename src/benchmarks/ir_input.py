@@ -0,0 +1,42 @@
+import argparse
+import time
+from typing import Any, Callable
+
+from ..jroh import ir, parser, resolver
+from .spec_generator import SpecConfig, generate_specs
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--namespace_count", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    file_path_2_file_data = generate_specs(
+        SpecConfig(namespace_count=args.namespace_count)
+    )
+    ir_data = ir.dump_ir(
+        resolver.resolve_specs(
+            parser.parse_files(file_path_2_file_data).specs
+        ).merged_specs
+    )
+    parse_and_resolve_time = _measure(
+        lambda: resolver.resolve_specs(parser.parse_files(file_path_2_file_data).specs),
+        args.repeat,
+    )
+    ir_time = _measure(lambda: ir.load_ir(ir_data), args.repeat)
+    print(
+        f"files={args.namespace_count} parse_and_resolve_time={parse_and_resolve_time * 1e3:.1f}ms load_ir_time={ir_time * 1e3:.1f}ms speedup={parse_and_resolve_time / ir_time:.1f}x ir_size={len(ir_data)}"
+    )
+
+
+def _measure(function: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import json
+import time
+
+import yaml
+
+from ..jroh import parser
+from .spec_generator import SpecConfig, generate_specs
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--namespace_count", type=int, default=20)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    yaml_file_path_2_file_data = generate_specs(
+        SpecConfig(namespace_count=args.namespace_count)
+    )
+    json_file_path_2_file_data = {
+        file_path.removesuffix(".yaml") + ".json": json.dumps(yaml.safe_load(file_data))
+        for file_path, file_data in yaml_file_path_2_file_data.items()
+    }
+    yaml_time = _measure(yaml_file_path_2_file_data, args.repeat)
+    json_time = _measure(json_file_path_2_file_data, args.repeat)
+    print(
+        f"files={args.namespace_count} yaml_time={yaml_time * 1e3:.1f}ms json_time={json_time * 1e3:.1f}ms speedup={yaml_time / json_time:.1f}x"
+    )
+
+
+def _measure(file_path_2_file_data: dict[str, str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        parser.parse_files(file_path_2_file_data)
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+if __name__ == "__main__":
+    main()
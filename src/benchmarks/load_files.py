@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from ..jroh import compiler, parser
+
+_FILE_DATA_TEMPLATE = """\
+namespace: Ns{i}
+services:
+  Foo:
+    version: 1.0.0
+methods:
+  Do-Something:
+    service_id: Foo
+    params:
+      Bar:
+        type: Bar
+    results:
+      Baz:
+        type: string
+        max_length: 100
+models:
+  Bar:
+    type: struct
+    fields:
+      X:
+        type: int32
+        min: 1
+      Y:
+        type: string
+        is_optional: true
+"""
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--file_counts", type=int, nargs="+", default=[10, 100, 1000, 5000]
+    )
+    arg_parser.add_argument("--max_per_file_time_ratio", type=float, default=3.0)
+    args = arg_parser.parse_args()
+    per_file_times = []
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        for file_count in args.file_counts:
+            file_paths = _make_files(temp_dir_path, file_count)
+            t = time.perf_counter()
+            file_path_2_file_data = compiler._load_files(file_paths)
+            parser.parse_files(file_path_2_file_data)
+            elapsed_time = time.perf_counter() - t
+            per_file_time = elapsed_time / file_count
+            per_file_times.append(per_file_time)
+            print(
+                f"files={file_count} time={elapsed_time:.3f}s per_file_time={per_file_time * 1e6:.1f}us"
+            )
+    # the smallest run is dominated by fixed costs, hence it's excluded from the check
+    baseline_per_file_time = min(per_file_times[1:] or per_file_times)
+    for file_count, per_file_time in zip(args.file_counts, per_file_times):
+        if per_file_time > baseline_per_file_time * args.max_per_file_time_ratio:
+            print(
+                f"FAIL: non-linear scaling: files={file_count} per_file_time={per_file_time * 1e6:.1f}us baseline_per_file_time={baseline_per_file_time * 1e6:.1f}us",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+
+def _make_files(dir_path: str, file_count: int) -> list[str]:
+    file_paths = []
+    for i in range(file_count):
+        file_path = os.path.join(dir_path, f"{i}.yaml")
+        if not os.path.exists(file_path):
+            with open(file_path, "w") as f:
+                f.write(_FILE_DATA_TEMPLATE.format(i=i))
+        file_paths.append(file_path)
+    return file_paths
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from ..jroh import parser, resolver
+from .spec_generator import SpecConfig, generate_specs
+
+# the memory retained by the spec graph of a parsed and resolved spec, per field
+MAX_BYTES_PER_FIELD = 320
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--namespace_count", type=int, default=10)
+    arg_parser.add_argument(
+        "--max_bytes_per_field", type=int, default=MAX_BYTES_PER_FIELD
+    )
+    args = arg_parser.parse_args()
+    config = SpecConfig(
+        namespace_count=args.namespace_count,
+        model_count=50,
+        field_count=40,
+        nesting_depth=0,
+    )
+    file_path_2_file_data = generate_specs(config)
+    retained_memory, field_count = measure_retained_memory(file_path_2_file_data)
+    bytes_per_field = retained_memory / field_count
+    print(
+        f"fields={field_count} retained_memory={retained_memory / (1 << 20):.1f}MB bytes_per_field={bytes_per_field:.0f}"
+    )
+    if bytes_per_field > args.max_bytes_per_field:
+        print(
+            f"FAIL: memory budget exceeded: bytes_per_field={bytes_per_field:.0f} max_bytes_per_field={args.max_bytes_per_field}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def measure_retained_memory(file_path_2_file_data: dict[str, str]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        specs = parser.parse_files(file_path_2_file_data).specs
+        merged_specs = resolver.resolve_specs(specs).merged_specs
+        del merged_specs
+        gc.collect()
+        retained_memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    field_count = 0
+    for spec in specs:
+        for model in spec.models:
+            if model.type == "struct":
+                field_count += len(model.struct().fields)
+        for method in spec.methods:
+            for fields in (method.params, method.results):
+                if fields is not None:
+                    field_count += len(fields.fields)
+    return retained_memory, field_count
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from ..jroh import go_generator, parser, resolver, translator
+from .spec_generator import SpecConfig, generate_specs
+
+_SCENARIOS = {
+    "small": SpecConfig(namespace_count=3),
+    "wide": SpecConfig(
+        namespace_count=20,
+        method_count=2,
+        model_count=3,
+        nesting_depth=1,
+        cross_namespace_ref_count=3,
+    ),
+    "deep": SpecConfig(
+        namespace_count=2, model_count=4, field_count=20, nesting_depth=6
+    ),
+}
+
+_BASELINES_FILE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+_OUTPUT_PACKAGE_PATH = "example.com/bench"
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--scenarios", nargs="+", choices=_SCENARIOS.keys(), default=list(_SCENARIOS)
+    )
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--max_time_ratio", type=float, default=1.5)
+    arg_parser.add_argument("--max_peak_memory_ratio", type=float, default=1.2)
+    arg_parser.add_argument(
+        "--update_baselines",
+        action="store_true",
+        help="record the measurements as the new baselines instead of checking them",
+    )
+    args = arg_parser.parse_args()
+    scenario_2_stage_2_record: dict[str, dict[str, dict[str, float]]] = {}
+    for scenario in args.scenarios:
+        stage_2_record = _run_scenario(_SCENARIOS[scenario], args.repeat)
+        for stage, record in stage_2_record.items():
+            print(
+                f"scenario={scenario} stage={stage} time={record['time'] * 1e3:.1f}ms peak_memory={record['peak_memory'] / (1 << 20):.1f}MB"
+            )
+        scenario_2_stage_2_record[scenario] = stage_2_record
+    if args.update_baselines:
+        _update_baselines(scenario_2_stage_2_record)
+        return
+    failures = _check_baselines(
+        scenario_2_stage_2_record,
+        args.max_time_ratio,
+        args.max_peak_memory_ratio,
+    )
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if len(failures) >= 1:
+        sys.exit(1)
+
+
+def _run_scenario(config: SpecConfig, repeat: int) -> dict[str, dict[str, float]]:
+    file_path_2_file_data = generate_specs(config)
+    specs = parser.parse_files(file_path_2_file_data).specs
+    merged_specs = resolver.resolve_specs(specs).merged_specs
+    stages: list[tuple[str, Callable[[], Any]]] = [
+        ("parse", lambda: parser.parse_files(file_path_2_file_data)),
+        ("resolve", lambda: resolver.resolve_specs(specs)),
+        ("translate", lambda: translator.translate_specs(merged_specs)),
+        (
+            "generate",
+            lambda: go_generator.generate_code(_OUTPUT_PACKAGE_PATH, merged_specs),
+        ),
+    ]
+    stage_2_record: dict[str, dict[str, float]] = {}
+    for stage, function in stages:
+        times = []
+        calibration_times = []
+        for _ in range(repeat):
+            calibration_times.append(_calibrate())
+            t = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - t)
+        tracemalloc.start()
+        try:
+            function()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        stage_2_record[stage] = {
+            "time": min(times),
+            "calibration_time": min(calibration_times),
+            "peak_memory": peak_memory,
+        }
+    return stage_2_record
+
+
+def _calibrate() -> float:
+    # a fixed pure-Python workload, run next to each measurement, by which times are
+    # normalized so that baselines remain meaningful across machines and loads
+    t = time.perf_counter()
+    d: dict[str, list[str]] = {}
+    for i in range(100000):
+        d.setdefault(str(i % 1000), []).append(f"{i:x}")
+    return time.perf_counter() - t
+
+
+def _update_baselines(
+    scenario_2_stage_2_record: dict[str, dict[str, dict[str, float]]],
+) -> None:
+    baselines = _load_baselines()
+    for scenario, stage_2_record in scenario_2_stage_2_record.items():
+        baselines[scenario] = {
+            stage: {
+                "normalized_time": record["time"] / record["calibration_time"],
+                "peak_memory": record["peak_memory"],
+            }
+            for stage, record in stage_2_record.items()
+        }
+    with open(_BASELINES_FILE_PATH, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _check_baselines(
+    scenario_2_stage_2_record: dict[str, dict[str, dict[str, float]]],
+    max_time_ratio: float,
+    max_peak_memory_ratio: float,
+) -> list[str]:
+    baselines = _load_baselines()
+    failures = []
+    for scenario, stage_2_record in scenario_2_stage_2_record.items():
+        for stage, record in stage_2_record.items():
+            baseline = baselines.get(scenario, {}).get(stage)
+            if baseline is None:
+                failures.append(f"baseline missing: scenario={scenario} stage={stage}")
+                continue
+            time_ratio = (
+                record["time"]
+                / record["calibration_time"]
+                / baseline["normalized_time"]
+            )
+            if time_ratio > max_time_ratio:
+                failures.append(
+                    f"time regression: scenario={scenario} stage={stage} time_ratio={time_ratio:.2f} max_time_ratio={max_time_ratio}"
+                )
+            peak_memory_ratio = record["peak_memory"] / baseline["peak_memory"]
+            if peak_memory_ratio > max_peak_memory_ratio:
+                failures.append(
+                    f"peak memory regression: scenario={scenario} stage={stage} peak_memory_ratio={peak_memory_ratio:.2f} max_peak_memory_ratio={max_peak_memory_ratio}"
+                )
+    return failures
+
+
+def _load_baselines() -> dict:
+    try:
+        with open(_BASELINES_FILE_PATH, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+
+import yaml
+
+
+@dataclass
+class SpecConfig:
+    namespace_count: int = 10
+    service_count: int = 2
+    method_count: int = 5
+    model_count: int = 10
+    field_count: int = 8
+    nesting_depth: int = 2
+    cross_namespace_ref_count: int = 1
+    pattern_count: int = 2
+    enum_count: int = 2
+    enum_constant_count: int = 4
+    error_count: int = 3
+
+
+def generate_specs(config: SpecConfig) -> dict[str, str]:
+    file_path_2_file_data: dict[str, str] = {}
+    for i in range(config.namespace_count):
+        raw_spec = _generate_raw_spec(config, i)
+        file_path_2_file_data[f"ns{i}.yaml"] = yaml.dump(
+            raw_spec, sort_keys=False, allow_unicode=True
+        )
+    return file_path_2_file_data
+
+
+def _generate_raw_spec(config: SpecConfig, i: int) -> dict:
+    raw_services = {}
+    raw_methods = {}
+    for j in range(config.service_count):
+        service_id = f"Service{j}"
+        raw_services[service_id] = {"version": "1.0.0"}
+        for k in range(config.method_count):
+            m = j * config.method_count + k
+            raw_method: dict = {"service_id": service_id, "summary": f"Method {m}"}
+            if config.model_count >= 1:
+                raw_method["params"] = {
+                    "Request": {"type": f"Model{m % config.model_count}"}
+                }
+                raw_method["results"] = {
+                    "Response": {
+                        "type": f"Model{(m + 1) % config.model_count}",
+                        "is_repeated": True,
+                        "max_count": 100,
+                    }
+                }
+            if config.error_count >= 1:
+                raw_method["error_cases"] = {f"Error{m % config.error_count}": {}}
+            raw_methods[f"Method{m}"] = raw_method
+    raw_models = {}
+    for k in range(config.pattern_count):
+        raw_models[f"Code{k}"] = {
+            "type": "string",
+            "pattern": f"^[A-Z]{{{k + 1}}}-[0-9]+$",
+            "example": "A" * (k + 1) + "-1",
+        }
+    for k in range(config.enum_count):
+        raw_models[f"Status{k}"] = {
+            "type": "enum",
+            "underlying_type": "int32",
+            "constants": {
+                f"Status{k}-Value{v}": {"value": v + 1}
+                for v in range(config.enum_constant_count)
+            },
+        }
+    for k in range(config.model_count):
+        model_id = f"Model{k}"
+        for d in range(config.nesting_depth, -1, -1):
+            model_id2 = model_id if d == 0 else f"{model_id}-Level{d}"
+            raw_fields = _generate_raw_fields(config, i, k)
+            if d < config.nesting_depth:
+                raw_fields["Child"] = {"type": f"{model_id}-Level{d + 1}"}
+            raw_models[model_id2] = {
+                "type": "struct",
+                "fields": raw_fields,
+                "description": f"Model {k} at level {d}.",
+            }
+    raw_errors = {}
+    for k in range(config.error_count):
+        raw_errors[f"Error{k}"] = {
+            "code": 1000 + i * config.error_count + k,
+            "status_code": 422,
+        }
+    raw_spec: dict = {"namespace": f"Ns{i}"}
+    for key, value in (
+        ("services", raw_services),
+        ("methods", raw_methods),
+        ("models", raw_models),
+        ("errors", raw_errors),
+    ):
+        if len(value) >= 1:
+            raw_spec[key] = value
+    return raw_spec
+
+
+def _generate_raw_fields(config: SpecConfig, i: int, k: int) -> dict:
+    raw_fields: dict = {}
+    for f in range(config.field_count):
+        field_id = f"Field{f}"
+        kind = f % 5
+        if kind == 0:
+            raw_fields[field_id] = {"type": "int32", "min": 0, "max": 1000}
+        elif kind == 1:
+            raw_fields[field_id] = {
+                "type": "string",
+                "max_length": 100,
+                "is_optional": True,
+            }
+        elif kind == 2 and config.pattern_count >= 1:
+            raw_fields[field_id] = {"type": f"Code{(k + f) % config.pattern_count}"}
+        elif kind == 3 and config.enum_count >= 1:
+            raw_fields[field_id] = {"type": f"Status{(k + f) % config.enum_count}"}
+        else:
+            raw_fields[field_id] = {
+                "type": "float64",
+                "is_repeated": True,
+                "max_count": 10,
+            }
+    # refer to lower-numbered namespaces only to keep namespace dependencies acyclic
+    for r in range(min(config.cross_namespace_ref_count, i)):
+        raw_fields[f"Remote{r}"] = {
+            "type": f"Ns{i - r - 1}.Model{k}",
+            "is_optional": True,
+        }
+    return raw_fields
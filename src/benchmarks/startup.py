@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# the import time of the jrohc entry point, the interpreter's own startup excluded
+COLD_START_BUDGET = 0.15
+
+HEAVY_MODULES = ("mako", "yaml", "re2")
+
+_ROOT_DIR_PATH = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--budget", type=float, default=COLD_START_BUDGET)
+    arg_parser.add_argument("--top", type=int, default=10)
+    args = arg_parser.parse_args()
+    import_times = []
+    for _ in range(args.repeat):
+        import_time, module_2_import_time = measure_import_time()
+        import_times.append(import_time)
+    print(f"module=src.jroh.compiler import_time={min(import_times) * 1e3:.1f}ms")
+    for module, import_time in sorted(
+        module_2_import_time.items(), key=lambda item: item[1], reverse=True
+    )[1 : args.top + 1]:
+        print(f"  module={module} cumulative_import_time={import_time * 1e3:.1f}ms")
+    heavy_modules = sorted(
+        module
+        for module in module_2_import_time.keys()
+        if module.split(".", 1)[0] in HEAVY_MODULES
+    )
+    if len(heavy_modules) >= 1:
+        print(f"FAIL: heavy modules imported: {heavy_modules}", file=sys.stderr)
+        sys.exit(1)
+    if min(import_times) > args.budget:
+        print(
+            f"FAIL: cold-start budget exceeded: import_time={min(import_times) * 1e3:.1f}ms budget={args.budget * 1e3:.1f}ms",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def measure_import_time(
+    module: str = "src.jroh.compiler",
+) -> tuple[float, dict[str, float]]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_ROOT_DIR_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    module_2_import_time: dict[str, float] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_import_time, module2 = line.split("|")
+        if not cumulative_import_time.strip().isdigit():
+            # the header line
+            continue
+        module_2_import_time[module2.strip()] = int(cumulative_import_time) / 1e6
+    return module_2_import_time[module], module_2_import_time
+
+
+def run_compiler(argv: list[str]) -> tuple[int, set[str]]:
+    # runs jrohc in a fresh interpreter and reports the modules it has imported
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys\n"
+            "from src.jroh import compiler\n"
+            f"sys.argv = {json.dumps(['jrohc', *argv])}\n"
+            "try:\n"
+            "    compiler.main()\n"
+            "    exit_code = 0\n"
+            "except SystemExit as e:\n"
+            "    exit_code = e.code\n"
+            "print(json.dumps([exit_code, sorted(sys.modules)]))\n",
+        ],
+        cwd=_ROOT_DIR_PATH,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=True,
+    )
+    exit_code, modules = json.loads(process.stdout.splitlines()[-1])
+    return exit_code, set(modules)
+
+
+if __name__ == "__main__":
+    main()
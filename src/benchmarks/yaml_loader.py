@@ -0,0 +1,54 @@
+import argparse
+import glob
+import os
+import time
+from typing import Any
+from unittest import mock
+
+import yaml
+
+from ..jroh import parser
+from .spec_generator import SpecConfig, generate_specs
+
+_PETSTORE_FILE_PATTERN = os.path.join(
+    os.path.dirname(__file__), "..", "..", "examples", "2-petstore", "*.yaml"
+)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    petstore_file_path_2_file_data = {}
+    for file_path in sorted(glob.glob(_PETSTORE_FILE_PATTERN)):
+        with open(file_path, "r") as f:
+            petstore_file_path_2_file_data[file_path] = f.read()
+    # 100 models x 100 fields
+    synthetic_file_path_2_file_data = generate_specs(
+        SpecConfig(namespace_count=1, model_count=100, field_count=100, nesting_depth=0)
+    )
+    for name, file_path_2_file_data in (
+        ("petstore", petstore_file_path_2_file_data),
+        ("synthetic_10k_fields", synthetic_file_path_2_file_data),
+    ):
+        python_time = _measure(file_path_2_file_data, yaml.SafeLoader, args.repeat)
+        c_time = _measure(file_path_2_file_data, yaml.CSafeLoader, args.repeat)
+        print(
+            f"input={name} python_loader_time={python_time * 1e3:.1f}ms c_loader_time={c_time * 1e3:.1f}ms speedup={python_time / c_time:.1f}x"
+        )
+
+
+def _measure(
+    file_path_2_file_data: dict[str, str], yaml_loader: Any, repeat: int
+) -> float:
+    times = []
+    with mock.patch.object(parser, "_YAML_LOADER", yaml_loader):
+        for _ in range(repeat):
+            t = time.perf_counter()
+            parser.parse_files(file_path_2_file_data)
+            times.append(time.perf_counter() - t)
+    return min(times)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .api import CompileResults, compile
+    from .ir import InvalidIRError, load_ir
+
+__all__ = ["CompileResults", "compile", "InvalidIRError", "load_ir"]
+
+
+def __getattr__(name: str) -> Any:
+    # the api and ir modules are imported on first use to keep "import jroh" cheap
+    if name in ("CompileResults", "compile"):
+        from . import api
+
+        return getattr(api, name)
+    if name in ("InvalidIRError", "load_ir"):
+        from . import ir
+
+        return getattr(ir, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
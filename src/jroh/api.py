@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from . import parse_cache, timings
+from .spec import Spec
+
+# go_generator, parser, resolver and translator are imported lazily, see compiler.py
+
+OAPI3_FILE_HEADER = "# File generated by jrohc. DO NOT EDIT.\n"
+GO_FILE_HEADER = "// Code generated by jrohc. DO NOT EDIT.\n\n"
+
+
+@dataclass
+class CompileResults:
+    ignored_node_uris: list[str]
+    unused_node_uris: list[str]
+    oapi3_file_path_2_file_data: dict[str, str]
+    go_file_path_2_file_data: dict[str, str]
+
+
+def compile(
+    file_path_2_file_data: dict[str, str],
+    oapi3: bool = True,
+    go_output_package_path: Optional[str] = None,
+    cache: Optional[parse_cache.AnyParseCache] = None,
+    jobs: int = 1,
+    format_go_code: bool = True,
+    only: Optional[list[str]] = None,
+) -> CompileResults:
+    from . import parser, resolver
+
+    results1 = parser.parse_files(file_path_2_file_data, cache, jobs)
+    results2 = resolver.resolve_specs(results1.specs, only=only)
+    namespace_2_outputs = translate_and_generate(
+        results2.merged_specs, oapi3, go_output_package_path, jobs
+    )
+    outputs = Outputs({}, {})
+    for outputs2 in namespace_2_outputs.values():
+        outputs.merge(outputs2)
+    if oapi3:
+        from . import translator
+
+        outputs.oapi3_file_path_2_file_data.update(
+            translator.translate_common().file_path_2_file_data
+        )
+    oapi3_file_path_2_file_data = {
+        file_path: OAPI3_FILE_HEADER + file_data
+        for file_path, file_data in outputs.oapi3_file_path_2_file_data.items()
+    }
+    go_file_path_2_file_data = {
+        file_path: GO_FILE_HEADER + file_data
+        for file_path, file_data in outputs.go_file_path_2_file_data.items()
+    }
+    if format_go_code and len(go_file_path_2_file_data) >= 1:
+        from . import go_generator
+
+        go_file_path_2_file_data = go_generator.format_go_code_data(
+            go_file_path_2_file_data
+        )
+    return CompileResults(
+        ignored_node_uris=results1.ignored_node_uris,
+        unused_node_uris=results2.unused_node_uris,
+        oapi3_file_path_2_file_data=oapi3_file_path_2_file_data,
+        go_file_path_2_file_data=go_file_path_2_file_data,
+    )
+
+
+@dataclass
+class Outputs:
+    oapi3_file_path_2_file_data: dict[str, str]
+    go_file_path_2_file_data: dict[str, str]
+
+    def merge(self, other: "Outputs") -> None:
+        self.oapi3_file_path_2_file_data.update(other.oapi3_file_path_2_file_data)
+        self.go_file_path_2_file_data.update(other.go_file_path_2_file_data)
+
+
+def translate_and_generate(
+    merged_specs: list[Spec],
+    oapi3: bool,
+    output_package_path: Optional[str],
+    jobs: int,
+) -> dict[str, Outputs]:
+    tasks: list[tuple[str, int]] = []
+    if oapi3:
+        tasks.extend((_TRANSLATION, i) for i in range(len(merged_specs)))
+    if output_package_path is not None:
+        tasks.extend((_GENERATION, i) for i in range(len(merged_specs)))
+    if jobs >= 2 and len(tasks) >= 2:
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor(
+            min(jobs, len(tasks)),
+            initializer=_init_worker,
+            initargs=(merged_specs, output_package_path, timings.enabled()),
+        ) as executor:
+            task_results = []
+            for task_result, records in executor.map(_do_task_in_worker, tasks):
+                timings.merge(records)
+                task_results.append(task_result)
+    else:
+        task_results = [
+            _do_task(task, merged_specs, output_package_path) for task in tasks
+        ]
+    namespace_2_outputs = {
+        merged_spec.namespace: Outputs({}, {}) for merged_spec in merged_specs
+    }
+    for (task_kind, i), file_path_2_file_data in zip(tasks, task_results):
+        outputs = namespace_2_outputs[merged_specs[i].namespace]
+        if task_kind == _TRANSLATION:
+            outputs.oapi3_file_path_2_file_data = file_path_2_file_data
+        else:
+            outputs.go_file_path_2_file_data = file_path_2_file_data
+    return namespace_2_outputs
+
+
+_TRANSLATION = "translation"
+_GENERATION = "generation"
+
+_worker_merged_specs: list[Spec] = []
+_worker_output_package_path: Optional[str] = None
+_worker_timings_enabled = False
+
+
+def _init_worker(
+    merged_specs: list[Spec], output_package_path: Optional[str], timings_enabled: bool
+) -> None:
+    global _worker_merged_specs, _worker_output_package_path, _worker_timings_enabled
+    _worker_merged_specs = merged_specs
+    _worker_output_package_path = output_package_path
+    _worker_timings_enabled = timings_enabled
+
+
+def _do_task_in_worker(
+    task: tuple[str, int]
+) -> tuple[dict[str, str], Optional[timings.Records]]:
+    return timings.call_with_timings(
+        _worker_timings_enabled,
+        _do_task,
+        task,
+        _worker_merged_specs,
+        _worker_output_package_path,
+    )
+
+
+def _do_task(
+    task: tuple[str, int],
+    merged_specs: list[Spec],
+    output_package_path: Optional[str],
+) -> dict[str, str]:
+    task_kind, i = task
+    spec = merged_specs[i]
+    with timings.measure(timings.NAMESPACE, f"{spec.namespace}/{task_kind}"):
+        if task_kind == _TRANSLATION:
+            from . import translator
+
+            return translator.translate_spec(spec).file_path_2_file_data
+        from . import go_generator
+
+        assert output_package_path is not None
+        return go_generator.generate_code(
+            output_package_path, [spec]
+        ).file_path_2_file_data
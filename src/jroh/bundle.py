@@ -0,0 +1,76 @@
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+from . import spec_tree
+from .version import VERSION
+
+if TYPE_CHECKING:
+    from .parser import ParseFileResults
+
+BUNDLE_FILE_EXTENSION = ".jrohb"
+
+# bump whenever the layout of bundles, spec trees included, changes
+_FORMAT_VERSION = 1
+
+_FORMAT = "jroh-bundle"
+
+# a bundle is a header line followed by a payload line, both in JSON; the payload holds
+# the parsed spec trees of the bundled files, laid out as spec_tree dumps them
+
+
+def dump_bundle(file_path_2_results: dict[str, "ParseFileResults"]) -> str:
+    payload = json.dumps(
+        [
+            {
+                "file_path": file_path,
+                "ignored_node_uris": results.ignored_node_uris,
+                "spec": spec_tree.dump_spec(results.spec),
+            }
+            for file_path, results in file_path_2_results.items()
+        ],
+        separators=(",", ":"),
+    )
+    header = json.dumps(
+        {
+            "format": _FORMAT,
+            "format_version": _FORMAT_VERSION,
+            "jroh_version": VERSION,
+            "checksum": _make_checksum(payload),
+        }
+    )
+    return header + "\n" + payload + "\n"
+
+
+def load_bundle(file_data: str, file_path: str) -> dict[str, "ParseFileResults"]:
+    from .parser import InvalidSpecError, ParseFileResults
+
+    header_data, _, payload = file_data.partition("\n")
+    try:
+        header = json.loads(header_data)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != _FORMAT:
+        raise InvalidSpecError(f"not a bundle: file_path={file_path!r}")
+    format_version = header.get("format_version")
+    if format_version != _FORMAT_VERSION:
+        raise InvalidSpecError(
+            f"unsupported bundle format version: file_path={file_path!r} format_version={format_version!r} expected_format_version={_FORMAT_VERSION}"
+        )
+    payload = payload.removesuffix("\n")
+    if _make_checksum(payload) != header.get("checksum"):
+        raise InvalidSpecError(f"bundle checksum mismatch: file_path={file_path!r}")
+    loader = spec_tree.SpecTreeLoader()
+    file_path_2_results: dict[str, ParseFileResults] = {}
+    for raw_file in json.loads(payload):
+        file_path2 = raw_file["file_path"]
+        file_path_2_results[file_path2] = ParseFileResults(
+            ignored_node_uris=raw_file["ignored_node_uris"],
+            spec=loader.load_spec(raw_file["spec"], file_path2),
+            errors=[],
+        )
+    return file_path_2_results
+
+
+def _make_checksum(payload: str) -> str:
+    return "sha256:" + hashlib.sha256(payload.encode()).hexdigest()
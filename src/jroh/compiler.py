@@ -1,17 +1,47 @@
 import argparse
+import contextlib
+import cProfile
+import io
+import json
 import os
 import sys
-from typing import Optional
+import time
+import traceback
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
 
-from . import go_generator, parser, resolver, translator
+from . import api, parse_cache, timings, writer
+from .bundle import BUNDLE_FILE_EXTENSION
+
+# go_generator, parser, resolver and translator, along with Mako, PyYAML and re2, are
+# imported lazily by the stages that need them, which keeps the startup of jrohc fast
+if TYPE_CHECKING:
+    from . import parser, resolver
+    from .spec import Spec
 
 _PROG = "jrohc"
 
 
 def main() -> None:
+    if sys.argv[1:2] == ["bundle"]:
+        _run_bundle(_make_bundle_arg_parser().parse_args(sys.argv[2:]))
+        return
+    arg_parser = _make_arg_parser()
+    if "--persistent_worker" in sys.argv[1:]:
+        _run_persistent_worker(arg_parser)
+        return
+    args, file = arg_parser.parse_known_args(sys.argv[1:])
+    _run(args)
+
+
+def _make_arg_parser() -> argparse.ArgumentParser:
     arg_parser = argparse.ArgumentParser(prog=_PROG)
     arg_parser.add_argument(
-        "files", metavar="FILE", type=str, nargs="+", help="a JROH file to compile"
+        "files",
+        metavar="FILE",
+        type=str,
+        nargs="+",
+        help="a JROH file (.yaml or .json) to compile",
     )
 
     def oapi3_out(oapi3_out: str) -> str:
@@ -42,51 +72,700 @@ def main() -> None:
         type=go_out,
         help="output Go code to the directory as a package",
     )
-    args, file = arg_parser.parse_known_args(sys.argv[1:])
-    _compile_files(args.files, args.oapi3_out, args.go_out)
+    arg_parser.add_argument(
+        "--ir_out",
+        metavar="FILE",
+        type=str,
+        help="output the resolved specs to the file as JSON, to be loaded with jroh.load_ir",
+    )
+    arg_parser.add_argument(
+        "--cache_dir",
+        metavar="DIR",
+        type=str,
+        help="cache parsed JROH files in the directory",
+    )
+
+    def cache_size_limit(cache_size_limit: str) -> int:
+        cache_size_limit2 = int(cache_size_limit)
+        if cache_size_limit2 < 1:
+            raise ValueError()
+        return cache_size_limit2 << 20
+
+    arg_parser.add_argument(
+        "--cache_size_limit",
+        metavar="MB",
+        type=cache_size_limit,
+        default=parse_cache.DEFAULT_SIZE_LIMIT,
+        help="evict least recently used cache entries beyond the size",
+    )
+
+    def jobs(jobs: str) -> int:
+        jobs2 = int(jobs)
+        if jobs2 < 1:
+            raise ValueError()
+        return jobs2
+
+    arg_parser.add_argument(
+        "--jobs",
+        metavar="N",
+        type=jobs,
+        default=1,
+        help="parse JROH files and generate files with N processes",
+    )
+    arg_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and recompile whenever a JROH file changes",
+    )
+    arg_parser.add_argument(
+        "--keep_going",
+        action="store_true",
+        help="go on after an invalid node and report all the errors at the end",
+    )
+    arg_parser.add_argument(
+        "--only",
+        metavar="NAMESPACE[.SERVICE]",
+        type=str,
+        action="append",
+        help="only compile the service, or the services of the namespace, and the nodes they use (repeatable)",
+    )
+    arg_parser.add_argument(
+        "--timings",
+        metavar="FILE",
+        type=str,
+        help="write wall/CPU times of compilation stages to the file as JSON",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        type=str,
+        help="profile with cProfile and dump the stats to the file",
+    )
+    arg_parser.add_argument(
+        "--persistent_worker",
+        action="store_true",
+        help="serve JSON work requests from stdin and answer them on stdout",
+    )
+    return arg_parser
+
+
+def _make_bundle_arg_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(
+        prog=f"{_PROG} bundle",
+        description="validate JROH files and bundle them into a single file for fast loading",
+    )
+    arg_parser.add_argument(
+        "files",
+        metavar="FILE",
+        type=str,
+        nargs="+",
+        help="a JROH file (.yaml or .json) to bundle",
+    )
+
+    def out(out: str) -> str:
+        if not out.endswith(BUNDLE_FILE_EXTENSION):
+            raise ValueError()
+        return out
+
+    arg_parser.add_argument(
+        "--out",
+        metavar="FILE",
+        type=out,
+        required=True,
+        help=f"output the bundle to the file ({BUNDLE_FILE_EXTENSION})",
+    )
+    return arg_parser
+
+
+def _run_bundle(args: argparse.Namespace) -> None:
+    from . import bundle, resolver
+
+    # the files imported are bundled as well
+    compiler = _Compiler(None, None, None, 1)
+    compiler.update_files(args.files)
+    file_path_2_results = {
+        str(results.spec.node_uri).removesuffix("#/"): results
+        for results in compiler.parse_results()
+    }
+    # unused nodes are fine, since they may be used by the consumers of the bundle
+    resolver.resolve_specs([results.spec for results in file_path_2_results.values()])
+    writer.write_file(args.out, bundle.dump_bundle(file_path_2_results))
+    print(
+        f"{_PROG}: bundle written: file_path={args.out!r} file_count={len(file_path_2_results)}",
+        file=sys.stderr,
+    )
+
+
+def _run(
+    args: argparse.Namespace, cache: Optional[parse_cache.AnyParseCache] = None
+) -> None:
+    if args.cache_dir is not None:
+        cache = parse_cache.ParseCache(args.cache_dir, args.cache_size_limit)
+    if args.timings is not None:
+        timings.enable()
+    if args.profile is None:
+        profile = None
+    else:
+        profile = cProfile.Profile()
+        profile.enable()
+    try:
+        if args.watch:
+            try:
+                _watch_files(
+                    args.files,
+                    args.oapi3_out,
+                    args.go_out,
+                    cache,
+                    args.jobs,
+                    args.timings,
+                    args.keep_going,
+                    args.only,
+                    args.ir_out,
+                )
+            except KeyboardInterrupt:
+                pass
+        else:
+            try:
+                _compile_files(
+                    args.files,
+                    args.oapi3_out,
+                    args.go_out,
+                    cache,
+                    args.jobs,
+                    args.keep_going,
+                    args.only,
+                    args.ir_out,
+                )
+            except InvalidSpecsError as e:
+                print(_format_errors(e.errors), file=sys.stderr)
+                sys.exit(1)
+            if args.timings is not None:
+                _dump_timings(args.timings)
+    finally:
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(args.profile)
+        if args.timings is not None:
+            timings.disable()
+
+
+def _run_persistent_worker(arg_parser: argparse.ArgumentParser) -> None:
+    # stdout belongs to the protocol, hence anything else written to it, including by
+    # subprocesses, is redirected to stderr
+    response_file = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    cache = parse_cache.MemoryParseCache()
+    json_decoder = json.JSONDecoder()
+    buffer = ""
+    for line in sys.stdin:
+        buffer = (buffer + line).lstrip()
+        if buffer == "":
+            continue
+        try:
+            request, i = json_decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if e.pos >= len(buffer):
+                # wait for the rest of a request spanning multiple lines
+                continue
+            # no more lines can make it a request, hence it is answered and dropped
+            buffer = ""
+            request = None
+            exit_code = 1
+            output = f"{_PROG}: invalid work request: error={str(e)!r}\n"
+        else:
+            buffer = buffer[i:]
+            exit_code, output = _do_work_request(arg_parser, request, cache)
+        response = {"exitCode": exit_code, "output": output}
+        if (
+            isinstance(request, dict)
+            and (request_id := request.get("requestId")) is not None
+        ):
+            response["requestId"] = request_id
+        response_file.write(json.dumps(response) + "\n")
+        response_file.flush()
+
+
+def _do_work_request(
+    arg_parser: argparse.ArgumentParser,
+    request: Any,
+    cache: parse_cache.MemoryParseCache,
+) -> tuple[int, str]:
+    if not isinstance(request, dict):
+        return 1, f"{_PROG}: invalid work request: error='not an object'\n"
+    arguments = request.get("arguments", [])
+    if not isinstance(arguments, list) or not all(
+        isinstance(argument, str) for argument in arguments
+    ):
+        return 1, f"{_PROG}: invalid work request: error='arguments not strings'\n"
+    output = io.StringIO()
+    with contextlib.redirect_stderr(output):
+        try:
+            args, file = arg_parser.parse_known_args(arguments)
+            if args.watch:
+                # it would never be answered, nor would the requests after it
+                arg_parser.error("argument --watch: not allowed in work requests")
+            _run(args, cache)
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1, output.getvalue()
+        except Exception:
+            traceback.print_exc()
+            return 1, output.getvalue()
+    return 0, output.getvalue()
 
 
 def _compile_files(
-    file_paths: list[str], oapi3_out: Optional[str], go_out: Optional[str]
+    file_paths: list[str],
+    oapi3_out: Optional[str],
+    go_out: Optional[str],
+    cache: Optional[parse_cache.AnyParseCache] = None,
+    jobs: int = 1,
+    keep_going: bool = False,
+    only: Optional[list[str]] = None,
+    ir_out: Optional[str] = None,
+) -> None:
+    compiler = _Compiler(oapi3_out, go_out, cache, jobs, keep_going, only, ir_out)
+    compiler.update_files(file_paths)
+    compiler.compile()
+
+
+def _watch_files(
+    file_paths: list[str],
+    oapi3_out: Optional[str],
+    go_out: Optional[str],
+    cache: Optional[parse_cache.AnyParseCache] = None,
+    jobs: int = 1,
+    timings_file_path: Optional[str] = None,
+    keep_going: bool = False,
+    only: Optional[list[str]] = None,
+    ir_out: Optional[str] = None,
 ) -> None:
-    file_paths.sort()
-    file_path_2_file_data: dict[str, str] = {}
-    for file_path in file_paths:
-        with open(file_path, "r") as f:
-            file_data = f.read()
-        file_path_2_file_data[file_path] = file_data
-        parser.parse_files(file_path_2_file_data)
-    results1 = parser.parse_files(file_path_2_file_data)
-    for node_uri in results1.ignored_node_uris:
-        print(f"WARNING: node ignored: {node_uri}", file=sys.stderr)
-    results2 = resolver.resolve_specs(results1.specs)
-    for node_uri in results2.unused_node_uris:
-        print(f"WARNING: node unused: {node_uri}", file=sys.stderr)
-    results3 = translator.translate_specs(results2.merged_specs)
-    if oapi3_out is not None:
-        output_dir_path = oapi3_out
-        for file_path, file_data in results3.file_path_2_file_data.items():
-            output_file_path = os.path.join(output_dir_path, file_path)
-            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-            with open(output_file_path, "w+") as f:
-                f.write(f"# File generated by {_PROG}. DO NOT EDIT.\n")
-                f.write(file_data)
-    if go_out is not None:
-        output_dir_path, output_package_path = go_out.split(":", 1)
-        results4 = go_generator.generate_code(
-            output_package_path, results2.merged_specs
+    from . import parser, resolver
+
+    compiler = _Compiler(oapi3_out, go_out, cache, jobs, keep_going, only, ir_out)
+    print(f"{_PROG}: watching {len(file_paths)} file(s)", file=sys.stderr)
+    last_error_message = ""
+    while True:
+        try:
+            if compiler.update_files(file_paths):
+                compiler.compile()
+                if timings_file_path is not None:
+                    _dump_timings(timings_file_path)
+            last_error_message = ""
+        except (
+            parser.InvalidSpecError,
+            resolver.InvalidSpecError,
+            InvalidSpecsError,
+            OSError,
+        ) as e:
+            if isinstance(e, InvalidSpecsError):
+                error_message = _format_errors(e.errors)
+            else:
+                error_message = _format_errors([e])
+            if error_message != last_error_message:
+                print(error_message, file=sys.stderr)
+                last_error_message = error_message
+        time.sleep(_WATCH_INTERVAL)
+
+
+_WATCH_INTERVAL = 0.1
+
+
+class InvalidSpecsError(Exception):
+    # raised in keep-going mode with all the errors found
+    def __init__(self, errors: list[Exception]) -> None:
+        super().__init__(f"invalid specs: error_count={len(errors)}")
+        self.errors = errors
+
+
+def _format_errors(errors: list[Exception]) -> str:
+    return "\n".join(f"ERROR: {error}" for error in errors)
+
+
+def _dump_timings(file_path: str) -> None:
+    timings.dump(file_path)
+
+
+@dataclass
+class _FileState:
+    stat_key: tuple[int, int]
+    file_data: str
+    # one per spec, or many for a bundle
+    results_list: Optional[list["parser.ParseFileResults"]] = None
+    error: Optional[Exception] = None
+
+
+class _Compiler:
+    def __init__(
+        self,
+        oapi3_out: Optional[str],
+        go_out: Optional[str],
+        cache: Optional[parse_cache.AnyParseCache],
+        jobs: int,
+        keep_going: bool = False,
+        only: Optional[list[str]] = None,
+        ir_out: Optional[str] = None,
+    ) -> None:
+        self._oapi3_out = oapi3_out
+        if go_out is None:
+            self._go_output_dir_path = None
+            self._go_output_package_path = None
+        else:
+            self._go_output_dir_path, self._go_output_package_path = go_out.split(
+                ":", 1
+            )
+        self._cache = cache
+        self._jobs = jobs
+        self._keep_going = keep_going
+        self._only = only
+        self._ir_out = ir_out
+        self._file_path_2_file_state: dict[str, _FileState] = {}
+        self._changed_file_paths: set[str] = set()
+        self._dependency_graph: Optional["resolver.DependencyGraph"] = None
+        # the specs are resolved incrementally, from one compilation to the next
+        self._resolver: Optional["resolver.IncrementalResolver"] = None
+        self._file_path_2_spec: dict[str, "Spec"] = {}
+        self._namespace_2_outputs: dict[str, api.Outputs] = {}
+        self._oapi3_file_path_2_file_data: Optional[dict[str, str]] = None
+        self._go_file_path_2_file_data: Optional[dict[str, str]] = None
+
+    def update_files(self, file_paths: list[str]) -> bool:
+        # the files imported by the given ones, directly or not, are loaded as well
+        files_changed = False
+        loaded_file_paths: dict[str, str] = {}
+        pending_file_paths = file_paths
+        while len(pending_file_paths) >= 1:
+            for file_path in pending_file_paths:
+                loaded_file_paths[os.path.normpath(file_path)] = file_path
+            with timings.measure(timings.STAGE, "load"):
+                file_path_2_file_data = self._load_files(pending_file_paths)
+            if len(file_path_2_file_data) >= 1:
+                with timings.measure(timings.STAGE, "parse"):
+                    self._parse_files(file_path_2_file_data)
+                files_changed = True
+            pending_file_paths = list(
+                {
+                    file_path: None
+                    for file_path in self._imported_file_paths(pending_file_paths)
+                    if file_path not in loaded_file_paths
+                }
+            )
+        if self._forget_files(loaded_file_paths.values()):
+            files_changed = True
+        return files_changed
+
+    def _load_files(self, file_paths: list[str]) -> dict[str, str]:
+        file_path_2_stat_key: dict[str, tuple[int, int]] = {}
+        for file_path in sorted(file_paths):
+            stat = os.stat(file_path)
+            file_path_2_stat_key[file_path] = (stat.st_mtime_ns, stat.st_size)
+        touched_file_paths = []
+        for file_path, stat_key in file_path_2_stat_key.items():
+            file_state = self._file_path_2_file_state.get(file_path)
+            if file_state is None or file_state.stat_key != stat_key:
+                touched_file_paths.append(file_path)
+        file_path_2_file_data: dict[str, str] = {}
+        for file_path, file_data in _load_files(touched_file_paths).items():
+            file_state = self._file_path_2_file_state.get(file_path)
+            stat_key = file_path_2_stat_key[file_path]
+            if file_state is not None and file_state.file_data == file_data:
+                file_state.stat_key = stat_key
+                continue
+            self._file_path_2_file_state[file_path] = _FileState(stat_key, file_data)
+            self._changed_file_paths.add(file_path)
+            file_path_2_file_data[file_path] = file_data
+        if len(file_path_2_file_data) >= 1:
+            self._file_path_2_file_state = dict(
+                sorted(self._file_path_2_file_state.items())
+            )
+        return file_path_2_file_data
+
+    def _imported_file_paths(self, file_paths: list[str]) -> list[str]:
+        from . import parser
+
+        imported_file_paths = []
+        for file_path in file_paths:
+            file_state = self._file_path_2_file_state[file_path]
+            if file_state.results_list is None or file_path.endswith(
+                BUNDLE_FILE_EXTENSION
+            ):
+                # bundles are self-contained
+                continue
+            for results in file_state.results_list:
+                spec = results.spec
+                dir_path = os.path.dirname(file_path)
+                for i, import_ in enumerate(spec.imports):
+                    imported_file_path = os.path.normpath(
+                        os.path.join(dir_path, import_)
+                    )
+                    if not os.path.isfile(imported_file_path):
+                        node_uri = spec.node_uri + f"imports[{i}]"
+                        raise parser.InvalidSpecError(
+                            f"imported file not found: node_uri={node_uri!r} file_path={imported_file_path!r}"
+                        )
+                    imported_file_paths.append(imported_file_path)
+        return imported_file_paths
+
+    def _forget_files(self, file_paths: Iterable[str]) -> bool:
+        file_paths = set(file_paths)
+        files_forgotten = False
+        for file_path in list(self._file_path_2_file_state.keys()):
+            if file_path not in file_paths:
+                del self._file_path_2_file_state[file_path]
+                self._changed_file_paths.add(file_path)
+                files_forgotten = True
+        return files_forgotten
+
+    def _parse_files(self, file_path_2_file_data: dict[str, str]) -> None:
+        from . import parser
+
+        try:
+            results = parser.parse_files(
+                file_path_2_file_data, self._cache, self._jobs, self._keep_going
+            )
+            file_path_2_results_list = _group_results(results)
+        except parser.InvalidSpecError as e:
+            if len(file_path_2_file_data) == 1:
+                for file_path in file_path_2_file_data.keys():
+                    self._file_path_2_file_state[file_path].error = e
+                raise
+            # parse the files one by one to find out which ones are invalid
+            file_path_2_results_list = {}
+            for file_path, file_data in file_path_2_file_data.items():
+                try:
+                    results = parser.parse_files({file_path: file_data}, self._cache)
+                except parser.InvalidSpecError as e:
+                    self._file_path_2_file_state[file_path].error = e
+                else:
+                    file_path_2_results_list.update(_group_results(results))
+        for file_path, results_list in file_path_2_results_list.items():
+            for results2 in results_list:
+                for node_uri in results2.ignored_node_uris:
+                    print(f"WARNING: node ignored: {node_uri}", file=sys.stderr)
+            self._file_path_2_file_state[file_path].results_list = results_list
+
+    def parse_results(self) -> list["parser.ParseFileResults"]:
+        results_list: list["parser.ParseFileResults"] = []
+        for file_state in self._file_path_2_file_state.values():
+            if file_state.error is not None:
+                raise file_state.error
+            assert file_state.results_list is not None
+            results_list.extend(file_state.results_list)
+        return results_list
+
+    def compile(self) -> None:
+        from . import resolver
+
+        errors: list[Exception] = []
+        for results in self.parse_results():
+            errors.extend(results.errors)
+        with timings.measure(timings.STAGE, "resolve"):
+            if self._resolver is None:
+                self._resolver = resolver.IncrementalResolver(
+                    self._keep_going, self._only
+                )
+            self._update_specs()
+            results1 = self._resolver.resolve()
+        errors.extend(results1.errors)
+        if len(errors) >= 1:
+            raise InvalidSpecsError(errors)
+        for node_uri in results1.unused_node_uris:
+            print(f"WARNING: node unused: {node_uri}", file=sys.stderr)
+        if self._dependency_graph is None or any(
+            # the namespaces a bundle used to have are unknown
+            file_path.endswith(BUNDLE_FILE_EXTENSION)
+            for file_path in self._changed_file_paths
+        ):
+            affected_namespaces = None
+        else:
+            affected_namespaces = results1.dependency_graph.affected_namespaces(
+                self._changed_file_paths, self._dependency_graph
+            )
+            for merged_spec in results1.merged_specs:
+                if merged_spec.namespace not in self._namespace_2_outputs:
+                    affected_namespaces.add(merged_spec.namespace)
+        with timings.measure(timings.STAGE, "translate_and_generate"):
+            namespace_2_outputs = api.translate_and_generate(
+                [
+                    merged_spec
+                    for merged_spec in results1.merged_specs
+                    if affected_namespaces is None
+                    or merged_spec.namespace in affected_namespaces
+                ],
+                self._oapi3_out is not None,
+                self._go_output_package_path,
+                self._jobs,
+            )
+        results2 = api.Outputs({}, {})
+        for merged_spec in results1.merged_specs:
+            outputs = namespace_2_outputs.get(merged_spec.namespace)
+            if outputs is None:
+                outputs = self._namespace_2_outputs[merged_spec.namespace]
+                namespace_2_outputs[merged_spec.namespace] = outputs
+            results2.merge(outputs)
+        if self._oapi3_out is not None:
+            from . import translator
+
+            results2.oapi3_file_path_2_file_data.update(
+                translator.translate_common().file_path_2_file_data
+            )
+        with timings.measure(timings.STAGE, "write"):
+            results3 = self._write_outputs(results2)
+            if self._ir_out is not None:
+                results3.merge(self._write_ir(results1.merged_specs))
+        self._changed_file_paths.clear()
+        self._dependency_graph = results1.dependency_graph
+        self._namespace_2_outputs = namespace_2_outputs
+        print(
+            f"{_PROG}: output files: written={len(results3.written_file_paths)} unchanged={len(results3.unchanged_file_paths)} deleted={len(results3.deleted_file_paths)}",
+            file=sys.stderr,
+        )
+
+    def _update_specs(self) -> None:
+        # the files parsed again have new specs, the others keep theirs; the specs are
+        # resolved in the order they are listed in, i.e. by file path, then by index in
+        # a bundle
+        incremental_resolver = self._resolver
+        assert incremental_resolver is not None
+        file_path_2_spec: dict[str, "Spec"] = {}
+        file_path_2_sort_key: dict[str, tuple[str, int]] = {}
+        for file_path, file_state in self._file_path_2_file_state.items():
+            assert file_state.results_list is not None
+            for i, results in enumerate(file_state.results_list):
+                file_path2 = str(results.spec.node_uri).removesuffix("#/")
+                file_path_2_spec[file_path2] = results.spec
+                file_path_2_sort_key[file_path2] = (file_path, i)
+        for file_path, spec in file_path_2_spec.items():
+            old_spec = self._file_path_2_spec.get(file_path)
+            if old_spec is None:
+                incremental_resolver.add_spec(spec, file_path_2_sort_key[file_path])
+            elif old_spec is not spec:
+                incremental_resolver.replace_spec(spec, file_path_2_sort_key[file_path])
+        for file_path in self._file_path_2_spec.keys():
+            if file_path not in file_path_2_spec:
+                incremental_resolver.remove_spec(file_path)
+        self._file_path_2_spec = file_path_2_spec
+
+    def _write_outputs(self, results2: api.Outputs) -> writer.WriteFilesResults:
+        results3 = writer.WriteFilesResults()
+        if self._oapi3_out is not None:
+            results3.merge(
+                self._write_files(
+                    self._oapi3_out,
+                    self._oapi3_file_path_2_file_data,
+                    results2.oapi3_file_path_2_file_data,
+                    api.OAPI3_FILE_HEADER,
+                    ["*.yaml", "*/*.yaml"],
+                )
+            )
+            self._oapi3_file_path_2_file_data = results2.oapi3_file_path_2_file_data
+        if self._go_output_dir_path is not None:
+            from . import go_generator
+
+            assert self._go_output_package_path is not None
+            results3.merge(
+                self._write_files(
+                    self._go_output_dir_path,
+                    self._go_file_path_2_file_data,
+                    results2.go_file_path_2_file_data,
+                    api.GO_FILE_HEADER,
+                    ["*/*_generated.go"],
+                    go_generator.format_go_code,
+                )
+            )
+            if (
+                self._go_file_path_2_file_data is None
+                and len(results2.go_file_path_2_file_data) >= 1
+            ):
+                go_generator.update_go_mod_file(
+                    self._go_output_dir_path, self._go_output_package_path
+                )
+            self._go_file_path_2_file_data = results2.go_file_path_2_file_data
+        return results3
+
+    def _write_ir(self, merged_specs: list["Spec"]) -> writer.WriteFilesResults:
+        from . import ir
+
+        assert self._ir_out is not None
+        results = writer.WriteFilesResults()
+        if writer.write_file(self._ir_out, ir.dump_ir(merged_specs)):
+            results.written_file_paths.append(self._ir_out)
+        else:
+            results.unchanged_file_paths.append(self._ir_out)
+        return results
+
+    def _write_files(
+        self,
+        output_dir_path: str,
+        old_file_path_2_file_data: Optional[dict[str, str]],
+        file_path_2_file_data: dict[str, str],
+        header: str,
+        stale_file_path_patterns: list[str],
+        format_files: Optional[Callable[[list[str]], None]] = None,
+    ) -> writer.WriteFilesResults:
+        if old_file_path_2_file_data is None:
+            return writer.write_files(
+                output_dir_path,
+                file_path_2_file_data,
+                header,
+                stale_file_path_patterns,
+                format_files,
+            )
+        # only touch the files whose data changed since the last compilation
+        changed_file_path_2_file_data = {
+            file_path: file_data
+            for file_path, file_data in file_path_2_file_data.items()
+            if old_file_path_2_file_data.get(file_path) != file_data
+        }
+        results = writer.write_files(
+            output_dir_path, changed_file_path_2_file_data, header, [], format_files
         )
-        output_file_paths = []
-        for file_path, file_data in results4.file_path_2_file_data.items():
-            output_file_path = os.path.join(output_dir_path, file_path)
-            output_file_paths.append(output_file_path)
-            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-            with open(output_file_path, "w+") as f:
-                f.write(f"// Code generated by {_PROG}. DO NOT EDIT.\n\n")
-                f.write(file_data)
-        if len(output_file_paths) >= 1:
-            go_generator.format_go_code(output_file_paths)
-            go_generator.update_go_mod_file(output_dir_path, output_package_path)
+        results.unchanged_file_paths.extend(
+            os.path.join(output_dir_path, file_path)
+            for file_path in file_path_2_file_data.keys()
+            if file_path not in changed_file_path_2_file_data
+        )
+        results.deleted_file_paths.extend(
+            writer.delete_files(
+                output_dir_path,
+                [
+                    file_path
+                    for file_path in old_file_path_2_file_data.keys()
+                    if file_path not in file_path_2_file_data
+                ],
+            )
+        )
+        return results
+
+
+def _group_results(
+    results: "parser.ParseFilesResults",
+) -> dict[str, list["parser.ParseFileResults"]]:
+    # maps the results of the specs in a bundle to the bundle
+    file_path_2_results_list: dict[str, list["parser.ParseFileResults"]] = {}
+    bundled_file_paths: set[str] = set()
+    for bundle_file_path, file_paths in results.bundle_file_path_2_file_paths.items():
+        file_path_2_results_list[bundle_file_path] = [
+            results.file_path_2_results[file_path] for file_path in file_paths
+        ]
+        bundled_file_paths.update(file_paths)
+    for file_path, results2 in results.file_path_2_results.items():
+        if file_path not in bundled_file_paths:
+            file_path_2_results_list[file_path] = [results2]
+    return file_path_2_results_list
+
+
+def _load_files(file_paths: list[str]) -> dict[str, str]:
+    import concurrent.futures
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        file_datas = executor.map(_read_file, file_paths)
+        return dict(zip(file_paths, file_datas))
+
+
+def _read_file(file_path: str) -> str:
+    with open(file_path, "r") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
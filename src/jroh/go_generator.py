@@ -1,12 +1,13 @@
+import concurrent.futures
 import os
 import subprocess
 import sys
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
 from mako.template import Template
 
-from . import utils
+from . import patterns, timings, utils
 from .spec import (
     BOOL,
     ENUM,
@@ -45,7 +46,9 @@ class _Generator:
         self._namespace: str = ""
         self._imports: dict[str, _Import] = {}
         self._patterns: list[str] = []
+        self._pattern_id_2_index: dict[int, int] = {}
         self._buffer: list[str] = []
+        self._stopwatch = timings.Stopwatch()
         self._file_path_2_file_data: dict[str, str] = {}
 
     def generate_code(self, specs: list[Spec]) -> None:
@@ -54,6 +57,7 @@ class _Generator:
 
     def _generate_package_code(self, spec: Spec) -> None:
         self._namespace = spec.namespace
+        self._stopwatch.reset()
         for service in spec.services:
             self._generate_service_code(service)
         for service in spec.services:
@@ -73,7 +77,8 @@ package {self._make_package_name()}
         )
         self._buffer.append("")
         self._buffer.append(
-            Template(
+            _render_template(
+                "service",
                 r"""\
 
 <%
@@ -196,8 +201,7 @@ func (sf *${service_name}ActorFuncs) ${method_name}(ctx ${context1()}.Context\
     return ${apicommon()}.NewNotImplementedError()
 }
 % endfor
-"""
-            ).render(
+""",
                 utils=utils,
                 g=self,
                 service=service,
@@ -215,7 +219,8 @@ package {self._make_package_name()}
         )
         self._buffer.append("")
         self._buffer.append(
-            Template(
+            _render_template(
+                "client",
                 r"""\
 
 <%
@@ -379,8 +384,7 @@ nil, \
 ${fmt()}.Errorf("do rpc; fullMethodName=${utils.quote(utils.quote(full_method_name))[1:-1]}: %w", err)
 }
 % endfor
-"""
-            ).render(
+""",
                 utils=utils,
                 g=self,
                 service=service,
@@ -398,7 +402,8 @@ package {self._make_package_name()}
         )
         self._buffer.append("")
         self._buffer.append(
-            Template(
+            _render_template(
+                "models",
                 r"""\
 <%
     apicommon = g._import_package("apicommon", "github.com/go-tk/jroh/go/apicommon")
@@ -415,7 +420,7 @@ func (m *${model_name}) Validate(validationContext *${apicommon()}.ValidationCon
     v = "m." + field_name
 %>\
         % if field.is_optional:
-            % if not field_type.is_primitive() or field.is_limited():
+            % if not field_type.is_primitive() or field.constraints.is_limited():
     if ${v} != nil {
                 % if field_type.is_primitive():
         v := *${v}
@@ -425,7 +430,7 @@ func (m *${model_name}) Validate(validationContext *${apicommon()}.ValidationCon
                 % endif
         validationContext.Enter("${utils.camel_case(field.id)}")
                 % if field_type.is_primitive():
-${validate_primitive_value("        ", v, field_type.primitive_type(), field)}\
+${validate_primitive_value("        ", v, field_type.primitive_type(), field.constraints)}\
                 % else:
         if !${v}.Validate(validationContext) {
             return false
@@ -435,7 +440,7 @@ ${validate_primitive_value("        ", v, field_type.primitive_type(), field)}\
     }
             % endif
         % elif field.is_repeated:
-            % if field.count_is_limited() or not field_type.is_primitive() or field.is_limited():
+            % if field.count_is_limited() or not field_type.is_primitive() or field.constraints.is_limited():
     {
         validationContext.Enter("${utils.camel_case(field.id)}")
                 % if field.min_count >= 1:
@@ -450,7 +455,7 @@ ${validate_primitive_value("        ", v, field_type.primitive_type(), field)}\
             return false
         }
                 % endif
-                % if not field_type.is_primitive() or field.is_limited():
+                % if not field_type.is_primitive() or field.constraints.is_limited():
                     % if field_type.is_primitive():
         for i, v := range ${v} {
                     % else:
@@ -462,7 +467,7 @@ ${validate_primitive_value("        ", v, field_type.primitive_type(), field)}\
 %>\
             validationContext.Enter(${strconv()}.Itoa(i))
                     % if field_type.is_primitive():
-${validate_primitive_value("            ", v, field_type.primitive_type(), field)}\
+${validate_primitive_value("            ", v, field_type.primitive_type(), field.constraints)}\
                     % else:
             if !${v}.Validate(validationContext) {
                 return false
@@ -475,11 +480,11 @@ ${validate_primitive_value("            ", v, field_type.primitive_type(), field
     }
             % endif
         % else:
-            % if not field_type.is_primitive() or field.is_limited():
+            % if not field_type.is_primitive() or field.constraints.is_limited():
     {
         validationContext.Enter("${utils.camel_case(field.id)}")
                 % if field_type.is_primitive():
-${validate_primitive_value("        ", v, field_type.primitive_type(), field)}\
+${validate_primitive_value("        ", v, field_type.primitive_type(), field.constraints)}\
                 % else:
         if !${v}.Validate(validationContext) {
             return false
@@ -693,7 +698,7 @@ type ${model_name} ${xprimit.primitive_type}
 var _ ${apicommon()}.Model = ${model_name}(${primitive_zero_literals[xprimit.primitive_type]})
 
 func (m ${model_name}) Validate(validationContext *${apicommon()}.ValidationContext) bool {
-${validate_primitive_value("    ", "m", xprimit.primitive_type, xprimit)}\
+${validate_primitive_value("    ", "m", xprimit.primitive_type, xprimit.constraints)}\
     mm := struct {
         ${apicommon()}.DummyFurtherValidator
         ${model_name}
@@ -702,8 +707,7 @@ ${validate_primitive_value("    ", "m", xprimit.primitive_type, xprimit)}\
 }
     % endif
 % endfor
-"""
-            ).render(
+""",
                 utils=utils,
                 STRUCT=STRUCT,
                 ENUM=ENUM,
@@ -730,7 +734,8 @@ package {self._make_package_name()}
         )
         self._buffer.append("")
         self._buffer.append(
-            Template(
+            _render_template(
+                "errors",
                 r"""\
 <%
     apicommon = g._import_package("apicommon", "github.com/go-tk/jroh/go/apicommon")
@@ -750,8 +755,7 @@ func New${error_name}Error() *${apicommon()}.Error {
     }
 }
 % endfor
-"""
-            ).render(
+""",
                 utils=utils,
                 g=self,
                 errors=errors,
@@ -768,7 +772,8 @@ package {self._make_package_name()}
         )
         self._buffer.append("")
         self._buffer.append(
-            Template(
+            _render_template(
+                "misc",
                 r"""\
 % for service in services:
 <%
@@ -786,8 +791,7 @@ const (
 
 const NumberOf${service_name}Methods = ${len(service.methods)}
 % endfor
-"""
-            ).render(
+""",
                 utils=utils,
                 g=self,
                 services=services,
@@ -805,7 +809,8 @@ const NumberOf${service_name}Methods = ${len(service.methods)}
         if len(imports) == 0:
             return ""
         imports.sort(key=lambda x: x[0])
-        imports_code = Template(
+        imports_code = _render_template(
+            "imports",
             r"""\
 
 import (
@@ -813,8 +818,7 @@ import (
     ${import_name} ${utils.quote(import1.package_path)}
 % endfor
 )
-"""
-        ).render(
+""",
             utils=utils,
             imports=imports,
         )
@@ -823,7 +827,8 @@ import (
     def _generate_patterns_code(self) -> str:
         if len(self._patterns) == 0:
             return ""
-        patterns_code = Template(
+        patterns_code = _render_template(
+            "patterns",
             r"""\
 <%
     regexp = g._import_package("regexp", "regexp")
@@ -834,8 +839,7 @@ var patterns = [...]*regexp.Regexp {
     ${i}: ${regexp()}.MustCompile(${utils.quote(pattern)}),
 % endfor
 }
-"""
-        ).render(
+""",
             utils=utils,
             g=self,
             patterns=self._patterns,
@@ -901,15 +905,12 @@ var patterns = [...]*regexp.Regexp {
         return package
 
     def _add_pattern(self, pattern: str) -> int:
-        if not pattern.startswith("^"):
-            pattern = "^" + pattern
-        if not pattern.endswith("$"):
-            pattern += "$"
-        for i, pattern2 in enumerate(self._patterns):
-            if pattern2 == pattern:
-                return i
-        i = len(self._patterns)
-        self._patterns.append(pattern)
+        anchored_pattern = patterns.get(pattern).anchored()
+        i = self._pattern_id_2_index.get(anchored_pattern.id)
+        if i is None:
+            i = len(self._patterns)
+            self._patterns.append(anchored_pattern.pattern)
+            self._pattern_id_2_index[anchored_pattern.id] = i
         return i
 
     def _flush(self, file_name: str) -> None:
@@ -918,7 +919,9 @@ var patterns = [...]*regexp.Regexp {
         self._file_path_2_file_data[file_path] = file_data
         self._imports.clear()
         self._patterns.clear()
+        self._pattern_id_2_index.clear()
         self._buffer.clear()
+        self._stopwatch.lap(timings.OUTPUT_FILE, file_path)
 
     def file_path_2_file_data(self) -> dict[str, str]:
         return self._file_path_2_file_data
@@ -940,16 +943,60 @@ _primitive_zero_literals: dict[str, str] = {
 }
 
 
+def _render_template(name: str, text: str, **kwargs: Any) -> str:
+    with timings.measure(timings.TEMPLATE, name):
+        template = _templates.get(name)
+        if template is None:
+            template = _templates[name] = Template(text)
+        return template.render(**kwargs)
+
+
+# compiled once per process and reused by subsequent generations
+_templates: dict[str, Template] = {}
+
+
 def format_go_code(output_file_paths: list[str]) -> None:
     try:
-        subprocess.run(["gofmt", "-w", *output_file_paths])
+        with timings.measure(timings.SUBPROCESS, "gofmt"):
+            subprocess.run(["gofmt", "-w", *output_file_paths])
     except Exception as e:
         print(f"WARNING: format go code: {e}", file=sys.stderr)
 
 
+def format_go_code_data(file_path_2_file_data: dict[str, str]) -> dict[str, str]:
+    with timings.measure(timings.SUBPROCESS, "gofmt"):
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            file_datas = executor.map(
+                _format_go_code_data,
+                file_path_2_file_data.keys(),
+                file_path_2_file_data.values(),
+            )
+            return dict(zip(file_path_2_file_data.keys(), file_datas))
+
+
+def _format_go_code_data(file_path: str, file_data: str) -> str:
+    try:
+        return subprocess.run(
+            ["gofmt"], input=file_data, capture_output=True, text=True, check=True
+        ).stdout
+    except subprocess.CalledProcessError as e:
+        print(
+            f"WARNING: format go code: file_path={file_path!r}: {e.stderr.strip()}",
+            file=sys.stderr,
+        )
+    except Exception as e:
+        print(f"WARNING: format go code: file_path={file_path!r}: {e}", file=sys.stderr)
+    return file_data
+
+
 def update_go_mod_file(output_dir_path: str, output_package_path: str) -> None:
     if output_package_path.startswith("github.com/go-tk/jroh/"):
         return
+    with timings.measure(timings.SUBPROCESS, "go mod"):
+        _update_go_mod_file(output_dir_path, output_package_path)
+
+
+def _update_go_mod_file(output_dir_path: str, output_package_path: str) -> None:
     try:
         go_mod_file_exists = (
             subprocess.run(
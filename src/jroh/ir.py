@@ -0,0 +1,209 @@
+import json
+import sys
+from typing import Any
+
+from .spec import STRUCT, Error, Field, Model, NodeURI, Service, Spec
+from .spec_tree import (
+    ERROR_ATTRS,
+    SERVICE_ATTRS,
+    SpecTreeLoader,
+    dump_attrs,
+    dump_method,
+    dump_model,
+    load_attrs,
+)
+from .version import VERSION
+
+# bump whenever the layout of the IR changes
+_FORMAT_VERSION = 1
+
+_FORMAT = "jroh-ir"
+
+# the IR is the merged specs in compact JSON: the spec trees are laid out as spec_tree
+# dumps them, plus what resolution works out, i.e. the methods and RPC paths of services
+# and the ref counts of models and errors; node URIs are kept as the indexes of the files
+# the nodes come from, and refs are linked again on load, by namespace and id, with no
+# validation
+
+
+def dump_ir(merged_specs: list[Spec]) -> str:
+    file_path_2_index: dict[str, int] = {}
+
+    def dump_node_uri(raw_node: dict[str, Any], node_uri: NodeURI) -> None:
+        file_path, _, _ = str(node_uri).partition("#/")
+        file_index = file_path_2_index.get(file_path)
+        if file_index is None:
+            file_index = file_path_2_index[file_path] = len(file_path_2_index)
+        raw_node["file"] = file_index
+
+    raw_specs = []
+    for spec in merged_specs:
+        raw_spec: dict[str, Any] = {"namespace": spec.namespace}
+        raw_services = {}
+        for service in spec.services:
+            raw_service = dump_attrs(service, SERVICE_ATTRS)
+            dump_node_uri(raw_service, service.node_uri)
+            raw_service["methods"] = [method.id for method in service.methods]
+            raw_service["rpc_paths"] = service.rpc_paths
+            raw_services[service.id] = raw_service
+        raw_methods = {}
+        for method in spec.methods:
+            raw_method = dump_method(method)
+            dump_node_uri(raw_method, method.node_uri)
+            raw_methods[method.id] = raw_method
+        raw_models = {}
+        for model in spec.models:
+            raw_model = dump_model(model)
+            dump_node_uri(raw_model, model.node_uri)
+            raw_model["ref_count"] = model.ref_count
+            raw_models[model.id] = raw_model
+        raw_errors = {}
+        for error in spec.errors:
+            raw_error = dump_attrs(error, ERROR_ATTRS)
+            dump_node_uri(raw_error, error.node_uri)
+            raw_error["ref_count"] = error.ref_count
+            raw_errors[error.id] = raw_error
+        for key, raw_nodes in (
+            ("services", raw_services),
+            ("methods", raw_methods),
+            ("models", raw_models),
+            ("errors", raw_errors),
+        ):
+            if len(raw_nodes) >= 1:
+                raw_spec[key] = raw_nodes
+        raw_specs.append(raw_spec)
+    return (
+        json.dumps(
+            {
+                "format": _FORMAT,
+                "format_version": _FORMAT_VERSION,
+                "jroh_version": VERSION,
+                "file_paths": list(file_path_2_index.keys()),
+                "specs": raw_specs,
+            },
+            separators=(",", ":"),
+        )
+        + "\n"
+    )
+
+
+def load_ir(ir_data: str) -> list[Spec]:
+    try:
+        raw_ir = json.loads(ir_data)
+    except ValueError:
+        raw_ir = None
+    if not isinstance(raw_ir, dict) or raw_ir.get("format") != _FORMAT:
+        raise InvalidIRError("not an IR")
+    format_version = raw_ir.get("format_version")
+    if format_version != _FORMAT_VERSION:
+        raise InvalidIRError(
+            f"unsupported IR format version: format_version={format_version!r} expected_format_version={_FORMAT_VERSION}"
+        )
+    try:
+        loader = _IRLoader(raw_ir["file_paths"])
+        merged_specs = [
+            loader.load_merged_spec(raw_spec) for raw_spec in raw_ir["specs"]
+        ]
+        loader.link_specs()
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        # truncated, or made by something else
+        raise InvalidIRError(f"malformed IR: error={e!r}") from None
+    return merged_specs
+
+
+class _IRLoader(SpecTreeLoader):
+    # builds merged specs with the node builders of spec trees, and links them afterwards
+    def __init__(self, file_paths: list[str]) -> None:
+        super().__init__()
+        self._file_roots = [NodeURI(file_path + "#/") for file_path in file_paths]
+        self._kind_roots: dict[tuple[int, str], NodeURI] = {}
+        self._namespace_2_models: dict[str, dict[str, Model]] = {}
+        self._namespace_2_errors: dict[str, dict[str, Error]] = {}
+        self._unlinked_specs: list[tuple[Spec, list[tuple[Service, list[str]]]]] = []
+
+    def load_merged_spec(self, raw_spec: dict[str, Any]) -> Spec:
+        spec = Spec("")
+        namespace = spec.namespace = sys.intern(raw_spec["namespace"])
+        service_and_method_ids_list = []
+        for service_id, raw_service in raw_spec.get("services", {}).items():
+            service = Service(
+                self._load_node_uri(raw_service, "services", service_id), service_id
+            )
+            service_and_method_ids_list.append((service, raw_service.pop("methods")))
+            load_attrs(service, raw_service)
+            spec.services.append(service)
+        for method_id, raw_method in raw_spec.get("methods", {}).items():
+            spec.methods.append(
+                self.load_method(
+                    raw_method,
+                    method_id,
+                    self._load_node_uri(raw_method, "methods", method_id),
+                )
+            )
+        models = self._namespace_2_models[namespace] = {}
+        for model_id, raw_model in raw_spec.get("models", {}).items():
+            model = self.load_model(
+                raw_model, model_id, self._load_node_uri(raw_model, "models", model_id)
+            )
+            model.namespace = namespace
+            model.ref_count = raw_model["ref_count"]
+            spec.models.append(model)
+            models[model_id] = model
+        errors = self._namespace_2_errors[namespace] = {}
+        for error_id, raw_error in raw_spec.get("errors", {}).items():
+            error = Error(self._load_node_uri(raw_error, "errors", error_id), error_id)
+            load_attrs(error, raw_error)
+            spec.errors.append(error)
+            errors[error_id] = error
+        self._unlinked_specs.append((spec, service_and_method_ids_list))
+        return spec
+
+    def _load_node_uri(
+        self, raw_node: dict[str, Any], node_kind: str, id: str
+    ) -> NodeURI:
+        key = (raw_node.pop("file"), node_kind)
+        kind_root = self._kind_roots.get(key)
+        if kind_root is None:
+            kind_root = self._kind_roots[key] = self._file_roots[key[0]] + node_kind
+        return kind_root + sys.intern(f"/{id}")
+
+    def link_specs(self) -> None:
+        # sets what resolution would, once all the models and errors are loaded
+        for spec, service_and_method_ids_list in self._unlinked_specs:
+            namespace = spec.namespace
+            methods = {method.id: method for method in spec.methods}
+            for service, method_ids in service_and_method_ids_list:
+                service.methods = [methods[method_id] for method_id in method_ids]
+            for method in spec.methods:
+                if method.params is not None:
+                    self._link_fields(method.params.fields, namespace)
+                if method.results is not None:
+                    self._link_fields(method.results.fields, namespace)
+                for error_case in method.error_cases:
+                    error_ref = error_case.error_ref
+                    namespace2 = error_ref.namespace
+                    if namespace2 is None:
+                        namespace2 = namespace
+                    error_case.error = self._namespace_2_errors[namespace2][
+                        error_ref.id
+                    ]
+            for model in spec.models:
+                if model.type == STRUCT:
+                    self._link_fields(model.struct().fields, namespace)
+        self._unlinked_specs.clear()
+
+    def _link_fields(self, fields: list[Field], namespace: str) -> None:
+        for field in fields:
+            field_type = field.type
+            if field_type.is_primitive():
+                continue
+            model_ref = field_type.model_ref()
+            namespace2 = model_ref.namespace
+            if namespace2 is None:
+                namespace2 = namespace
+            field_type.model = self._namespace_2_models[namespace2][model_ref.id]
+
+
+class InvalidIRError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__("invalid IR: " + message)
@@ -0,0 +1,116 @@
+import collections
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Optional, Union
+
+from .version import VERSION
+
+if TYPE_CHECKING:
+    from .parser import ParseFileResults
+
+DEFAULT_SIZE_LIMIT = 256 << 20
+DEFAULT_ENTRY_COUNT_LIMIT = 10000
+
+# bump whenever the pickled layout of the spec classes changes
+_FORMAT_VERSION = 5
+
+_ENTRY_FILE_NAME_SUFFIX = ".pickle"
+
+
+class ParseCache:
+    def __init__(self, dir_path: str, size_limit: int = DEFAULT_SIZE_LIMIT) -> None:
+        self._dir_path = dir_path
+        self._size_limit = size_limit
+        os.makedirs(dir_path, exist_ok=True)
+
+    def get(self, file_path: str, file_data: str) -> Optional["ParseFileResults"]:
+        entry_file_path = self._make_entry_file_path(file_path, file_data)
+        try:
+            with open(entry_file_path, "rb") as f:
+                results = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(
+                f"WARNING: load parse cache entry: {entry_file_path}: {e}",
+                file=sys.stderr,
+            )
+            return None
+        try:
+            os.utime(entry_file_path)
+        except OSError:
+            pass
+        return results
+
+    def put(self, file_path: str, file_data: str, results: "ParseFileResults") -> None:
+        entry_file_path = self._make_entry_file_path(file_path, file_data)
+        fd, temp_file_path = tempfile.mkstemp(dir=self._dir_path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file_path, entry_file_path)
+        except BaseException:
+            os.unlink(temp_file_path)
+            raise
+
+    def trim(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        total_size = 0
+        with os.scandir(self._dir_path) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(_ENTRY_FILE_NAME_SUFFIX):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                total_size += stat.st_size
+        if total_size <= self._size_limit:
+            return
+        entries.sort()
+        for _, size, entry_file_path in entries:
+            try:
+                os.unlink(entry_file_path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            if total_size <= self._size_limit:
+                break
+
+    def _make_entry_file_path(self, file_path: str, file_data: str) -> str:
+        h = hashlib.sha256()
+        for key_part in (VERSION, str(_FORMAT_VERSION), file_path, file_data):
+            h.update(key_part.encode())
+            h.update(b"\0")
+        return os.path.join(self._dir_path, h.hexdigest() + _ENTRY_FILE_NAME_SUFFIX)
+
+
+class MemoryParseCache:
+    def __init__(self, entry_count_limit: int = DEFAULT_ENTRY_COUNT_LIMIT) -> None:
+        self._entry_count_limit = entry_count_limit
+        self._entries: collections.OrderedDict[
+            tuple[str, str], "ParseFileResults"
+        ] = collections.OrderedDict()
+
+    def get(self, file_path: str, file_data: str) -> Optional["ParseFileResults"]:
+        key = (file_path, file_data)
+        results = self._entries.get(key)
+        if results is not None:
+            self._entries.move_to_end(key)
+        return results
+
+    def put(self, file_path: str, file_data: str, results: "ParseFileResults") -> None:
+        key = (file_path, file_data)
+        self._entries[key] = results
+        self._entries.move_to_end(key)
+
+    def trim(self) -> None:
+        while len(self._entries) > self._entry_count_limit:
+            self._entries.popitem(last=False)
+
+
+AnyParseCache = Union[ParseCache, MemoryParseCache]
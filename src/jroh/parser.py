@@ -1,10 +1,18 @@
+import concurrent.futures
+import functools
+import itertools
+import json
+import operator
+import sys
 from dataclasses import dataclass
-from typing import Any, Optional, Type, TypeVar
+from typing import Any, Callable, Optional, Type, TypeVar, Union
 
-import re2
 import yaml
 
+from . import bundle, patterns, timings
+from .parse_cache import AnyParseCache
 from .spec import (
+    ANY_ID,
     BOOL,
     ENUM,
     ENUM_UNDERLYING_TYPE_PATTERN,
@@ -15,6 +23,7 @@ from .spec import (
     INT32,
     INT64,
     MODEL_TYPE_PATTERN,
+    NO_PRIMITIVE_CONSTRAINTS,
     REF_PATTERN,
     STRING,
     STRUCT,
@@ -24,9 +33,9 @@ from .spec import (
     Error,
     ErrorCase,
     Field,
-    FieldType,
     Method,
     Model,
+    NodeURI,
     Params,
     PrimitiveConstraints,
     Ref,
@@ -38,413 +47,615 @@ from .spec import (
 )
 
 
+@dataclass
+class ParseFileResults:
+    ignored_node_uris: list[str]
+    spec: Spec
+    errors: list["InvalidSpecError"]
+
+
 @dataclass
 class ParseFilesResults:
     ignored_node_uris: list[str]
     specs: list[Spec]
+    file_path_2_results: dict[str, ParseFileResults]
+    errors: list["InvalidSpecError"]
+    # the paths of the files, keys of file_path_2_results, each bundle is made of
+    bundle_file_path_2_file_paths: dict[str, list[str]]
+
+
+def parse_files(
+    file_path_2_file_data: dict[str, str],
+    parse_cache: Optional[AnyParseCache] = None,
+    jobs: int = 1,
+    keep_going: bool = False,
+) -> ParseFilesResults:
+    file_path_2_results: dict[str, Optional[ParseFileResults]] = {}
+    missed_file_paths: list[str] = []
+    bundle_file_path_2_file_paths: dict[str, list[str]] = {}
+    for file_path, file_data in file_path_2_file_data.items():
+        if file_path.endswith(bundle.BUNDLE_FILE_EXTENSION):
+            # bundles hold validated specs, which are loaded as they are
+            file_path_2_results2 = _load_bundle(file_data, file_path, keep_going)
+            file_path_2_results.update(file_path_2_results2)
+            bundle_file_path_2_file_paths[file_path] = list(file_path_2_results2)
+            continue
+        results = None
+        if parse_cache is not None:
+            results = parse_cache.get(file_path, file_data)
+        if results is None:
+            missed_file_paths.append(file_path)
+        file_path_2_results[file_path] = results
+    missed_file_datas = [file_path_2_file_data[x] for x in missed_file_paths]
+    if jobs >= 2 and len(missed_file_paths) >= 2:
+        jobs = min(jobs, len(missed_file_paths))
+        with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+            missed_results = []
+            for results, records in executor.map(
+                functools.partial(
+                    timings.call_with_timings, timings.enabled(), parse_file
+                ),
+                missed_file_datas,
+                missed_file_paths,
+                itertools.repeat(keep_going),
+                chunksize=-(-len(missed_file_paths) // (4 * jobs)),
+            ):
+                missed_results.append(results)
+                timings.merge(records)
+    else:
+        missed_results = [
+            parse_file(file_data, file_path, keep_going)
+            for file_data, file_path in zip(missed_file_datas, missed_file_paths)
+        ]
+    for file_path, file_data, results in zip(
+        missed_file_paths, missed_file_datas, missed_results
+    ):
+        file_path_2_results[file_path] = results
+        if parse_cache is not None and len(results.errors) == 0:
+            parse_cache.put(file_path, file_data, results)
+    if parse_cache is not None:
+        parse_cache.trim()
+    ignored_node_uris: list[str] = []
+    specs: list[Spec] = []
+    file_path_2_results2: dict[str, ParseFileResults] = {}
+    errors: list[InvalidSpecError] = []
+    for file_path, results in file_path_2_results.items():
+        assert results is not None
+        ignored_node_uris.extend(results.ignored_node_uris)
+        specs.append(results.spec)
+        file_path_2_results2[file_path] = results
+        errors.extend(results.errors)
+    return ParseFilesResults(
+        ignored_node_uris=ignored_node_uris,
+        specs=specs,
+        file_path_2_results=file_path_2_results2,
+        errors=errors,
+        bundle_file_path_2_file_paths=bundle_file_path_2_file_paths,
+    )
 
 
-def parse_files(file_path_2_file_data: dict[str, str]) -> ParseFilesResults:
-    parser = _Parser()
-    for file_path, file_data in file_path_2_file_data.items():
+def _load_bundle(
+    file_data: str, file_path: str, keep_going: bool
+) -> dict[str, ParseFileResults]:
+    with timings.measure(timings.INPUT_FILE, file_path):
+        try:
+            return bundle.load_bundle(file_data, file_path)
+        except InvalidSpecError as e:
+            if not keep_going:
+                raise
+            spec = Spec(NodeURI(file_path + "#/"))
+            spec.broken_ids.add(("namespace", ANY_ID))
+            return {file_path: ParseFileResults([], spec, [e])}
+
+
+def parse_file(
+    file_data: str, file_path: str, keep_going: bool = False
+) -> ParseFileResults:
+    parser = _Parser(keep_going)
+    with timings.measure(timings.INPUT_FILE, file_path):
         parser.parse_file(file_data, file_path)
-    return ParseFilesResults(
+    return ParseFileResults(
         ignored_node_uris=parser.ignored_node_uris(),
-        specs=parser.specs(),
+        spec=parser.specs()[0],
+        errors=parser.errors(),
     )
 
 
 class _Parser:
-    def __init__(self) -> None:
+    def __init__(self, keep_going: bool = False) -> None:
         self._ignored_node_uris: list[str] = []
         self._specs: list[Spec] = []
+        # in keep-going mode, an invalid node is recorded and left out, and parsing
+        # goes on with its siblings
+        self._keep_going = keep_going
+        self._errors: list[InvalidSpecError] = []
+        # the constraints of the field or xprimit being parsed, if any
+        self._primitive_constraints: Optional[PrimitiveConstraints] = None
+        # equal constraint records are shared to keep large spec graphs compact
+        self._primitive_constraints_pool: dict[tuple, PrimitiveConstraints] = {}
 
     def parse_file(self, file_data: str, file_path: str) -> None:
-        raw_spec = yaml.safe_load(file_data)
-        node_uri = file_path + "#/"
-        spec = Spec(node_uri)
-        self._parse_raw_spec(raw_spec, spec)
+        spec = Spec(NodeURI(file_path + "#/"))
         self._specs.append(spec)
-
-    def _parse_raw_spec(self, raw_spec, spec: Spec) -> None:
-        raw_spec = _ensure_node_kind(raw_spec, dict, spec.node_uri)
-        raw_spec = raw_spec.copy()
-        if (namespace := raw_spec.pop("namespace", None)) is not None:
-            node_uri = spec.node_uri + "namespace"
-            namespace = _ensure_node_kind(namespace, str, node_uri)
-            _check_id(namespace, node_uri)
-            spec.namespace = namespace
-        if (raw_services := raw_spec.pop("services", None)) is not None:
-            self._parse_raw_services(
-                raw_services,
-                spec.services,
-                spec.node_uri + "services",
+        if not self._keep_going:
+            raw_spec = _load_raw_spec(file_data, file_path, spec.node_uri)
+            _SPEC_SCHEMA.parse(self, spec, raw_spec, spec.node_uri)
+            return
+        try:
+            raw_spec = _ensure_node_kind(
+                _load_raw_spec(file_data, file_path, spec.node_uri), dict, spec.node_uri
             )
-        if (raw_methods := raw_spec.pop("methods", None)) is not None:
-            self._parse_raw_methods(
-                raw_methods, spec.methods, spec.node_uri + "methods"
-            )
-        if (raw_models := raw_spec.pop("models", None)) is not None:
-            self._parse_raw_models(raw_models, spec.models, spec.node_uri + "models")
-        if (raw_errors := raw_spec.pop("errors", None)) is not None:
-            self._parse_raw_errors(raw_errors, spec.errors, spec.node_uri + "errors")
-        for key in raw_spec.keys():
-            self._ignored_node_uris.append(spec.node_uri + key)
-
-    def _parse_raw_services(
-        self, raw_services, services: list[Service], node_uri: str
+        except InvalidSpecError as e:
+            self._recover(e, spec, "namespace", ANY_ID)
+            return
+        # the top-level keys don't depend on each other, hence they're parsed one by
+        # one, so that an invalid one leaves the others alone
+        for key, value in raw_spec.items():
+            try:
+                _SPEC_SCHEMA.parse(self, spec, {key: value}, spec.node_uri)
+            except InvalidSpecError as e:
+                self._recover(e, spec, key, ANY_ID)
+        if ("namespace", ANY_ID) in spec.broken_ids:
+            # the nodes of an unknown namespace can't be resolved
+            spec.services.clear()
+            spec.methods.clear()
+            spec.models.clear()
+            spec.errors.clear()
+
+    def _recover(
+        self,
+        error: "InvalidSpecError",
+        spec: Optional[Spec] = None,
+        node_kind: str = "",
+        id: str = "",
     ) -> None:
-        raw_services = _ensure_node_kind(raw_services, dict, node_uri)
-        _ensure_non_empty_mapping(raw_services, node_uri)
+        if not self._keep_going:
+            raise error
+        self._errors.append(error)
+        # the constraints of an invalid field or xprimit may be left half-parsed
+        self._primitive_constraints = None
+        if spec is not None:
+            spec.broken_ids.add((node_kind, id))
+
+    def _load_services(self, spec: Spec, raw_services: dict, node_uri: NodeURI) -> None:
+        node_uri = node_uri + "services"
         for service_id, raw_service in raw_services.items():
-            node_uri2 = node_uri + "/" + str(service_id)
-            service_id = _ensure_node_kind(service_id, str, node_uri2)
-            _check_id(service_id, node_uri2)
-            service = Service(node_uri2, service_id)
-            self._parse_raw_service(raw_service, service)
-            services.append(service)
-
-    def _parse_raw_service(self, raw_service, service: Service) -> None:
-        raw_service = _ensure_node_kind(raw_service, dict, service.node_uri)
-        raw_service = raw_service.copy()
-        node_uri = service.node_uri + "/version"
-        version = _pop_node(raw_service, "version", node_uri)
-        version = _ensure_node_kind(version, str, node_uri)
-        service.version = version
-        if (description := raw_service.pop("description", None)) is not None:
-            description = _ensure_node_kind(
-                description, str, service.node_uri + "/description"
-            )
-            service.description = description
-        if (
-            rpc_path_template := raw_service.pop("rpc_path_template", None)
-        ) is not None:
-            rpc_path_template = _ensure_node_kind(
-                rpc_path_template, str, service.node_uri + "/rpc_path_template"
-            )
-            service.rpc_path_template = rpc_path_template
-        for key in raw_service.keys():
-            self._ignored_node_uris.append(service.node_uri + "/" + key)
-
-    def _parse_raw_methods(
-        self, raw_methods, methods: list[Method], node_uri: str
-    ) -> None:
-        raw_methods = _ensure_node_kind(raw_methods, dict, node_uri)
-        _ensure_non_empty_mapping(raw_methods, node_uri)
+            node_uri2 = node_uri + sys.intern(f"/{service_id}")
+            try:
+                service = Service(node_uri2, _ensure_id(service_id, node_uri2))
+                _SERVICE_SCHEMA.parse(self, service, raw_service, node_uri2)
+            except InvalidSpecError as e:
+                self._recover(e, spec, "services", service_id)
+                continue
+            spec.services.append(service)
+
+    def _load_methods(self, spec: Spec, raw_methods: dict, node_uri: NodeURI) -> None:
+        node_uri = node_uri + "methods"
         for method_id, raw_method in raw_methods.items():
-            node_uri2 = node_uri + "/" + str(method_id)
-            method_id = _ensure_node_kind(method_id, str, node_uri2)
-            _check_id(method_id, node_uri2)
-            method = Method(node_uri2, method_id)
-            self._parse_raw_method(raw_method, method)
-            methods.append(method)
-
-    def _parse_raw_method(self, raw_method, method: Method) -> None:
-        raw_method = _ensure_node_kind(raw_method, dict, method.node_uri)
-        raw_method = raw_method.copy()
-        if (service_ids := raw_method.pop("service_ids", None)) is None:
-            node_uri = method.node_uri + "/service_id"
-            service_id = _pop_node(raw_method, "service_id", node_uri)
-            service_id = _ensure_node_kind(service_id, str, node_uri)
-            _check_id(service_id, node_uri)
-            method.service_ids = [service_id]
-        else:
-            node_uri = method.node_uri + "/service_ids"
-            service_ids = _ensure_node_kind(service_ids, list, node_uri)
-            for i, service_id in enumerate(service_ids):
-                node_uri2 = node_uri + f"[{i}]"
-                service_id = _ensure_node_kind(service_id, str, node_uri2)
-                _check_id(service_id, node_uri2)
-            method.service_ids = service_ids
-        if (summary := raw_method.pop("summary", None)) is not None:
-            summary = _ensure_node_kind(summary, str, method.node_uri + "/summary")
-            method.summary = summary
-        if (description := raw_method.pop("description", None)) is not None:
-            description = _ensure_node_kind(
-                description, str, method.node_uri + "/description"
-            )
-            method.description = description
-        if (raw_params := raw_method.pop("params", None)) is not None:
-            params = Params(method.node_uri + "/params")
-            self._parse_raw_params(raw_params, params)
-            method.params = params
-        if (raw_results := raw_method.pop("results", None)) is not None:
-            results = Results(method.node_uri + "/results")
-            self._parse_raw_results(raw_results, results)
-            method.results = results
-        if (raw_error_cases := raw_method.pop("error_cases", None)) is not None:
-            self._parse_raw_error_cases(
-                raw_error_cases, method.error_cases, method.node_uri + "/error_cases"
-            )
-        for key in raw_method.keys():
-            self._ignored_node_uris.append(method.node_uri + "/" + key)
+            node_uri2 = node_uri + sys.intern(f"/{method_id}")
+            try:
+                method = Method(node_uri2, _ensure_id(method_id, node_uri2))
+                _METHOD_SCHEMA.parse(self, method, raw_method, node_uri2)
+            except InvalidSpecError as e:
+                self._recover(e, spec, "methods", method_id)
+                continue
+            spec.methods.append(method)
+
+    def _load_service_id(
+        self, method: Method, service_id: str, node_uri: NodeURI
+    ) -> None:
+        method.service_ids = [service_id]
 
-    def _parse_raw_params(self, raw_params, params: Params) -> None:
-        self._parse_raw_fields(raw_params, params.fields, params.node_uri)
+    def _load_params(self, method: Method, raw_params: dict, node_uri: NodeURI) -> None:
+        params = Params(node_uri + "/params")
+        self._load_fields(params.fields, raw_params, params.node_uri)
+        method.params = params
 
-    def _parse_raw_results(self, raw_results, results: Results) -> None:
-        self._parse_raw_fields(raw_results, results.fields, results.node_uri)
+    def _load_results(
+        self, method: Method, raw_results: dict, node_uri: NodeURI
+    ) -> None:
+        results = Results(node_uri + "/results")
+        self._load_fields(results.fields, raw_results, results.node_uri)
+        method.results = results
 
-    def _parse_raw_error_cases(
-        self, raw_error_cases, error_cases: list[ErrorCase], node_uri: str
+    def _load_error_cases(
+        self, method: Method, raw_error_cases: dict, node_uri: NodeURI
     ) -> None:
-        raw_error_cases = _ensure_node_kind(raw_error_cases, dict, node_uri)
-        _ensure_non_empty_mapping(raw_error_cases, node_uri)
+        node_uri = node_uri + "/error_cases"
         for raw_error_ref, raw_error_case in raw_error_cases.items():
-            node_uri2 = node_uri + "/" + str(raw_error_ref)
-            raw_error_ref = _ensure_node_kind(raw_error_ref, str, node_uri2)
-            error_ref = _parse_raw_ref(raw_error_ref, node_uri2)
-            error_case = ErrorCase(node_uri2, error_ref)
-            self._parse_raw_error_case(raw_error_case, error_case)
-            error_cases.append(error_case)
-
-    def _parse_raw_error_case(self, raw_error_case, error_case: ErrorCase) -> None:
-        raw_error_case = _ensure_node_kind(raw_error_case, dict, error_case.node_uri)
-        raw_error_case = raw_error_case.copy()
-        if (description := raw_error_case.pop("description", None)) is not None:
-            description = _ensure_node_kind(
-                description, str, error_case.node_uri + "/description"
-            )
-            error_case.description = description
-        for key in raw_error_case.keys():
-            self._ignored_node_uris.append(error_case.node_uri + "/" + key)
-
-    def _parse_raw_models(self, raw_models, models: list[Model], node_uri: str) -> None:
-        raw_models = _ensure_node_kind(raw_models, dict, node_uri)
-        _ensure_non_empty_mapping(raw_models, node_uri)
+            node_uri2 = node_uri + sys.intern(f"/{raw_error_ref}")
+            try:
+                raw_error_ref = _ensure_node_kind(raw_error_ref, str, node_uri2)
+                error_ref = _parse_raw_ref(raw_error_ref, node_uri2)
+                error_case = ErrorCase(node_uri2, error_ref)
+                _ERROR_CASE_SCHEMA.parse(self, error_case, raw_error_case, node_uri2)
+            except InvalidSpecError as e:
+                self._recover(e)
+                continue
+            method.error_cases.append(error_case)
+
+    def _load_models(self, spec: Spec, raw_models: dict, node_uri: NodeURI) -> None:
+        node_uri = node_uri + "models"
         for model_id, raw_model in raw_models.items():
-            node_uri2 = node_uri + "/" + str(model_id)
-            model_id = _ensure_node_kind(model_id, str, node_uri2)
-            _check_id(model_id, node_uri2)
-            model = Model(node_uri2, model_id)
-            self._parse_raw_model(raw_model, model)
-            models.append(model)
-
-    def _parse_raw_model(self, raw_model, model: Model) -> None:
-        raw_model = _ensure_node_kind(raw_model, dict, model.node_uri)
-        raw_model = raw_model.copy()
-        node_uri = model.node_uri + "/type"
-        raw_model_type = _pop_node(raw_model, "type", node_uri)
-        raw_model_type = _ensure_node_kind(raw_model_type, str, node_uri)
-        _check_raw_model_type(raw_model_type, node_uri)
-        if raw_model_type == STRUCT:
-            struct = Struct()
-            self._parse_raw_struct(raw_model, struct, model.node_uri)
+            node_uri2 = node_uri + sys.intern(f"/{model_id}")
+            try:
+                model = Model(node_uri2, _ensure_id(model_id, node_uri2))
+                _model_schema(raw_model).parse(self, model, raw_model, node_uri2)
+            except InvalidSpecError as e:
+                self._recover(e, spec, "models", model_id)
+                continue
+            spec.models.append(model)
+
+    def _load_model_type(
+        self, model: Model, model_type: str, node_uri: NodeURI
+    ) -> None:
+        if model_type == STRUCT:
             model.type = STRUCT
-            model.definition = struct
-        elif raw_model_type == ENUM:
-            enum = Enum()
-            self._parse_raw_enum(raw_model, enum, model.node_uri)
+            model.definition = Struct()
+        elif model_type == ENUM:
             model.type = ENUM
-            model.definition = enum
+            model.definition = Enum()
         else:
-            primitive_type = raw_model_type
-            xprimit = Xprimit(primitive_type)
-            self._parse_raw_xprimit(raw_model, xprimit, model.node_uri)
             model.type = XPRIMIT
-            model.definition = xprimit
-        if (description := raw_model.pop("description", None)) is not None:
-            description = _ensure_node_kind(
-                description, str, model.node_uri + "/description"
-            )
-            model.description = description
-        for key in raw_model.keys():
-            self._ignored_node_uris.append(model.node_uri + "/" + key)
+            model.definition = Xprimit(model_type)
 
-    def _parse_raw_struct(
-        self, raw_struct: dict, struct: Struct, node_uri: str
+    def _load_struct_fields(
+        self, model: Model, raw_fields: dict, node_uri: NodeURI
     ) -> None:
-        if (raw_fields := raw_struct.pop("fields", None)) is not None:
-            self._parse_raw_fields(raw_fields, struct.fields, node_uri + "/fields")
+        self._load_fields(model.struct().fields, raw_fields, node_uri + "/fields")
 
-    def _parse_raw_fields(self, raw_fields, fields: list[Field], node_uri: str) -> None:
-        raw_fields = _ensure_node_kind(raw_fields, dict, node_uri)
-        _ensure_non_empty_mapping(raw_fields, node_uri)
+    def _load_fields(
+        self, fields: list[Field], raw_fields: dict, node_uri: NodeURI
+    ) -> None:
         for field_id, raw_field in raw_fields.items():
-            node_uri2 = node_uri + "/" + str(field_id)
-            field_id = _ensure_node_kind(field_id, str, node_uri2)
-            _check_id(field_id, node_uri2)
-            field = Field(node_uri2, field_id)
-            self._parse_raw_field(raw_field, field)
+            node_uri2 = node_uri + sys.intern(f"/{field_id}")
+            try:
+                field = Field(node_uri2, sys.intern(_ensure_id(field_id, node_uri2)))
+                _field_schema(raw_field).parse(self, field, raw_field, node_uri2)
+            except InvalidSpecError as e:
+                self._recover(e)
+                continue
             fields.append(field)
 
-    def _parse_raw_field(self, raw_field, field: Field) -> None:
-        raw_field = _ensure_node_kind(raw_field, dict, field.node_uri)
-        raw_field = raw_field.copy()
-        node_uri = field.node_uri + "/type"
-        raw_field_type = _pop_node(raw_field, "type", node_uri)
-        raw_field_type = _ensure_node_kind(raw_field_type, str, node_uri)
-        field_type = field.type
-        _parse_raw_field_type(raw_field_type, field_type, node_uri)
-        if field_type.is_primitive():
-            primitive_type = field_type.primitive_type()
-            _load_primitive_constraints(
-                primitive_type, raw_field, field, field.node_uri
-            )
-        if (is_optional := raw_field.pop("is_optional", None)) is not None:
-            is_optional = _ensure_node_kind(
-                is_optional, bool, field.node_uri + "/is_optional"
+    def _load_field_type(
+        self, field: Field, raw_field_type: str, node_uri: NodeURI
+    ) -> None:
+        field.type.value = _parse_raw_field_type(raw_field_type)
+
+    def _end_field_constraints(self, field: Field, node_uri: NodeURI) -> None:
+        field.constraints = self._end_primitive_constraints()
+
+    def _check_field_count(self, field: Field, node_uri: NodeURI) -> None:
+        if field.max_count is not None and field.min_count > field.max_count:
+            raise InvalidSpecError(
+                f"invalid field, min_count > max_count: node_uri={node_uri!r} min_count={field.min_count} max_count={field.max_count}"
             )
-            field.is_optional = is_optional
-        elif (is_repeated := raw_field.pop("is_repeated", None)) is not None:
-            is_repeated = _ensure_node_kind(
-                is_repeated, bool, field.node_uri + "/is_repeated"
+
+    def _load_field_example(self, field: Field, example, node_uri: NodeURI) -> None:
+        node_uri = node_uri + "/example"
+        primitive_type = field.type.primitive_type()
+        if field.is_repeated:
+            example = _ensure_node_kind(example, list, node_uri)
+            _check_sequence_length(
+                len(example), field.min_count, field.max_count, node_uri
             )
-            field.is_repeated = is_repeated
-            min_count = raw_field.pop("min_count", None)
-            if min_count is not None:
-                node_uri2 = field.node_uri + "/min_count"
-                min_count = _ensure_node_kind(min_count, int, node_uri2)
-                _check_number(min_count, 0, None, node_uri2)
-                field.min_count = min_count
-            max_count = raw_field.pop("max_count", None)
-            if max_count is not None:
-                node_uri2 = field.node_uri + "/max_count"
-                max_count = _ensure_node_kind(max_count, int, node_uri2)
-                _check_number(max_count, 1, None, node_uri2)
-                field.max_count = max_count
+            for i, v in enumerate(example):
+                _check_primitive_value(
+                    primitive_type, v, field.constraints, node_uri + f"[{i}]"
+                )
+        else:
+            _check_primitive_value(primitive_type, example, field.constraints, node_uri)
+        field.example = example
+
+    def _load_enum_underlying_type(
+        self, model: Model, enum_underlying_type: str, node_uri: NodeURI
+    ) -> None:
+        model.enum().underlying_type = enum_underlying_type
+
+    def _load_enum_constants(
+        self, model: Model, raw_constants: dict, node_uri: NodeURI
+    ) -> None:
+        node_uri = node_uri + "/constants"
+        enum = model.enum()
+        constant_schema = _CONSTANT_SCHEMAS[enum.underlying_type]
+        for constant_id, raw_constant in raw_constants.items():
+            node_uri2 = node_uri + sys.intern(f"/{constant_id}")
+            try:
+                constant = Constant(node_uri2, _ensure_id(constant_id, node_uri2))
+                constant_schema.parse(self, constant, raw_constant, node_uri2)
+            except InvalidSpecError as e:
+                self._recover(e)
+                continue
+            enum.constants.append(constant)
+
+    def _end_xprimit_constraints(self, model: Model, node_uri: NodeURI) -> None:
+        model.xprimit().constraints = self._end_primitive_constraints()
+
+    def _load_xprimit_example(self, model: Model, example, node_uri: NodeURI) -> None:
+        xprimit = model.xprimit()
+        _check_primitive_value(
+            xprimit.primitive_type, example, xprimit.constraints, node_uri + "/example"
+        )
+        xprimit.example = example
+
+    def _load_primitive_constraint(
+        self, node: Any, value: Any, node_uri: NodeURI, attr: str
+    ) -> None:
+        if self._primitive_constraints is None:
+            self._primitive_constraints = PrimitiveConstraints()
+        setattr(self._primitive_constraints, attr, value)
+
+    def _check_number_constraints(self, node: Any, node_uri: NodeURI) -> None:
+        primitive_constraints = self._primitive_constraints
+        if primitive_constraints is None:
+            return
+        min = primitive_constraints.min
+        max = primitive_constraints.max
+        if min is None or max is None:
+            return
+        if min == max:
             if (
-                min_count is not None
-                and max_count is not None
-                and min_count > max_count
+                primitive_constraints.min_is_exclusive
+                or primitive_constraints.max_is_exclusive
             ):
                 raise InvalidSpecError(
-                    f"invalid field, min_count > max_count: node_uri={field.node_uri!r} min_count={field.min_count} max_count={field.max_count}"
+                    f"invalid primitive constraints, min > max: node_uri={node_uri!r}"
+                    f" {'exclusive_' if primitive_constraints.min_is_exclusive else ''}min={min}"
+                    f" {'exclusive_' if primitive_constraints.max_is_exclusive else ''}max={max}"
                 )
-        if (description := raw_field.pop("description", None)) is not None:
-            description = _ensure_node_kind(
-                description, str, field.node_uri + "/description"
+        elif min > max:
+            raise InvalidSpecError(
+                f"invalid primitive constraints, min > max: node_uri={node_uri!r} min={min} max={max}"
             )
-            field.description = description
-        if (
-            field_type.is_primitive()
-            and (example := raw_field.pop("example", None)) is not None
-        ):
-            primitive_type = field_type.primitive_type()
-            node_uri2 = field.node_uri + "/example"
-            if field.is_repeated:
-                example = _ensure_node_kind(example, list, node_uri2)
-                _check_sequence_length(
-                    len(example), field.min_count, field.max_count, node_uri2
-                )
-                for i, v in enumerate(example):
-                    _check_primitive_value(
-                        primitive_type, v, field, node_uri2 + f"[{i}]"
-                    )
-            else:
-                _check_primitive_value(primitive_type, example, field, node_uri2)
-            field.example = example
-        for key in raw_field.keys():
-            self._ignored_node_uris.append(field.node_uri + "/" + key)
-
-    def _parse_raw_enum(self, raw_enum: dict, enum: Enum, node_uri: str) -> None:
-        node_uri2 = node_uri + "/underlying_type"
-        enum_underlying_type = _pop_node(raw_enum, "underlying_type", node_uri2)
-        enum_underlying_type = _ensure_node_kind(enum_underlying_type, str, node_uri2)
-        _check_enum_underlying_type(enum_underlying_type, node_uri2)
-        enum.underlying_type = enum_underlying_type
-        if (raw_fields := raw_enum.pop("constants", None)) is not None:
-            type = {
-                INT32: int,
-                INT64: int,
-                STRING: str,
-            }[enum_underlying_type]
-            self._parse_raw_constants(
-                raw_fields, enum.constants, node_uri + "/constants", type
+
+    def _check_length_constraints(self, node: Any, node_uri: NodeURI) -> None:
+        primitive_constraints = self._primitive_constraints
+        if primitive_constraints is None:
+            return
+        min_length = primitive_constraints.min_length
+        max_length = primitive_constraints.max_length
+        if max_length is not None and min_length > max_length:
+            raise InvalidSpecError(
+                f"invalid primitive constraints, min_length > max_length: node_uri={node_uri!r} min_length={min_length} max_length={max_length}"
             )
 
-    def _parse_raw_constants(
-        self, raw_constants, constants: list[Constant], node_uri: str, type: Type
-    ) -> None:
-        raw_constants = _ensure_node_kind(raw_constants, dict, node_uri)
-        _ensure_non_empty_mapping(raw_constants, node_uri)
-        for constant_id, raw_constant in raw_constants.items():
-            node_uri2 = node_uri + "/" + str(constant_id)
-            constant_id = _ensure_node_kind(constant_id, str, node_uri2)
-            _check_id(constant_id, node_uri2)
-            constant = Constant(node_uri2, constant_id)
-            self._parse_raw_constant(raw_constant, constant, type)
-            constants.append(constant)
-
-    def _parse_raw_constant(self, raw_constant, constant: Constant, type: Type) -> None:
-        raw_constant = _ensure_node_kind(raw_constant, dict, constant.node_uri)
-        raw_constant = raw_constant.copy()
-        node_uri = constant.node_uri + "/value"
-        value = _pop_node(raw_constant, "value", node_uri)
-        value = _ensure_node_kind(value, type, node_uri)
-        constant.value = value
-        if (description := raw_constant.pop("description", None)) is not None:
-            description = _ensure_node_kind(
-                description, str, constant.node_uri + "/description"
+    def _check_pattern_constraint(self, node: Any, node_uri: NodeURI) -> None:
+        primitive_constraints = self._primitive_constraints
+        if primitive_constraints is None or primitive_constraints.pattern == "":
+            return
+        if not patterns.get(primitive_constraints.pattern).is_valid():
+            raise InvalidSpecError(
+                f"invalid regular expression (re2): node_uri={node_uri!r} reg_exp={primitive_constraints.pattern!r}"
             )
-            constant.description = description
-        for key in raw_constant.keys():
-            self._ignored_node_uris.append(constant.node_uri + "/" + key)
 
-    def _parse_raw_xprimit(
-        self, raw_xprimit: dict, xprimit: Xprimit, node_uri: str
-    ) -> None:
-        _load_primitive_constraints(
-            xprimit.primitive_type, raw_xprimit, xprimit, node_uri
+    def _end_primitive_constraints(self) -> PrimitiveConstraints:
+        primitive_constraints = self._primitive_constraints
+        self._primitive_constraints = None
+        if primitive_constraints is None or not primitive_constraints.is_limited():
+            return NO_PRIMITIVE_CONSTRAINTS
+        # types are part of the key, since 1 == 1.0 == True
+        key = tuple(
+            (type(value), value)
+            for value in _get_primitive_constraint_values(primitive_constraints)
         )
-        if (example := raw_xprimit.pop("example", None)) is not None:
-            _check_primitive_value(
-                xprimit.primitive_type, example, xprimit, node_uri + "/example"
-            )
-            xprimit.example = example
+        return self._primitive_constraints_pool.setdefault(key, primitive_constraints)
 
-    def _parse_raw_errors(self, raw_errors, errors: list[Error], node_uri: str) -> None:
-        raw_errors = _ensure_node_kind(raw_errors, dict, node_uri)
-        _ensure_non_empty_mapping(raw_errors, node_uri)
+    def _load_errors(self, spec: Spec, raw_errors: dict, node_uri: NodeURI) -> None:
+        node_uri = node_uri + "errors"
         for error_id, raw_error in raw_errors.items():
-            node_uri2 = node_uri + "/" + str(error_id)
-            error_id = _ensure_node_kind(error_id, str, node_uri2)
-            _check_id(error_id, node_uri2)
-            error = Error(node_uri2, error_id)
-            self._parse_raw_error(raw_error, error)
-            errors.append(error)
-
-    def _parse_raw_error(self, raw_error, error: Error) -> None:
-        raw_error = _ensure_node_kind(raw_error, dict, error.node_uri)
-        raw_error = raw_error.copy()
-        node_uri = error.node_uri + "/code"
-        error_code = _pop_node(raw_error, "code", node_uri)
-        error_code = _ensure_node_kind(error_code, int, node_uri)
-        _check_number(error_code, 1000, _MAX_INT32, node_uri)
-        error.code = error_code
-        node_uri = error.node_uri + "/status_code"
-        status_code = _pop_node(raw_error, "status_code", node_uri)
-        status_code = _ensure_node_kind(status_code, int, node_uri)
-        _check_number(status_code, 100, 599, node_uri)
-        error.status_code = status_code
-        if (description := raw_error.pop("description", None)) is not None:
-            description = _ensure_node_kind(
-                description, str, error.node_uri + "/description"
-            )
-            error.description = description
-        for key in raw_error.keys():
-            self._ignored_node_uris.append(error.node_uri + "/" + key)
+            node_uri2 = node_uri + sys.intern(f"/{error_id}")
+            try:
+                error = Error(node_uri2, _ensure_id(error_id, node_uri2))
+                _ERROR_SCHEMA.parse(self, error, raw_error, node_uri2)
+            except InvalidSpecError as e:
+                self._recover(e, spec, "errors", error_id)
+                continue
+            spec.errors.append(error)
 
     def ignored_node_uris(self) -> list[str]:
         return self._ignored_node_uris
 
+    def errors(self) -> list["InvalidSpecError"]:
+        return self._errors
+
     def specs(self) -> list[Spec]:
         return self._specs
 
 
+_get_primitive_constraint_values = operator.attrgetter(*PrimitiveConstraints.__slots__)
+
+
+class _Key:
+    # declares a key of a mapping node: the kind of its value, the checks on it, and
+    # where it goes (a node attribute and/or a loader); checks are given the node URI of
+    # the value, while loaders, like rules, are given the node URI of the mapping
+    __slots__ = (
+        "name",
+        "node_type",
+        "is_required",
+        "min",
+        "max",
+        "check",
+        "attr",
+        "load",
+        "requires",
+        "excludes",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        node_type: Type,
+        *,
+        is_required: bool = False,
+        min: Any = None,
+        max: Any = None,
+        check: Optional[Callable[[Any, NodeURI], None]] = None,
+        attr: Optional[str] = None,
+        load: Optional[Callable[[_Parser, Any, Any, NodeURI], None]] = None,
+        requires: Optional[str] = None,
+        excludes: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.node_type = node_type
+        self.is_required = is_required
+        self.min = min
+        self.max = max
+        self.check = check
+        self.attr = attr
+        self.load = load
+        # the key is accepted only if the given key has (not) a value
+        self.requires = requires
+        self.excludes = excludes
+
+
+class _Rule:
+    # a check across the keys before it, which only runs if any of the given keys
+    # (or always if none) has been accepted
+    __slots__ = ("check", "keys")
+
+    def __init__(
+        self, check: Callable[[_Parser, Any, NodeURI], None], *keys: str
+    ) -> None:
+        self.check = check
+        self.keys = keys
+
+
+_Plan = tuple[tuple[tuple, ...], tuple[str, ...]]
+
+
+class _NodeSchema:
+    # a mapping node schema; for each distinct shape (the keys in order) of the mapping
+    # nodes, it's compiled once into a plan which visits the accepted keys only and
+    # reads the mapping in place
+    def __init__(self, *items: Union[_Key, _Rule], separator: str = "/") -> None:
+        self._items = items
+        self._separator = separator
+        self._key_name_2_suffix = {
+            item.name: sys.intern(separator + item.name)
+            for item in items
+            if isinstance(item, _Key)
+        }
+        self._shape_2_plan: dict[tuple, _Plan] = {}
+
+    def parse(self, parser: _Parser, node: Any, raw_node, node_uri: NodeURI) -> None:
+        raw_node = _ensure_node_kind(raw_node, dict, node_uri)
+        if None in raw_node.values():
+            # which keys are accepted depends on null values too, so don't cache
+            steps, ignored_key_names = self._make_plan(raw_node)
+        else:
+            shape = tuple(raw_node)
+            plan = self._shape_2_plan.get(shape)
+            if plan is None:
+                plan = self._make_plan(raw_node)
+                if len(self._shape_2_plan) < _MAX_PLAN_COUNT:
+                    self._shape_2_plan[shape] = plan
+            steps, ignored_key_names = plan
+        for name, suffix, node_type, min, max, check, attr, load in steps:
+            if name is None:
+                load(parser, node, node_uri)
+                continue
+            if node_type is None:
+                raise InvalidSpecError(f"missing node: node_uri={node_uri + suffix!r}")
+            value = raw_node[name]
+            if not isinstance(value, node_type):
+                _ensure_node_kind(value, node_type, node_uri + suffix)
+            if (min is not None and value < min) or (max is not None and value > max):
+                _check_number(value, min, max, node_uri + suffix)
+            if check is not None:
+                check(value, node_uri + suffix)
+            if attr is not None:
+                setattr(node, attr, value)
+            if load is not None:
+                load(parser, node, value, node_uri)
+        for key_name in ignored_key_names:
+            parser._ignored_node_uris.append(
+                str(node_uri + (self._separator + key_name))
+            )
+
+    def _make_plan(self, raw_node: dict) -> _Plan:
+        steps: list[tuple] = []
+        accepted_key_names: set[str] = set()
+        for item in self._items:
+            if isinstance(item, _Rule):
+                if len(item.keys) == 0 or not accepted_key_names.isdisjoint(item.keys):
+                    steps.append((None, "", None, None, None, None, None, item.check))
+                continue
+            key = item
+            if (key.requires is not None and raw_node.get(key.requires) is None) or (
+                key.excludes is not None and raw_node.get(key.excludes) is not None
+            ):
+                continue
+            suffix = self._key_name_2_suffix[key.name]
+            if raw_node.get(key.name) is None:
+                if key.name in raw_node:
+                    accepted_key_names.add(key.name)
+                if key.is_required:
+                    steps.append((key.name, suffix, None, None, None, None, None, None))
+                    break
+                continue
+            accepted_key_names.add(key.name)
+            steps.append(
+                (
+                    key.name,
+                    suffix,
+                    key.node_type,
+                    key.min,
+                    key.max,
+                    key.check,
+                    key.attr,
+                    key.load,
+                )
+            )
+        ignored_key_names = tuple(
+            key_name for key_name in raw_node if key_name not in accepted_key_names
+        )
+        return tuple(steps), ignored_key_names
+
+
+# more distinct node shapes than this are unusual, and plans are then made afresh
+_MAX_PLAN_COUNT = 1024
+
+
+# libyaml's loader is several times faster than the pure-Python one, which serves as a
+# fallback when PyYAML is built without libyaml
+_YAML_LOADER: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_raw_spec(file_data: str, file_path: str, node_uri: NodeURI) -> Any:
+    # a file which isn't even well-formed, e.g. one being saved, is as invalid as any
+    try:
+        if file_path.endswith(".json"):
+            return json.loads(file_data)
+        return _load_yaml(file_data)
+    except (yaml.YAMLError, ValueError) as e:
+        raise InvalidSpecError(
+            f"malformed file: node_uri={node_uri!r} error={str(e)!r}"
+        ) from None
+
+
+def _load_yaml(file_data: str) -> Any:
+    try:
+        return yaml.load(file_data, Loader=_YAML_LOADER)
+    except yaml.YAMLError:
+        if _YAML_LOADER is yaml.SafeLoader:
+            raise
+    # libyaml words errors differently, so reproduce them with the pure-Python loader
+    # to keep error messages independent of the loader in use
+    return yaml.load(file_data, Loader=yaml.SafeLoader)
+
+
 class InvalidSpecError(Exception):
     def __init__(self, message: str) -> None:
         super().__init__("invalid specification: " + message)
+        self._message = message
 
-
-def _pop_node(mapping: dict, key: str, node_uri: str):
-    node_value = mapping.pop(key, None)
-    if node_value is None:
-        raise InvalidSpecError(f"missing node: node_uri={node_uri!r}")
-    return node_value
+    def __reduce__(self):
+        return type(self), (self._message,)
 
 
 _node_kinds: dict[Type, str] = {
+    type(None): "null",
     bool: "boolean",
     int: "integer",
     float: "floating-point",
@@ -457,7 +668,9 @@ _node_kinds: dict[Type, str] = {
 _T = TypeVar("_T")
 
 
-def _ensure_node_kind(node_value, expected_node_type: Type[_T], node_uri: str) -> _T:
+def _ensure_node_kind(
+    node_value, expected_node_type: Type[_T], node_uri: NodeURI
+) -> _T:
     if not isinstance(node_value, expected_node_type):
         raise InvalidSpecError(
             f"invalid node kind: node_uri={node_uri!r} node_kind={_node_kinds[type(node_value)]} expected_node_kind={_node_kinds[expected_node_type]}"
@@ -465,14 +678,40 @@ def _ensure_node_kind(node_value, expected_node_type: Type[_T], node_uri: str) -
     return node_value
 
 
-def _check_id(id: str, node_uri: str) -> None:
-    if ID_PATTERN.fullmatch(id) is None:
+def _ensure_id(id, node_uri: NodeURI) -> str:
+    id = _ensure_node_kind(id, str, node_uri)
+    _check_id(id, node_uri)
+    return id
+
+
+def _check_ids(ids: list, node_uri: NodeURI) -> None:
+    for i, id in enumerate(ids):
+        _ensure_id(id, node_uri + f"[{i}]")
+
+
+def _check_imports(imports: list, node_uri: NodeURI) -> None:
+    for i, import_ in enumerate(imports):
+        node_uri2 = node_uri + f"[{i}]"
+        import_ = _ensure_node_kind(import_, str, node_uri2)
+        _check_string_length(len(import_), 1, None, node_uri2)
+
+
+def _check_id(id: str, node_uri: NodeURI) -> None:
+    if not _is_id(id):
         raise InvalidSpecError(
             f"invalid id; node_uri={node_uri!r} id={id!r} expected_pattern={ID_PATTERN.pattern!r}"
         )
 
 
-def _ensure_non_empty_mapping(mapping: dict, node_uri: str) -> None:
+# ids and field types repeat a lot across nodes, so their checks are memoized
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_id(string: str) -> bool:
+    return ID_PATTERN.fullmatch(string) is not None
+
+
+def _ensure_non_empty_mapping(mapping: dict, node_uri: NodeURI) -> None:
     if len(mapping) == 0:
         raise InvalidSpecError(f"non-empty mapping required: node_uri={node_uri!r}")
 
@@ -484,7 +723,7 @@ def _check_number(
     number: _T,
     min_number: Optional[_T],
     max_number: Optional[_T],
-    node_uri: str,
+    node_uri: NodeURI,
     *,
     min_number_is_exclusive: bool = False,
     max_number_is_exclusive: bool = False,
@@ -513,8 +752,8 @@ def _check_number(
                 )
 
 
-def _check_string(string: str, pattern, node_uri: str) -> None:
-    if pattern.fullmatch(string) is None:
+def _check_string(string: str, pattern: patterns.Pattern, node_uri: NodeURI) -> None:
+    if not pattern.fullmatch(string):
         raise InvalidSpecError(
             f"unexpected string: node_uri={node_uri!r} string={string!r} expected_pattern={pattern.pattern!r}"
         )
@@ -524,7 +763,7 @@ def _check_string_length(
     string_length: int,
     min_string_length: int,
     max_string_length: Optional[int],
-    node_uri: str,
+    node_uri: NodeURI,
 ) -> None:
     _check_length(
         "string", string_length, min_string_length, max_string_length, node_uri
@@ -535,7 +774,7 @@ def _check_sequence_length(
     sequence_length: int,
     min_sequence_length: int,
     max_sequence_length: Optional[int],
-    node_uri: str,
+    node_uri: NodeURI,
 ) -> None:
     _check_length(
         "sequence", sequence_length, min_sequence_length, max_sequence_length, node_uri
@@ -547,7 +786,7 @@ def _check_length(
     length: int,
     min_length: int,
     max_length: Optional[int],
-    node_uri: str,
+    node_uri: NodeURI,
 ) -> None:
     if length < min_length:
         raise InvalidSpecError(
@@ -559,34 +798,38 @@ def _check_length(
         )
 
 
-def _check_raw_model_type(raw_model_type: str, node_uri: str) -> None:
+def _check_raw_model_type(raw_model_type: str, node_uri: NodeURI) -> None:
     if MODEL_TYPE_PATTERN.fullmatch(raw_model_type) is None:
         raise InvalidSpecError(
             f"invalid model type; node_uri={node_uri!r} model_type={raw_model_type!r} expected_pattern={MODEL_TYPE_PATTERN.pattern!r}"
         )
 
 
-def _parse_raw_field_type(
-    raw_field_type: str, field_type: FieldType, node_uri: str
-) -> None:
-    _check_raw_field_type(raw_field_type, node_uri)
+@functools.lru_cache(maxsize=4096)
+def _parse_raw_field_type(raw_field_type: str) -> Union[str, Ref]:
     if (i := raw_field_type.find(".")) < 0:
         if raw_field_type[0].islower():
-            field_type.value = raw_field_type
-        else:
-            field_type.value = Ref(namespace=None, id=raw_field_type)
-    else:
-        field_type.value = Ref(namespace=raw_field_type[:i], id=raw_field_type[i + 1 :])
+            return sys.intern(raw_field_type)
+        return Ref(namespace=None, id=sys.intern(raw_field_type))
+    return Ref(
+        namespace=sys.intern(raw_field_type[:i]),
+        id=sys.intern(raw_field_type[i + 1 :]),
+    )
 
 
-def _check_raw_field_type(raw_field_type: str, node_uri: str) -> None:
-    if FIELD_TYPE_PATTERN.fullmatch(raw_field_type) is None:
+def _check_raw_field_type(raw_field_type: str, node_uri: NodeURI) -> None:
+    if not _is_field_type(raw_field_type):
         raise InvalidSpecError(
             f"invalid field type; node_uri={node_uri!r} field_type={raw_field_type!r} expected_pattern={FIELD_TYPE_PATTERN.pattern!r}"
         )
 
 
-def _check_enum_underlying_type(enum_underlying_type: str, node_uri: str) -> None:
+@functools.lru_cache(maxsize=4096)
+def _is_field_type(string: str) -> bool:
+    return FIELD_TYPE_PATTERN.fullmatch(string) is not None
+
+
+def _check_enum_underlying_type(enum_underlying_type: str, node_uri: NodeURI) -> None:
     if ENUM_UNDERLYING_TYPE_PATTERN.fullmatch(enum_underlying_type) is None:
         raise InvalidSpecError(
             f"invalid enum underlying type; node_uri={node_uri!r} enum_underlying_type={enum_underlying_type!r} expected_pattern={ENUM_UNDERLYING_TYPE_PATTERN.pattern!r}"
@@ -599,120 +842,15 @@ _MIN_INT64 = -(1 << 63)
 _MAX_INT64 = (1 << 63) - 1
 
 
-def _load_primitive_constraints(
-    primitive_type: str,
-    raw_object: dict,
-    primitive_constraints: PrimitiveConstraints,
-    node_uri: str,
-) -> None:
-    if primitive_type == BOOL:
-        pass
-    elif primitive_type in (INT32, INT64):
-        min = raw_object.pop("min", None)
-        if min is not None:
-            node_uri2 = node_uri + "/min"
-            min = _ensure_node_kind(min, int, node_uri2)
-            if primitive_type == INT32:
-                _check_number(min, _MIN_INT32, _MAX_INT32, node_uri2)
-            else:
-                _check_number(min, _MIN_INT64, _MAX_INT64, node_uri2)
-            primitive_constraints.min = min
-        max = raw_object.pop("max", None)
-        if max is not None:
-            node_uri2 = node_uri + "/max"
-            max = _ensure_node_kind(max, int, node_uri2)
-            if primitive_type == INT32:
-                _check_number(max, _MIN_INT32, _MAX_INT32, node_uri2)
-            else:
-                _check_number(max, _MIN_INT64, _MAX_INT64, node_uri2)
-            primitive_constraints.max = max
-        if min is not None and max is not None and min > max:
-            raise InvalidSpecError(
-                f"invalid primitive constraints, min > max: node_uri={node_uri!r} min={min} max={max}"
-            )
-    elif primitive_type in (FLOAT32, FLOAT64):
-        min = raw_object.pop("min", None)
-        if min is not None:
-            min = _ensure_node_kind(min, float, node_uri + "/min")
-            primitive_constraints.min = min
-            if (
-                min_is_exclusive := raw_object.pop("min_is_exclusive", None)
-            ) is not None:
-                min_is_exclusive = _ensure_node_kind(
-                    min_is_exclusive,
-                    bool,
-                    node_uri + "/min_is_exclusive",
-                )
-                primitive_constraints.min_is_exclusive = min_is_exclusive
-        max = raw_object.pop("max", None)
-        if max is not None:
-            max = _ensure_node_kind(max, float, node_uri + "/max")
-            primitive_constraints.max = max
-            if (
-                max_is_exclusive := raw_object.pop("max_is_exclusive", None)
-            ) is not None:
-                max_is_exclusive = _ensure_node_kind(
-                    max_is_exclusive,
-                    bool,
-                    node_uri + "/max_is_exclusive",
-                )
-                primitive_constraints.max_is_exclusive = max_is_exclusive
-        if min is not None and max is not None:
-            if min == max:
-                if (
-                    primitive_constraints.min_is_exclusive
-                    or primitive_constraints.max_is_exclusive
-                ):
-                    raise InvalidSpecError(
-                        f"invalid primitive constraints, min > max: node_uri={node_uri!r}"
-                        f" {'exclusive_' if primitive_constraints.min_is_exclusive else ''}min={min}"
-                        f" {'exclusive_' if primitive_constraints.max_is_exclusive else ''}max={max}"
-                    )
-            elif min > max:
-                raise InvalidSpecError(
-                    f"invalid primitive constraints, min > max: node_uri={node_uri!r} min={min} max={max}"
-                )
-    elif primitive_type == STRING:
-        min_length = raw_object.pop("min_length", None)
-        if min_length is not None:
-            node_uri2 = node_uri + "/min_length"
-            min_length = _ensure_node_kind(min_length, int, node_uri2)
-            _check_number(min_length, 0, None, node_uri2)
-            primitive_constraints.min_length = min_length
-        max_length = raw_object.pop("max_length", None)
-        if max_length is not None:
-            node_uri2 = node_uri + "/max_length"
-            max_length = _ensure_node_kind(max_length, int, node_uri2)
-            _check_number(max_length, 1, None, node_uri2)
-            primitive_constraints.max_length = max_length
-        if (
-            min_length is not None
-            and max_length is not None
-            and min_length > max_length
-        ):
-            raise InvalidSpecError(
-                f"invalid primitive constraints, min_length > max_length: node_uri={node_uri!r} min_length={min_length} max_length={max_length}"
-            )
-        if (pattern := raw_object.pop("pattern", None)) is not None:
-            node_uri2 = node_uri + "/pattern"
-            pattern = _ensure_node_kind(pattern, str, node_uri2)
-            _check_string_length(len(pattern), 1, None, node_uri2)
-            try:
-                re2.compile(pattern)
-            except re2.error:
-                raise InvalidSpecError(
-                    f"invalid regular expression (re2): node_uri={node_uri!r} reg_exp={pattern!r}"
-                ) from None
-            primitive_constraints.pattern = pattern
-    else:
-        assert False, primitive_type
+def _check_pattern(pattern: str, node_uri: NodeURI) -> None:
+    _check_string_length(len(pattern), 1, None, node_uri)
 
 
 def _check_primitive_value(
     primitive_type: str,
     primitive_value: Any,
     primitive_constraints: PrimitiveConstraints,
-    node_uri: str,
+    node_uri: NodeURI,
 ) -> None:
     if primitive_type == BOOL:
         _ensure_node_kind(primitive_value, bool, node_uri)
@@ -750,12 +888,12 @@ def _check_primitive_value(
             node_uri,
         )
         if primitive_constraints.pattern != "":
-            _check_string(pv, re2.compile(primitive_constraints.pattern), node_uri)
+            _check_string(pv, patterns.get(primitive_constraints.pattern), node_uri)
     else:
         assert False, primitive_type
 
 
-def _parse_raw_ref(raw_ref: str, node_uri: str) -> Ref:
+def _parse_raw_ref(raw_ref: str, node_uri: NodeURI) -> Ref:
     _check_raw_ref(raw_ref, node_uri)
     if (i := raw_ref.find(".")) < 0:
         ref = Ref(namespace=None, id=raw_ref)
@@ -764,8 +902,228 @@ def _parse_raw_ref(raw_ref: str, node_uri: str) -> Ref:
     return ref
 
 
-def _check_raw_ref(raw_ref: str, node_uri: str) -> None:
+def _check_raw_ref(raw_ref: str, node_uri: NodeURI) -> None:
     if REF_PATTERN.fullmatch(raw_ref) is None:
         raise InvalidSpecError(
             f"invalid ref; node_uri={node_uri!r} ref={raw_ref!r} expected_pattern={REF_PATTERN.pattern!r}"
         )
+
+
+def _primitive_constraint_items(
+    primitive_type: str, end: Callable[[_Parser, Any, NodeURI], None]
+) -> tuple[Union[_Key, _Rule], ...]:
+    def key(name: str, node_type: Type, **kwargs) -> _Key:
+        load = functools.partial(_Parser._load_primitive_constraint, attr=name)
+        return _Key(name, node_type, load=load, **kwargs)
+
+    items: tuple[Union[_Key, _Rule], ...]
+    if primitive_type == BOOL:
+        return ()
+    elif primitive_type in (INT32, INT64):
+        min, max = (
+            (_MIN_INT32, _MAX_INT32)
+            if primitive_type == INT32
+            else (_MIN_INT64, _MAX_INT64)
+        )
+        items = (
+            key("min", int, min=min, max=max),
+            key("max", int, min=min, max=max),
+            _Rule(_Parser._check_number_constraints, "max"),
+        )
+    elif primitive_type in (FLOAT32, FLOAT64):
+        items = (
+            key("min", float),
+            key("min_is_exclusive", bool, requires="min"),
+            key("max", float),
+            key("max_is_exclusive", bool, requires="max"),
+            _Rule(_Parser._check_number_constraints, "max"),
+        )
+    elif primitive_type == STRING:
+        items = (
+            key("min_length", int, min=0),
+            key("max_length", int, min=1),
+            _Rule(_Parser._check_length_constraints, "max_length"),
+            key("pattern", str, check=_check_pattern),
+            _Rule(_Parser._check_pattern_constraint, "pattern"),
+        )
+    else:
+        assert False, primitive_type
+    key_names = (item.name for item in items if isinstance(item, _Key))
+    return (*items, _Rule(end, *key_names))
+
+
+_DESCRIPTION_KEY = _Key("description", str, attr="description")
+
+_SPEC_SCHEMA = _NodeSchema(
+    _Key("namespace", str, check=_check_id, attr="namespace"),
+    _Key("imports", list, check=_check_imports, attr="imports"),
+    _Key(
+        "services", dict, check=_ensure_non_empty_mapping, load=_Parser._load_services
+    ),
+    _Key("methods", dict, check=_ensure_non_empty_mapping, load=_Parser._load_methods),
+    _Key("models", dict, check=_ensure_non_empty_mapping, load=_Parser._load_models),
+    _Key("errors", dict, check=_ensure_non_empty_mapping, load=_Parser._load_errors),
+    separator="",
+)
+
+_SERVICE_SCHEMA = _NodeSchema(
+    _Key("version", str, is_required=True, attr="version"),
+    _DESCRIPTION_KEY,
+    _Key("rpc_path_template", str, attr="rpc_path_template"),
+)
+
+_METHOD_SCHEMA = _NodeSchema(
+    _Key("service_ids", list, check=_check_ids, attr="service_ids"),
+    _Key(
+        "service_id",
+        str,
+        is_required=True,
+        check=_check_id,
+        load=_Parser._load_service_id,
+        excludes="service_ids",
+    ),
+    _Key("summary", str, attr="summary"),
+    _DESCRIPTION_KEY,
+    _Key("params", dict, check=_ensure_non_empty_mapping, load=_Parser._load_params),
+    _Key("results", dict, check=_ensure_non_empty_mapping, load=_Parser._load_results),
+    _Key(
+        "error_cases",
+        dict,
+        check=_ensure_non_empty_mapping,
+        load=_Parser._load_error_cases,
+    ),
+)
+
+_ERROR_CASE_SCHEMA = _NodeSchema(_DESCRIPTION_KEY)
+
+_STRUCT_MODEL_SCHEMA = _NodeSchema(
+    _Key(
+        "type",
+        str,
+        is_required=True,
+        check=_check_raw_model_type,
+        load=_Parser._load_model_type,
+    ),
+    _Key(
+        "fields",
+        dict,
+        check=_ensure_non_empty_mapping,
+        load=_Parser._load_struct_fields,
+    ),
+    _DESCRIPTION_KEY,
+)
+
+_ENUM_MODEL_SCHEMA = _NodeSchema(
+    _Key("type", str, is_required=True, load=_Parser._load_model_type),
+    _Key(
+        "underlying_type",
+        str,
+        is_required=True,
+        check=_check_enum_underlying_type,
+        load=_Parser._load_enum_underlying_type,
+    ),
+    _Key(
+        "constants",
+        dict,
+        check=_ensure_non_empty_mapping,
+        load=_Parser._load_enum_constants,
+    ),
+    _DESCRIPTION_KEY,
+)
+
+_XPRIMIT_MODEL_SCHEMAS = {
+    primitive_type: _NodeSchema(
+        _Key("type", str, is_required=True, load=_Parser._load_model_type),
+        *_primitive_constraint_items(primitive_type, _Parser._end_xprimit_constraints),
+        _Key("example", object, load=_Parser._load_xprimit_example),
+        _DESCRIPTION_KEY,
+    )
+    for primitive_type in (INT32, INT64, FLOAT32, FLOAT64, STRING)
+}
+
+
+def _model_schema(raw_model) -> _NodeSchema:
+    model_type = raw_model.get("type") if isinstance(raw_model, dict) else None
+    if model_type == ENUM:
+        return _ENUM_MODEL_SCHEMA
+    if isinstance(model_type, str) and model_type in _XPRIMIT_MODEL_SCHEMAS:
+        return _XPRIMIT_MODEL_SCHEMAS[model_type]
+    # reports an invalid model type, if any
+    return _STRUCT_MODEL_SCHEMA
+
+
+def _field_schema_items(
+    primitive_type: Optional[str],
+) -> tuple[Union[_Key, _Rule], ...]:
+    if primitive_type is None:
+        type_key = _Key(
+            "type",
+            str,
+            is_required=True,
+            check=_check_raw_field_type,
+            load=_Parser._load_field_type,
+        )
+        constraint_items: tuple[Union[_Key, _Rule], ...] = ()
+        example_keys: tuple[_Key, ...] = ()
+    else:
+        type_key = _Key("type", str, is_required=True, load=_Parser._load_field_type)
+        constraint_items = _primitive_constraint_items(
+            primitive_type, _Parser._end_field_constraints
+        )
+        example_keys = (_Key("example", object, load=_Parser._load_field_example),)
+    return (
+        type_key,
+        *constraint_items,
+        _Key("is_optional", bool, attr="is_optional"),
+        _Key("is_repeated", bool, attr="is_repeated", excludes="is_optional"),
+        _Key(
+            "min_count",
+            int,
+            min=0,
+            attr="min_count",
+            requires="is_repeated",
+            excludes="is_optional",
+        ),
+        _Key(
+            "max_count",
+            int,
+            min=1,
+            attr="max_count",
+            requires="is_repeated",
+            excludes="is_optional",
+        ),
+        _Rule(_Parser._check_field_count, "max_count"),
+        _DESCRIPTION_KEY,
+        *example_keys,
+    )
+
+
+_PRIMITIVE_FIELD_SCHEMAS = {
+    primitive_type: _NodeSchema(*_field_schema_items(primitive_type))
+    for primitive_type in (BOOL, INT32, INT64, FLOAT32, FLOAT64, STRING)
+}
+
+# reports an invalid field type, if any
+_MODEL_FIELD_SCHEMA = _NodeSchema(*_field_schema_items(None))
+
+
+def _field_schema(raw_field) -> _NodeSchema:
+    field_type = raw_field.get("type") if isinstance(raw_field, dict) else None
+    if isinstance(field_type, str):
+        return _PRIMITIVE_FIELD_SCHEMAS.get(field_type, _MODEL_FIELD_SCHEMA)
+    return _MODEL_FIELD_SCHEMA
+
+
+_CONSTANT_SCHEMAS = {
+    enum_underlying_type: _NodeSchema(
+        _Key("value", type, is_required=True, attr="value"),
+        _DESCRIPTION_KEY,
+    )
+    for enum_underlying_type, type in ((INT32, int), (INT64, int), (STRING, str))
+}
+
+_ERROR_SCHEMA = _NodeSchema(
+    _Key("code", int, is_required=True, min=1000, max=_MAX_INT32, attr="code"),
+    _Key("status_code", int, is_required=True, min=100, max=599, attr="status_code"),
+    _DESCRIPTION_KEY,
+)
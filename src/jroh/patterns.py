@@ -0,0 +1,68 @@
+from typing import Any, Optional
+
+# re2 is imported lazily since most specs have no patterns
+
+
+class Pattern:
+    __slots__ = ("id", "pattern", "_regexp", "_error", "_anchored")
+
+    def __init__(self, id: int, pattern: str) -> None:
+        self.id = id
+        self.pattern = pattern
+        self._regexp: Any = None
+        self._error: Optional[str] = None
+        self._anchored: Optional[Pattern] = None
+
+    def anchored(self) -> "Pattern":
+        # the equivalent pattern anchored at both ends, e.g. for Go's MatchString
+        if self._anchored is None:
+            pattern = self.pattern
+            if not pattern.startswith("^"):
+                pattern = "^" + pattern
+            if not pattern.endswith("$"):
+                pattern += "$"
+            self._anchored = get(pattern)
+        return self._anchored
+
+    def is_valid(self) -> bool:
+        self._compile()
+        return self._error is None
+
+    def fullmatch(self, string: str) -> bool:
+        self._compile()
+        assert self._error is None, self._error
+        return self._regexp.fullmatch(string) is not None
+
+    def _compile(self) -> None:
+        if self._regexp is not None or self._error is not None:
+            return
+        import re2
+
+        try:
+            self._regexp = re2.compile(self.pattern)
+        except re2.error as e:
+            self._error = str(e)
+
+
+class PatternRegistry:
+    # each distinct pattern is registered once, given an id in registration order, and
+    # compiled on first use
+    def __init__(self) -> None:
+        self._pattern_2_record: dict[str, Pattern] = {}
+
+    def get(self, pattern: str) -> Pattern:
+        record = self._pattern_2_record.get(pattern)
+        if record is None:
+            record = Pattern(len(self._pattern_2_record), pattern)
+            self._pattern_2_record[pattern] = record
+        return record
+
+    def __len__(self) -> int:
+        return len(self._pattern_2_record)
+
+
+_registry = PatternRegistry()
+
+
+def get(pattern: str) -> Pattern:
+    return _registry.get(pattern)
@@ -1,7 +1,10 @@
+import sys
 from dataclasses import dataclass
+from typing import Generic, Iterable, Iterator, Optional, TypeVar
 
 from . import utils
 from .spec import (
+    ANY_ID,
     ENUM,
     STRUCT,
     Constant,
@@ -21,101 +24,322 @@ from .spec import (
 class ResolveSpecsResults:
     unused_node_uris: list[str]
     merged_specs: list[Spec]
+    dependency_graph: "DependencyGraph"
+    errors: list["InvalidSpecError"]
 
 
-def resolve_specs(specs: list[Spec]) -> ResolveSpecsResults:
-    resolver = _Resolver()
+def resolve_specs(
+    specs: list[Spec], keep_going: bool = False, only: Optional[list[str]] = None
+) -> ResolveSpecsResults:
+    resolver = _Resolver(keep_going, only)
     resolver.resolve_specs(specs)
     return ResolveSpecsResults(
         unused_node_uris=resolver.unused_node_uris(),
         merged_specs=resolver.merged_specs(),
+        dependency_graph=resolver.dependency_graph(),
+        errors=resolver.errors(),
     )
 
 
+class DependencyGraph:
+    def __init__(self) -> None:
+        self.file_path_2_namespace: dict[str, str] = {}
+        self.namespace_2_dependencies: dict[str, set[str]] = {}
+        self.model_2_dependencies: dict[tuple[str, str], set[tuple[str, str]]] = {}
+
+    def add_file(self, file_path: str, namespace: str) -> None:
+        self.file_path_2_namespace[file_path] = namespace
+        self.namespace_2_dependencies.setdefault(namespace, set())
+
+    def copy(self) -> "DependencyGraph":
+        dependency_graph = DependencyGraph()
+        dependency_graph.file_path_2_namespace = dict(self.file_path_2_namespace)
+        dependency_graph.namespace_2_dependencies = {
+            namespace: set(dependencies)
+            for namespace, dependencies in self.namespace_2_dependencies.items()
+        }
+        dependency_graph.model_2_dependencies = {
+            model_key: set(dependencies)
+            for model_key, dependencies in self.model_2_dependencies.items()
+        }
+        return dependency_graph
+
+    def add_namespace_dependency(self, namespace: str, namespace2: str) -> None:
+        if namespace2 != namespace:
+            self.namespace_2_dependencies[namespace].add(namespace2)
+
+    def add_model_dependency(
+        self, model_key: tuple[str, str], model_key2: tuple[str, str]
+    ) -> None:
+        self.model_2_dependencies.setdefault(model_key, set()).add(model_key2)
+
+    def namespaces_of_files(self, file_paths: Iterable[str]) -> set[str]:
+        namespaces = set()
+        for file_path in file_paths:
+            if (namespace := self.file_path_2_namespace.get(file_path)) is not None:
+                namespaces.add(namespace)
+        return namespaces
+
+    def dependent_namespaces(self, namespaces: set[str]) -> set[str]:
+        return {
+            namespace
+            for namespace, dependencies in self.namespace_2_dependencies.items()
+            if not dependencies.isdisjoint(namespaces)
+        }
+
+    def dependency_namespaces(self, namespaces: set[str]) -> set[str]:
+        dependency_namespaces: set[str] = set()
+        namespace_stack = list(namespaces)
+        while len(namespace_stack) >= 1:
+            namespace = namespace_stack.pop()
+            for namespace2 in self.namespace_2_dependencies.get(namespace, ()):
+                if namespace2 not in dependency_namespaces:
+                    dependency_namespaces.add(namespace2)
+                    namespace_stack.append(namespace2)
+        return dependency_namespaces
+
+    def affected_namespaces(
+        self,
+        changed_file_paths: Iterable[str],
+        old_dependency_graph: Optional["DependencyGraph"] = None,
+    ) -> set[str]:
+        # a namespace's outputs depend on its own files, the models it refers to and
+        # which of its models are referred to by others
+        dependency_graphs = [self]
+        if old_dependency_graph is not None:
+            dependency_graphs.append(old_dependency_graph)
+        changed_file_paths = list(changed_file_paths)
+        changed_namespaces: set[str] = set()
+        for dependency_graph in dependency_graphs:
+            changed_namespaces |= dependency_graph.namespaces_of_files(
+                changed_file_paths
+            )
+        affected_namespaces = set(changed_namespaces)
+        for dependency_graph in dependency_graphs:
+            affected_namespaces |= dependency_graph.dependent_namespaces(
+                changed_namespaces
+            )
+            affected_namespaces |= dependency_graph.dependency_namespaces(
+                changed_namespaces
+            )
+        return affected_namespaces
+
+
+_K = TypeVar("_K", str, int)
+_T = TypeVar("_T")
+
+
+class _SymbolTable(Generic[_K, _T]):
+    # symbols indexed per namespace, which saves making and hashing a tuple for each
+    # lookup, and iterated in insertion order
+    def __init__(self) -> None:
+        self._namespace_2_key_2_symbol: dict[str, dict[_K, _T]] = {}
+        self._namespaced_symbols: list[tuple[str, _T]] = []
+
+    def add(self, namespace: str, key: _K, symbol: _T) -> Optional[_T]:
+        # returns the symbol the key is taken by, if any, instead of adding the symbol
+        key_2_symbol = self._namespace_2_key_2_symbol.get(namespace)
+        if key_2_symbol is None:
+            key_2_symbol = self._namespace_2_key_2_symbol[namespace] = {}
+        elif (symbol2 := key_2_symbol.get(key)) is not None:
+            return symbol2
+        key_2_symbol[key] = symbol
+        self._namespaced_symbols.append((namespace, symbol))
+        return None
+
+    def get(self, namespace: str, key: _K) -> Optional[_T]:
+        key_2_symbol = self._namespace_2_key_2_symbol.get(namespace)
+        if key_2_symbol is None:
+            return None
+        return key_2_symbol.get(key)
+
+    def namespace_symbols(self, namespace: str) -> dict[_K, _T]:
+        return self._namespace_2_key_2_symbol.get(namespace, {})
+
+    def clear(self) -> None:
+        self._namespace_2_key_2_symbol.clear()
+        self._namespaced_symbols.clear()
+
+    def remove_namespace(self, namespace: str) -> None:
+        if self._namespace_2_key_2_symbol.pop(namespace, None) is not None:
+            self._namespaced_symbols = [
+                namespaced_symbol
+                for namespaced_symbol in self._namespaced_symbols
+                if namespaced_symbol[0] != namespace
+            ]
+
+    def __iter__(self) -> Iterator[tuple[str, _T]]:
+        return iter(self._namespaced_symbols)
+
+
 class _Resolver:
-    def __init__(self):
-        self._services: dict[tuple[str, str], Service] = {}
-        self._methods: dict[tuple[str, str], Method] = {}
-        self._models: dict[tuple[str, str], Model] = {}
-        self._constants: dict[tuple[str, str], Constant] = {}
-        self._errors_by_id: dict[tuple[str, str], Error] = {}
-        self._errors_by_code: dict[tuple[str, int], Error] = {}
+    def __init__(self, keep_going: bool = False, only: Optional[list[str]] = None):
+        self._services: _SymbolTable[str, Service] = _SymbolTable()
+        self._methods: _SymbolTable[str, Method] = _SymbolTable()
+        self._models: _SymbolTable[str, Model] = _SymbolTable()
+        self._constants: _SymbolTable[str, Constant] = _SymbolTable()
+        self._errors_by_id: _SymbolTable[str, Error] = _SymbolTable()
+        self._errors_by_code: _SymbolTable[int, Error] = _SymbolTable()
         self._namespace: str = ""
         self._unused_node_uris: list[str] = []
         self._merged_specs: list[Spec] = []
+        self._revisited_structs: list[Model] = []
+        self._dependency_graph = DependencyGraph()
+        # in keep-going mode, an error is recorded and the node in error is left out,
+        # and errors caused by the invalid nodes the parser left out are suppressed
+        self._keep_going = keep_going
+        self._errors: list[InvalidSpecError] = []
+        self._broken_ids: set[tuple[str, str, str]] = set()
+        self._some_namespace_is_broken = False
+        # given targets (NAMESPACE or NAMESPACE.SERVICE), only the methods of the
+        # services selected are resolved, hence the merged specs only have the nodes
+        # reachable from them
+        self._only = only
+        self._selected_service_keys: Optional[set[tuple[str, str]]] = None
 
     def resolve_specs(self, specs: list[Spec]) -> None:
+        for spec in specs:
+            for node_kind, id in spec.broken_ids:
+                if node_kind == "namespace":
+                    self._some_namespace_is_broken = True
+                self._broken_ids.add((spec.namespace, node_kind, id))
         for spec in specs:
             self._load_spec(spec)
+        if self._only is not None:
+            self._select_services(self._only)
         for spec in specs:
             self._resolve_spec(spec)
+        self._check_model_recursion()
         self._merge_specs()
 
     def _load_spec(self, spec: Spec) -> None:
+        file_path = _file_path_of_spec(spec)
+        # interned, hence the namespaces of the symbols and of the specs resolved
+        # compare by identity
+        namespace = sys.intern(spec.namespace)
+        self._dependency_graph.add_file(file_path, namespace)
         for service in spec.services:
             if (
-                service2 := self._services.get((spec.namespace, service.id))
+                service2 := self._services.add(namespace, service.id, service)
             ) is not None:
-                raise InvalidSpecError(
-                    f"duplicate service id; node_uri1={service.node_uri!r} node_uri2={service2.node_uri!r}",
+                self._report(
+                    InvalidSpecError(
+                        f"duplicate service id; node_uri1={service.node_uri!r} node_uri2={service2.node_uri!r}",
+                    )
                 )
-            self._services[(spec.namespace, service.id)] = service
+                continue
+            service.methods = []
+            service.rpc_paths = []
         for method in spec.methods:
-            if (method2 := self._methods.get((spec.namespace, method.id))) is not None:
-                raise InvalidSpecError(
-                    f"duplicate method id; node_uri1={method.node_uri!r} node_uri2={method2.node_uri!r}",
+            if (method2 := self._methods.add(namespace, method.id, method)) is not None:
+                self._report(
+                    InvalidSpecError(
+                        f"duplicate method id; node_uri1={method.node_uri!r} node_uri2={method2.node_uri!r}",
+                    )
                 )
-            self._methods[(spec.namespace, method.id)] = method
+                continue
         for model in spec.models:
-            if (model2 := self._models.get((spec.namespace, model.id))) is not None:
-                raise InvalidSpecError(
-                    f"duplicate model id; node_uri1={model.node_uri!r} node_uri2={model2.node_uri!r}",
+            if (model2 := self._models.add(namespace, model.id, model)) is not None:
+                self._report(
+                    InvalidSpecError(
+                        f"duplicate model id; node_uri1={model.node_uri!r} node_uri2={model2.node_uri!r}",
+                    )
                 )
-            model.namespace = spec.namespace
-            self._models[(spec.namespace, model.id)] = model
+                continue
+            model.namespace = namespace
+            model.ref_count = 0
         for model in spec.models:
             if model.type != ENUM:
                 continue
             for constant in model.enum().constants:
                 if (
-                    constant2 := self._constants.get((spec.namespace, constant.id))
+                    constant2 := self._constants.add(namespace, constant.id, constant)
                 ) is not None:
-                    raise InvalidSpecError(
-                        f"duplicate constant id; node_uri1={constant.node_uri!r} node_uri2={constant2.node_uri!r}",
+                    self._report(
+                        InvalidSpecError(
+                            f"duplicate constant id; node_uri1={constant.node_uri!r} node_uri2={constant2.node_uri!r}",
+                        )
                     )
-                self._constants[(spec.namespace, constant.id)] = constant
+                    continue
         for error in spec.errors:
             if (
-                error2 := self._errors_by_id.get((spec.namespace, error.id))
+                error2 := self._errors_by_id.add(namespace, error.id, error)
             ) is not None:
-                raise InvalidSpecError(
-                    f"duplicate error id; node_uri1={error.node_uri!r} node_uri2={error2.node_uri!r}",
+                self._report(
+                    InvalidSpecError(
+                        f"duplicate error id; node_uri1={error.node_uri!r} node_uri2={error2.node_uri!r}",
+                    )
                 )
-            self._errors_by_id[(spec.namespace, error.id)] = error
+                continue
+            error.ref_count = 0
         for error in spec.errors:
             if (
-                error2 := self._errors_by_code.get((spec.namespace, error.code))
+                error2 := self._errors_by_code.add(namespace, error.code, error)
             ) is not None:
                 node_uri1 = error.node_uri + "/code"
                 node_uri2 = error2.node_uri + "/code"
-                raise InvalidSpecError(
-                    f"duplicate error code; node_uri1={node_uri1!r} node_uri2={node_uri2!r} error_code={error.code}",
+                self._report(
+                    InvalidSpecError(
+                        f"duplicate error code; node_uri1={node_uri1!r} node_uri2={node_uri2!r} error_code={error.code}",
+                    )
                 )
-            self._errors_by_code[(spec.namespace, error.code)] = error
+                continue
+
+    def _select_services(self, targets: list[str]) -> None:
+        selected_service_keys: set[tuple[str, str]] = set()
+        for target in targets:
+            namespace, _, service_id = target.partition(".")
+            if service_id == "":
+                service_keys = [
+                    (namespace, service_id2)
+                    for service_id2 in self._services.namespace_symbols(namespace)
+                ]
+            elif self._services.get(namespace, service_id) is not None:
+                service_keys = [(namespace, service_id)]
+            else:
+                service_keys = []
+            if len(service_keys) == 0:
+                if not self._is_broken(namespace, "services", service_id or ANY_ID):
+                    self._report(
+                        InvalidSpecError(f"target not found; target={target!r}")
+                    )
+                continue
+            selected_service_keys.update(service_keys)
+        self._selected_service_keys = selected_service_keys
+
+    def _is_service_selected(self, namespace: str, service_id: str) -> bool:
+        return (
+            self._selected_service_keys is None
+            or (namespace, service_id) in self._selected_service_keys
+        )
+
+    def _is_method_selected(self, namespace: str, method: Method) -> bool:
+        return any(
+            self._is_service_selected(namespace, service_id)
+            for service_id in method.service_ids
+        )
 
     def _resolve_spec(self, spec: Spec) -> None:
-        self._namespace = spec.namespace
+        self._namespace = sys.intern(spec.namespace)
         for method in spec.methods:
-            self._resolve_method(method)
+            if self._is_method_selected(self._namespace, method):
+                self._resolve_method(method)
 
     def _resolve_method(self, method: Method) -> None:
         for i, service_id in enumerate(method.service_ids):
-            service = self._services.get((self._namespace, service_id))
+            service = self._services.get(self._namespace, service_id)
             if service is None:
-                node_uri = method.node_uri + f"/service_ids[{i}]"
-                raise InvalidSpecError(
-                    f"service not found; node_uri={node_uri!r} service_id={service_id!r}",
-                )
+                if not self._is_broken(self._namespace, "services", service_id):
+                    node_uri = method.node_uri + f"/service_ids[{i}]"
+                    self._report(
+                        InvalidSpecError(
+                            f"service not found; node_uri={node_uri!r} service_id={service_id!r}",
+                        ),
+                        self._namespace,
+                    )
+                continue
+            if not self._is_service_selected(self._namespace, service_id):
+                continue
             service.methods.append(method)
             rpc_path = "/" + service.rpc_path_template.lstrip("/").format(
                 namespace=utils.pascal_case(self._namespace),
@@ -132,48 +356,142 @@ class _Resolver:
         error_cases: dict[int, ErrorCase] = {}
         for error_case in method.error_cases:
             error = error_case.error
-            assert error is not None
+            if error is None:
+                # not found, which has been reported
+                continue
             if (error_case2 := error_cases.get(error.code)) is not None:
-                raise InvalidSpecError(
-                    f"error code conflict; node_uri1={error_case.node_uri!r} node_uri2={error_case2.node_uri!r} error_code={error.code!r}",
+                self._report(
+                    InvalidSpecError(
+                        f"error code conflict; node_uri1={error_case.node_uri!r} node_uri2={error_case2.node_uri!r} error_code={error.code!r}",
+                    ),
+                    self._namespace,
                 )
+                continue
             error_cases[error.code] = error_case
 
     def _resolve_params(self, params: Params) -> None:
-        for field in params.fields:
-            self._resolve_field(field)
+        self._resolve_fields(params.fields)
 
     def _resolve_results(self, results: Results) -> None:
-        for field in results.fields:
-            self._resolve_field(field)
+        self._resolve_fields(results.fields)
+
+    def _resolve_fields(
+        self, fields: list[Field], model: Optional[Model] = None
+    ) -> None:
+        # depth-first, with an explicit stack instead of recursion since models can be
+        # nested arbitrarily deep, and each model is entered on its first reference only
+        stack: list[tuple[str, Optional[Model], Iterator[Field]]] = [
+            (self._namespace if model is None else model.namespace, model, iter(fields))
+        ]
+        while len(stack) >= 1:
+            namespace2, model, fields2 = stack[-1]
+            for field in fields2:
+                model2 = self._resolve_field(field, namespace2, model)
+                if (
+                    model2 is not None
+                    and model2.ref_count == 1
+                    and model2.type == STRUCT
+                ):
+                    stack.append(
+                        (model2.namespace, model2, iter(model2.struct().fields))
+                    )
+                    break
+            else:
+                stack.pop()
 
-    def _resolve_field(self, field: Field) -> None:
+    def _resolve_field(
+        self, field: Field, namespace: str, model: Optional[Model]
+    ) -> Optional[Model]:
         field_type = field.type
         if field_type.is_primitive():
-            return
+            return None
         model_ref = field_type.model_ref()
-        namespace = model_ref.namespace
-        if namespace is None:
-            namespace = self._namespace
+        namespace2 = model_ref.namespace
+        if namespace2 is None:
+            namespace2 = namespace
         model_id = model_ref.id
-        model = self._models.get((namespace, model_id))
-        if model is None:
-            node_uri = field.node_uri + "/type"
-            raise InvalidSpecError(
-                f"model not found; node_uri={node_uri!r} namespace={namespace!r} model_id={model_id!r}",
+        model2 = self._models.get(namespace2, model_id)
+        if model2 is None:
+            # not to leave the field linked to a model of an earlier resolution
+            field_type.model = None
+            self._add_missing_ref(namespace, namespace2)
+            if not self._is_broken(namespace2, "models", model_id):
+                node_uri = field.node_uri + "/type"
+                self._report(
+                    InvalidSpecError(
+                        f"model not found; node_uri={node_uri!r} namespace={namespace2!r} model_id={model_id!r}",
+                    ),
+                    namespace,
+                )
+            return None
+        field_type.model = model2
+        self._dependency_graph.add_namespace_dependency(namespace, namespace2)
+        if model is not None:
+            self._dependency_graph.add_model_dependency(
+                (model.namespace, model.id), (namespace2, model_id)
             )
-        field_type.model = model
-        model.ref_count += 1
-        if model.ref_count == 1:
-            self._resolve_model(model)
+        model2.ref_count += 1
+        if (
+            model2.ref_count >= 2
+            and model is not None
+            and model2.type == STRUCT
+            and not (field.is_optional or field.is_repeated)
+        ):
+            # any cycle has an edge to a struct entered already
+            self._revisited_structs.append(model2)
+        return model2
 
-    def _resolve_model(self, model: Model) -> None:
-        if model.type == STRUCT:
-            namespace = self._namespace
-            self._namespace = model.namespace
-            for field in model.struct().fields:
-                self._resolve_field(field)
-            self._namespace = namespace
+    def _check_model_recursion(self) -> None:
+        # a struct can contain itself, directly or not, only through optional or
+        # repeated fields, otherwise its values would be infinitely large; such cycles
+        # are found as the strongly connected components of the graph of the structs
+        # contained by value, with Tarjan's algorithm run without recursion from the
+        # structs entered more than once
+        model_2_models2: dict[Model, list[Model]] = {}
+        model_2_index: dict[Model, int] = {}
+        low_links: list[int] = []
+        component_stack: list[Model] = []
+        on_component_stack: set[Model] = set()
+
+        def enter(model: Model) -> Iterator[Model]:
+            model_2_index[model] = len(low_links)
+            low_links.append(len(low_links))
+            component_stack.append(model)
+            on_component_stack.add(model)
+            models2 = model_2_models2[model] = _value_dependencies(model)
+            return iter(models2)
+
+        for root_model in self._revisited_structs:
+            if root_model in model_2_index:
+                continue
+            stack = [(root_model, enter(root_model))]
+            while len(stack) >= 1:
+                model, models2 = stack[-1]
+                index = model_2_index[model]
+                for model2 in models2:
+                    index2 = model_2_index.get(model2)
+                    if index2 is None:
+                        stack.append((model2, enter(model2)))
+                        break
+                    if model2 in on_component_stack and index2 < low_links[index]:
+                        low_links[index] = index2
+                else:
+                    stack.pop()
+                    if len(stack) >= 1:
+                        parent_index = model_2_index[stack[-1][0]]
+                        if low_links[index] < low_links[parent_index]:
+                            low_links[parent_index] = low_links[index]
+                    if low_links[index] == index:
+                        component: list[Model] = []
+                        while len(component) == 0 or component[-1] is not model:
+                            component.append(component_stack.pop())
+                            on_component_stack.remove(component[-1])
+                        component.reverse()
+                        if len(component) >= 2 or model in model_2_models2[model]:
+                            self._report_model_recursion(component)
+
+    def _report_model_recursion(self, component: list[Model]) -> None:
+        self._report(_model_recursion_error(component))
 
     def _resolve_error_case(self, error_case: ErrorCase) -> None:
         error_ref = error_case.error_ref
@@ -181,15 +499,42 @@ class _Resolver:
         if namespace is None:
             namespace = self._namespace
         error_id = error_ref.id
-        error = self._errors_by_id.get((namespace, error_id))
+        error = self._errors_by_id.get(namespace, error_id)
         if error is None:
-            error_case.node_uri + "/type"
-            raise InvalidSpecError(
-                f"error not found; node_uri={error_case.node_uri!r} namespace={namespace!r} error_id={error_id!r}",
-            )
+            error_case.error = None
+            self._add_missing_ref(self._namespace, namespace)
+            if not self._is_broken(namespace, "errors", error_id):
+                self._report(
+                    InvalidSpecError(
+                        f"error not found; node_uri={error_case.node_uri!r} namespace={namespace!r} error_id={error_id!r}",
+                    ),
+                    self._namespace,
+                )
+            return
         error_case.error = error
+        self._dependency_graph.add_namespace_dependency(self._namespace, namespace)
         error.ref_count += 1
 
+    def _report(
+        self, error: "InvalidSpecError", namespace: Optional[str] = None
+    ) -> None:
+        # the namespace is the one of the node in error, for an error of resolution
+        if not self._keep_going:
+            raise error
+        self._errors.append(error)
+
+    def _add_missing_ref(self, namespace: str, namespace2: str) -> None:
+        # a node of the namespace refers to a node of the other one which is not there
+        pass
+
+    def _is_broken(self, namespace: str, node_kind: str, id: str) -> bool:
+        # a node of a namespace which failed to parse may be anywhere
+        return (
+            self._some_namespace_is_broken
+            or (namespace, node_kind, id) in self._broken_ids
+            or (namespace, node_kind, ANY_ID) in self._broken_ids
+        )
+
     def _merge_specs(self):
         merged_specs: dict[str, Spec] = {}
 
@@ -201,24 +546,32 @@ class _Resolver:
                 merged_specs[namespace] = spec
             return spec
 
-        for (namespace, _), service in self._services.items():
+        # when pruned, the nodes left out are not necessarily unused
+        pruned = self._selected_service_keys is not None
+        for namespace, service in self._services:
+            if not self._is_service_selected(namespace, service.id):
+                continue
             if len(service.methods) == 0:
-                self._unused_node_uris.append(service.node_uri)
+                self._unused_node_uris.append(str(service.node_uri))
             else:
                 spec = get_spec(namespace)
                 spec.services.append(service)
-        for (namespace, _), method in self._methods.items():
+        for namespace, method in self._methods:
+            if not self._is_method_selected(namespace, method):
+                continue
             spec = get_spec(namespace)
             spec.methods.append(method)
-        for (namespace, _), model in self._models.items():
+        for namespace, model in self._models:
             if model.ref_count == 0:
-                self._unused_node_uris.append(model.node_uri)
+                if not pruned:
+                    self._unused_node_uris.append(str(model.node_uri))
             else:
                 spec = get_spec(namespace)
                 spec.models.append(model)
-        for (namespace, _), error in self._errors_by_id.items():
+        for namespace, error in self._errors_by_id:
             if error.ref_count == 0:
-                self._unused_node_uris.append(error.node_uri)
+                if not pruned:
+                    self._unused_node_uris.append(str(error.node_uri))
             else:
                 spec = get_spec(namespace)
                 spec.errors.append(error)
@@ -230,6 +583,418 @@ class _Resolver:
     def merged_specs(self) -> list[Spec]:
         return self._merged_specs
 
+    def dependency_graph(self) -> DependencyGraph:
+        return self._dependency_graph
+
+    def errors(self) -> list["InvalidSpecError"]:
+        return self._errors
+
+
+# the specs are sorted by the file paths of the files they come from, then by their
+# indexes in the files, for bundles
+_SortKey = tuple[str, int]
+
+
+class IncrementalResolver(_Resolver):
+    # resolves specs as resolve_specs does, with the specs taken in the order of their
+    # sort keys, which are their file paths by default, and keeps what it works out,
+    # so that once specs are added, replaced or removed, only the namespaces affected
+    # are resolved again:
+    #   - the namespaces of the specs changed, which are loaded again,
+    #   - the namespaces referring to them, whose refs are resolved again,
+    #   - and the namespaces these refer to, directly or not, whose ref counts are
+    #     counted again, along with the refs from the namespaces left as they are
+    # the merged specs and the nodes unused are worked out again for these namespaces
+    # and the ones newly referred to
+    def __init__(
+        self, keep_going: bool = False, only: Optional[list[str]] = None
+    ) -> None:
+        # errors are kept track of as in keep-going mode, and the first one is raised
+        # otherwise
+        super().__init__(True, only)
+        self._raises_errors = not keep_going
+        self._file_path_2_spec: dict[str, Spec] = {}
+        self._file_path_2_sort_key: dict[str, _SortKey] = {}
+        self._namespace_2_file_paths: dict[str, set[str]] = {}
+        self._changed_namespaces: set[str] = set()
+        self._is_resolved = False
+        self._current_errors: list[InvalidSpecError] = []
+        self._file_path_2_load_errors: dict[str, list[InvalidSpecError]] = {}
+        self._target_errors: list[InvalidSpecError] = []
+        self._namespace_2_errors: dict[str, list[InvalidSpecError]] = {}
+        self._recursive_components: dict[frozenset[Model], list[Model]] = {}
+        self._namespace_2_missing_namespaces: dict[str, set[str]] = {}
+        self._namespace_2_merge: dict[str, _NamespaceMerge] = {}
+
+    def add_spec(self, spec: Spec, sort_key: Optional[_SortKey] = None) -> None:
+        file_path = _file_path_of_spec(spec)
+        if file_path in self._file_path_2_spec:
+            raise ValueError(f"spec already added; file_path={file_path!r}")
+        self._set_spec(file_path, spec, sort_key)
+
+    def replace_spec(self, spec: Spec, sort_key: Optional[_SortKey] = None) -> None:
+        file_path = _file_path_of_spec(spec)
+        self._unset_spec(file_path)
+        self._set_spec(file_path, spec, sort_key)
+
+    def remove_spec(self, file_path: str) -> None:
+        self._unset_spec(file_path)
+        del self._file_path_2_spec[file_path]
+        del self._file_path_2_sort_key[file_path]
+        self._file_path_2_load_errors.pop(file_path, None)
+        self._dependency_graph.file_path_2_namespace.pop(file_path, None)
+
+    def _set_spec(
+        self, file_path: str, spec: Spec, sort_key: Optional[_SortKey]
+    ) -> None:
+        self._file_path_2_spec[file_path] = spec
+        self._file_path_2_sort_key[file_path] = (
+            (file_path, 0) if sort_key is None else sort_key
+        )
+        namespace = sys.intern(spec.namespace)
+        self._namespace_2_file_paths.setdefault(namespace, set()).add(file_path)
+        self._changed_namespaces.add(namespace)
+
+    def _unset_spec(self, file_path: str) -> None:
+        spec = self._file_path_2_spec.get(file_path)
+        if spec is None:
+            raise ValueError(f"spec not added; file_path={file_path!r}")
+        namespace = sys.intern(spec.namespace)
+        file_paths = self._namespace_2_file_paths[namespace]
+        file_paths.remove(file_path)
+        if len(file_paths) == 0:
+            del self._namespace_2_file_paths[namespace]
+        self._changed_namespaces.add(namespace)
+
+    def resolve(self) -> ResolveSpecsResults:
+        specs = [
+            self._file_path_2_spec[file_path]
+            for file_path in sorted(
+                self._file_path_2_spec.keys(),
+                key=self._file_path_2_sort_key.__getitem__,
+            )
+        ]
+        broken_ids: set[tuple[str, str, str]] = set()
+        some_namespace_is_broken = False
+        for spec in specs:
+            for node_kind, id in spec.broken_ids:
+                if node_kind == "namespace":
+                    some_namespace_is_broken = True
+                broken_ids.add((spec.namespace, node_kind, id))
+        dependency_graph = self._dependency_graph
+        changed_namespaces = self._changed_namespaces
+        self._changed_namespaces = set()
+        reloads_all = (
+            not self._is_resolved
+            or broken_ids != self._broken_ids
+            or some_namespace_is_broken != self._some_namespace_is_broken
+        )
+        if reloads_all:
+            # which errors are suppressed may change anywhere
+            changed_namespaces.update(self._namespace_2_file_paths.keys())
+            changed_namespaces.update(dependency_graph.namespace_2_dependencies.keys())
+        self._broken_ids = broken_ids
+        self._some_namespace_is_broken = some_namespace_is_broken
+        affected_namespaces = set(changed_namespaces)
+        affected_namespaces |= dependency_graph.dependent_namespaces(changed_namespaces)
+        for (
+            namespace,
+            missing_namespaces,
+        ) in self._namespace_2_missing_namespaces.items():
+            if not missing_namespaces.isdisjoint(changed_namespaces):
+                affected_namespaces.add(namespace)
+        self._reload_namespaces(changed_namespaces, reloads_all)
+        if self._only is not None:
+            old_selected_service_keys = self._selected_service_keys or set()
+            self._current_errors = self._target_errors = []
+            self._select_services(self._only)
+            assert self._selected_service_keys is not None
+            for namespace, _ in old_selected_service_keys ^ self._selected_service_keys:
+                affected_namespaces.add(namespace)
+        # the ref counts of a namespace depend on the namespaces referring to it
+        affected_namespaces |= dependency_graph.dependency_namespaces(
+            affected_namespaces
+        )
+        fields, errors = self._refs_into(affected_namespaces)
+        self._reset_namespaces(affected_namespaces)
+        for field in fields:
+            model = field.type.model
+            assert model is not None
+            model.ref_count += 1
+            if model.type != STRUCT:
+                continue
+            if model.ref_count == 1:
+                self._resolve_fields(model.struct().fields, model)
+            elif not (field.is_optional or field.is_repeated):
+                self._revisited_structs.append(model)
+        for error in errors:
+            error.ref_count += 1
+        for spec in specs:
+            if spec.namespace in affected_namespaces:
+                self._resolve_spec(spec)
+        # a cycle left as it is has no model affected, and a cycle changed has an edge
+        # to a struct entered already, counted again or not
+        for models in list(self._recursive_components.keys()):
+            if any(model.namespace in affected_namespaces for model in models):
+                del self._recursive_components[models]
+        self._check_model_recursion()
+        self._revisited_structs.clear()
+        # the namespaces referred to newly are in use more
+        merged_namespaces = (
+            affected_namespaces
+            | dependency_graph.dependency_namespaces(affected_namespaces)
+        )
+        for namespace in merged_namespaces:
+            self._merge_namespace(namespace)
+        self._is_resolved = True
+        return self._results(specs)
+
+    def _reload_namespaces(self, namespaces: set[str], reloads_all: bool) -> None:
+        symbol_tables: list[_SymbolTable] = [
+            self._services,
+            self._methods,
+            self._models,
+            self._constants,
+            self._errors_by_id,
+            self._errors_by_code,
+        ]
+        for symbol_table in symbol_tables:
+            if reloads_all:
+                symbol_table.clear()
+            else:
+                for namespace in namespaces:
+                    symbol_table.remove_namespace(namespace)
+        for namespace in namespaces:
+            for file_path in self._namespace_file_paths(namespace):
+                self._current_errors = self._file_path_2_load_errors[file_path] = []
+                self._load_spec(self._file_path_2_spec[file_path])
+
+    def _namespace_file_paths(self, namespace: str) -> list[str]:
+        return sorted(
+            self._namespace_2_file_paths.get(namespace, ()),
+            key=self._file_path_2_sort_key.__getitem__,
+        )
+
+    def _refs_into(self, namespaces: set[str]) -> tuple[list[Field], list[Error]]:
+        # the fields and the errors of the nodes in use of the other namespaces which
+        # refer to the namespaces, once per ref
+        fields2: list[Field] = []
+        errors: list[Error] = []
+        for (
+            namespace,
+            dependencies,
+        ) in self._dependency_graph.namespace_2_dependencies.items():
+            if namespace in namespaces or dependencies.isdisjoint(namespaces):
+                continue
+            fields_list: list[list[Field]] = []
+            for file_path in self._namespace_file_paths(namespace):
+                for method in self._file_path_2_spec[file_path].methods:
+                    if not self._is_method_selected(namespace, method):
+                        continue
+                    if method.params is not None:
+                        fields_list.append(method.params.fields)
+                    if method.results is not None:
+                        fields_list.append(method.results.fields)
+                    for error_case in method.error_cases:
+                        error = error_case.error
+                        if error is None:
+                            continue
+                        namespace2 = error_case.error_ref.namespace
+                        if namespace2 is not None and namespace2 in namespaces:
+                            errors.append(error)
+            for model in self._models.namespace_symbols(namespace).values():
+                if model.ref_count >= 1 and model.type == STRUCT:
+                    fields_list.append(model.struct().fields)
+            for fields in fields_list:
+                for field in fields:
+                    model = field.type.model
+                    if model is not None and model.namespace in namespaces:
+                        fields2.append(field)
+        return fields2, errors
+
+    def _reset_namespaces(self, namespaces: set[str]) -> None:
+        dependency_graph = self._dependency_graph
+        for namespace in namespaces:
+            for service in self._services.namespace_symbols(namespace).values():
+                service.methods = []
+                service.rpc_paths = []
+            for model in self._models.namespace_symbols(namespace).values():
+                model.ref_count = 0
+            for error in self._errors_by_id.namespace_symbols(namespace).values():
+                error.ref_count = 0
+            self._namespace_2_errors.pop(namespace, None)
+            self._namespace_2_missing_namespaces.pop(namespace, None)
+            if namespace in self._namespace_2_file_paths:
+                dependency_graph.namespace_2_dependencies[namespace] = set()
+            else:
+                dependency_graph.namespace_2_dependencies.pop(namespace, None)
+        dependency_graph.model_2_dependencies = {
+            model_key: dependencies
+            for model_key, dependencies in dependency_graph.model_2_dependencies.items()
+            if model_key[0] not in namespaces
+        }
+
+    def _merge_namespace(self, namespace: str) -> None:
+        # the merged specs and the nodes unused are sorted afterwards as _merge_specs
+        # lists them, i.e. by node kind, then in the order of the specs
+        file_paths = self._namespace_file_paths(namespace)
+        if len(file_paths) == 0:
+            self._namespace_2_merge.pop(namespace, None)
+            return
+        merge = self._namespace_2_merge[namespace] = _NamespaceMerge(None, Spec(""), [])
+        merged_spec = merge.spec
+        merged_spec.namespace = namespace
+
+        def use(node_kind_index: int, sort_key: _SortKey) -> None:
+            if merge.spec_key is None:
+                merge.spec_key = (node_kind_index, sort_key)
+
+        pruned = self._selected_service_keys is not None
+        specs = [
+            (self._file_path_2_sort_key[file_path], self._file_path_2_spec[file_path])
+            for file_path in file_paths
+        ]
+        for sort_key, spec in specs:
+            for i, service in enumerate(spec.services):
+                if self._services.get(
+                    namespace, service.id
+                ) is not service or not self._is_service_selected(
+                    namespace, service.id
+                ):
+                    continue
+                if len(service.methods) == 0:
+                    merge.unused_node_uris.append(
+                        ((0, sort_key, i), str(service.node_uri))
+                    )
+                else:
+                    use(0, sort_key)
+                    merged_spec.services.append(service)
+        for sort_key, spec in specs:
+            for method in spec.methods:
+                if self._methods.get(
+                    namespace, method.id
+                ) is not method or not self._is_method_selected(namespace, method):
+                    continue
+                use(1, sort_key)
+                merged_spec.methods.append(method)
+        for sort_key, spec in specs:
+            for i, model in enumerate(spec.models):
+                if self._models.get(namespace, model.id) is not model:
+                    continue
+                if model.ref_count == 0:
+                    if not pruned:
+                        merge.unused_node_uris.append(
+                            ((2, sort_key, i), str(model.node_uri))
+                        )
+                else:
+                    use(2, sort_key)
+                    merged_spec.models.append(model)
+        for sort_key, spec in specs:
+            for i, error in enumerate(spec.errors):
+                if self._errors_by_id.get(namespace, error.id) is not error:
+                    continue
+                if error.ref_count == 0:
+                    if not pruned:
+                        merge.unused_node_uris.append(
+                            ((3, sort_key, i), str(error.node_uri))
+                        )
+                else:
+                    use(3, sort_key)
+                    merged_spec.errors.append(error)
+
+    def _results(self, specs: list[Spec]) -> ResolveSpecsResults:
+        spec_key_and_specs = sorted(
+            (merge.spec_key, merge.spec)
+            for merge in self._namespace_2_merge.values()
+            if merge.spec_key is not None
+        )
+        unused_node_uris = sorted(
+            unused_node_uri
+            for merge in self._namespace_2_merge.values()
+            for unused_node_uri in merge.unused_node_uris
+        )
+        errors: list[InvalidSpecError] = []
+        namespaces: dict[str, None] = {}
+        for spec in specs:
+            errors.extend(self._file_path_2_load_errors[_file_path_of_spec(spec)])
+            namespaces[spec.namespace] = None
+        errors.extend(self._target_errors)
+        for namespace in namespaces:
+            errors.extend(self._namespace_2_errors.get(namespace, ()))
+        errors.extend(
+            sorted(
+                (
+                    _model_recursion_error(component)
+                    for component in self._recursive_components.values()
+                ),
+                key=str,
+            )
+        )
+        if self._raises_errors and len(errors) >= 1:
+            # the errors are grouped, so the one resolve_specs would raise first is
+            # found by resolving the specs as it does, which leaves them to be loaded
+            # again on the next resolution
+            self._is_resolved = False
+            _Resolver(False, self._only).resolve_specs(specs)
+            raise errors[0]
+        return ResolveSpecsResults(
+            unused_node_uris=[node_uri for _, node_uri in unused_node_uris],
+            merged_specs=[spec for _, spec in spec_key_and_specs],
+            # a copy, as the graph is updated on the next resolution
+            dependency_graph=self._dependency_graph.copy(),
+            errors=errors,
+        )
+
+    def _report(
+        self, error: "InvalidSpecError", namespace: Optional[str] = None
+    ) -> None:
+        if namespace is None:
+            self._current_errors.append(error)
+        else:
+            self._namespace_2_errors.setdefault(namespace, []).append(error)
+
+    def _add_missing_ref(self, namespace: str, namespace2: str) -> None:
+        self._namespace_2_missing_namespaces.setdefault(namespace, set()).add(
+            namespace2
+        )
+
+    def _report_model_recursion(self, component: list[Model]) -> None:
+        self._recursive_components[frozenset(component)] = component
+
+
+@dataclass
+class _NamespaceMerge:
+    # the node kind and the order of the first node merged, if any
+    spec_key: Optional[tuple[int, _SortKey]]
+    spec: Spec
+    unused_node_uris: list[tuple[tuple[int, _SortKey, int], str]]
+
+
+def _file_path_of_spec(spec: Spec) -> str:
+    return str(spec.node_uri).removesuffix("#/")
+
+
+def _model_recursion_error(component: list[Model]) -> "InvalidSpecError":
+    # the models are sorted, as the order they are found in depends on where the
+    # search starts from
+    component = sorted(component, key=lambda model: (model.namespace, model.id))
+    model_ids = [f"{model.namespace}.{model.id}" for model in component]
+    return InvalidSpecError(
+        f"infinitely recursive model; node_uri={component[0].node_uri!r} model_ids={model_ids!r}",
+    )
+
+
+def _value_dependencies(model: Model) -> list[Model]:
+    # the structs a struct contains by value
+    models2 = []
+    for field in model.struct().fields:
+        if field.is_optional or field.is_repeated:
+            continue
+        model2 = field.type.model
+        if model2 is not None and model2.type == STRUCT:
+            models2.append(model2)
+    return models2
+
 
 class InvalidSpecError(Exception):
     def __init__(self, message: str) -> None:
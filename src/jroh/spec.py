@@ -4,6 +4,9 @@ from typing import Any, Optional, Union
 
 DEFAULT = "Default"
 
+# stands for all the ids of a node kind in Spec.broken_ids
+ANY_ID = "*"
+
 _WORD_PATTERN = re.compile(r"[A-Z]([A-Z0-9]*|[a-z0-9]*)s?")
 ID_PATTERN = re.compile(
     r"{}(-{})*".format(_WORD_PATTERN.pattern, _WORD_PATTERN.pattern)
@@ -37,22 +40,81 @@ MODEL_TYPE_PATTERN = re.compile(
 ENUM_UNDERLYING_TYPE_PATTERN = re.compile(r"|".join((INT32, INT64, STRING)))
 
 
+class NodeURI:
+    # a node URI is kept as a suffix plus a pointer to its parent node URI, and only
+    # turned into a string when it's printed, mostly in warnings and error messages
+    __slots__ = ("_parent", "_suffix")
+
+    def __init__(self, suffix: str, parent: Optional["NodeURI"] = None) -> None:
+        self._parent = parent
+        self._suffix = suffix
+
+    def __add__(self, suffix: str) -> "NodeURI":
+        return NodeURI(suffix, self)
+
+    def __str__(self) -> str:
+        suffixes = []
+        node_uri: Optional[NodeURI] = self
+        while node_uri is not None:
+            suffixes.append(node_uri._suffix)
+            node_uri = node_uri._parent
+        suffixes.reverse()
+        return "".join(suffixes)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (NodeURI, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
 class Spec:
-    def __init__(self, node_uri: str) -> None:
+    __slots__ = (
+        "node_uri",
+        "namespace",
+        "imports",
+        "services",
+        "methods",
+        "models",
+        "errors",
+        "broken_ids",
+    )
+
+    def __init__(self, node_uri: NodeURI) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
 
         self.namespace: str = DEFAULT
+        # the paths of the spec files imported, relative to the directory of the file
+        self.imports: list[str] = []
         self.services: list[Service] = []
         self.methods: list[Method] = []
         self.models: list[Model] = []
         self.errors: list[Error] = []
+        # the (node kind, id) of the invalid nodes left out in keep-going mode, where
+        # the node kind is "namespace", "services", "methods", "models" or "errors"
+        self.broken_ids: set[tuple[str, str]] = set()
 
 
 class Service:
-    def __init__(self, node_uri: str, id: str) -> None:
+    __slots__ = (
+        "node_uri",
+        "id",
+        "version",
+        "description",
+        "rpc_path_template",
+        "methods",
+        "rpc_paths",
+    )
+
+    def __init__(self, node_uri: NodeURI, id: str) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
         self.id: str = id
 
         self.version: str = ""
@@ -65,9 +127,20 @@ class Service:
 
 
 class Method:
-    def __init__(self, node_uri: str, id: str) -> None:
+    __slots__ = (
+        "node_uri",
+        "id",
+        "service_ids",
+        "summary",
+        "description",
+        "params",
+        "results",
+        "error_cases",
+    )
+
+    def __init__(self, node_uri: NodeURI, id: str) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
         self.id: str = id
 
         self.service_ids: list[str] = []
@@ -79,25 +152,31 @@ class Method:
 
 
 class Params:
-    def __init__(self, node_uri: str) -> None:
+    __slots__ = ("node_uri", "fields")
+
+    def __init__(self, node_uri: NodeURI) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
 
         self.fields: list[Field] = []
 
 
 class Results:
-    def __init__(self, node_uri: str) -> None:
+    __slots__ = ("node_uri", "fields")
+
+    def __init__(self, node_uri: NodeURI) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
 
         self.fields: list[Field] = []
 
 
 class ErrorCase:
-    def __init__(self, node_uri: str, error_ref: "Ref") -> None:
+    __slots__ = ("node_uri", "error_ref", "description", "error")
+
+    def __init__(self, node_uri: NodeURI, error_ref: "Ref") -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
         self.error_ref: Ref = error_ref
 
         self.description: Optional[str] = None
@@ -107,9 +186,19 @@ class ErrorCase:
 
 
 class Model:
-    def __init__(self, node_uri: str, id: str) -> None:
+    __slots__ = (
+        "node_uri",
+        "id",
+        "type",
+        "description",
+        "definition",
+        "namespace",
+        "ref_count",
+    )
+
+    def __init__(self, node_uri: NodeURI, id: str) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
         self.id: str = id
 
         self.type: str = ""
@@ -134,6 +223,16 @@ class Model:
 
 
 class PrimitiveConstraints:
+    __slots__ = (
+        "min",
+        "min_is_exclusive",
+        "max",
+        "max_is_exclusive",
+        "min_length",
+        "max_length",
+        "pattern",
+    )
+
     def __init__(self) -> None:
         # parse
         self.min: Any = None  # only used for INT32, INT64, FLOAT32, FLOAT64
@@ -153,22 +252,46 @@ class PrimitiveConstraints:
             or self.pattern != ""
         )
 
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # keep the shared record shared across the parse cache and worker processes
+        if self is NO_PRIMITIVE_CONSTRAINTS:
+            return "NO_PRIMITIVE_CONSTRAINTS"
+        return super().__reduce_ex__(protocol)
+
+
+# shared by all fields and xprimits without constraints, must never be modified
+NO_PRIMITIVE_CONSTRAINTS = PrimitiveConstraints()
+
 
 class Struct:
+    __slots__ = ("fields",)
+
     def __init__(self) -> None:
         # parse
         self.fields: list[Field] = []
 
 
-class Field(PrimitiveConstraints):
-    def __init__(self, node_uri: str, id: str) -> None:
-        super().__init__()
+class Field:
+    __slots__ = (
+        "node_uri",
+        "id",
+        "type",
+        "constraints",
+        "is_optional",
+        "is_repeated",
+        "min_count",
+        "max_count",
+        "description",
+        "example",
+    )
 
+    def __init__(self, node_uri: NodeURI, id: str) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
         self.id: str = id
 
         self.type: FieldType = FieldType()
+        self.constraints: PrimitiveConstraints = NO_PRIMITIVE_CONSTRAINTS
         self.is_optional: bool = False
         self.is_repeated: bool = False
         self.min_count: int = 0  # only used if is_repeated
@@ -181,6 +304,8 @@ class Field(PrimitiveConstraints):
 
 
 class FieldType:
+    __slots__ = ("value", "model")
+
     def __init__(self) -> None:
         # parse
         self.value: Union[str, Ref, None] = None
@@ -201,6 +326,8 @@ class FieldType:
 
 
 class Enum:
+    __slots__ = ("underlying_type", "constants")
+
     def __init__(self) -> None:
         # parse
         self.underlying_type: str = ""
@@ -208,28 +335,33 @@ class Enum:
 
 
 class Constant:
-    def __init__(self, node_uri: str, id: str) -> None:
+    __slots__ = ("node_uri", "id", "value", "description")
+
+    def __init__(self, node_uri: NodeURI, id: str) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
         self.id: str = id
 
         self.value: Any = None
         self.description: Optional[str] = None
 
 
-class Xprimit(PrimitiveConstraints):
-    def __init__(self, primitive_type: str) -> None:
-        super().__init__()
+class Xprimit:
+    __slots__ = ("primitive_type", "constraints", "example")
 
+    def __init__(self, primitive_type: str) -> None:
         # parse
         self.primitive_type = primitive_type
+        self.constraints: PrimitiveConstraints = NO_PRIMITIVE_CONSTRAINTS
         self.example: Any = None
 
 
 class Error:
-    def __init__(self, node_uri: str, id: str) -> None:
+    __slots__ = ("node_uri", "id", "code", "status_code", "description", "ref_count")
+
+    def __init__(self, node_uri: NodeURI, id: str) -> None:
         # parse
-        self.node_uri: str = node_uri
+        self.node_uri: NodeURI = node_uri
         self.id: str = id
 
         self.code: int = 0
@@ -242,5 +374,7 @@ class Error:
 
 @dataclass
 class Ref:
+    __slots__ = ("namespace", "id")
+
     namespace: Optional[str]
     id: str
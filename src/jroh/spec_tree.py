@@ -0,0 +1,288 @@
+import functools
+import sys
+from typing import Any, Union
+
+from .spec import (
+    ENUM,
+    NO_PRIMITIVE_CONSTRAINTS,
+    STRUCT,
+    XPRIMIT,
+    Constant,
+    Enum,
+    Error,
+    ErrorCase,
+    Field,
+    Method,
+    Model,
+    NodeURI,
+    Params,
+    PrimitiveConstraints,
+    Ref,
+    Results,
+    Service,
+    Spec,
+    Struct,
+    Xprimit,
+)
+
+# spec trees as JSON-compatible values, shared by bundles and the IR, hence a change to
+# the layout calls for bumping the format versions of both; the attributes left at
+# their default values are omitted, and node URIs are not dumped, but rebuilt from the
+# trees on load
+
+
+def dump_spec(spec: Spec) -> dict[str, Any]:
+    raw_spec = dump_attrs(spec, ("namespace", "imports"))
+    if len(spec.services) >= 1:
+        raw_spec["services"] = {
+            service.id: dump_attrs(service, SERVICE_ATTRS) for service in spec.services
+        }
+    if len(spec.methods) >= 1:
+        raw_spec["methods"] = {
+            method.id: dump_method(method) for method in spec.methods
+        }
+    if len(spec.models) >= 1:
+        raw_spec["models"] = {model.id: dump_model(model) for model in spec.models}
+    if len(spec.errors) >= 1:
+        raw_spec["errors"] = {
+            error.id: dump_attrs(error, ERROR_ATTRS) for error in spec.errors
+        }
+    return raw_spec
+
+
+def dump_method(method: Method) -> dict[str, Any]:
+    raw_method = dump_attrs(method, _METHOD_ATTRS)
+    if method.params is not None:
+        raw_method["params"] = _dump_fields(method.params.fields)
+    if method.results is not None:
+        raw_method["results"] = _dump_fields(method.results.fields)
+    if len(method.error_cases) >= 1:
+        raw_method["error_cases"] = {
+            _dump_ref(error_case.error_ref): dump_attrs(error_case, _ERROR_CASE_ATTRS)
+            for error_case in method.error_cases
+        }
+    return raw_method
+
+
+def dump_model(model: Model) -> dict[str, Any]:
+    raw_model = dump_attrs(model, _MODEL_ATTRS)
+    if model.type == STRUCT:
+        raw_model["fields"] = _dump_fields(model.struct().fields)
+    elif model.type == ENUM:
+        enum = model.enum()
+        raw_model["underlying_type"] = enum.underlying_type
+        raw_model["constants"] = {
+            constant.id: dump_attrs(constant, _CONSTANT_ATTRS)
+            for constant in enum.constants
+        }
+    else:
+        xprimit = model.xprimit()
+        raw_model["primitive_type"] = xprimit.primitive_type
+        if xprimit.constraints is not NO_PRIMITIVE_CONSTRAINTS:
+            raw_model["constraints"] = dump_attrs(
+                xprimit.constraints, PrimitiveConstraints.__slots__
+            )
+        if xprimit.example is not None:
+            raw_model["example"] = xprimit.example
+    return raw_model
+
+
+def _dump_fields(fields: list[Field]) -> dict[str, Any]:
+    raw_fields = {}
+    for field in fields:
+        raw_field = dump_attrs(field, _FIELD_ATTRS)
+        field_type = field.type
+        if field_type.is_primitive():
+            raw_field["type"] = field_type.primitive_type()
+        else:
+            raw_field["type"] = _dump_ref(field_type.model_ref())
+        if field.constraints is not NO_PRIMITIVE_CONSTRAINTS:
+            raw_field["constraints"] = dump_attrs(
+                field.constraints, PrimitiveConstraints.__slots__
+            )
+        raw_fields[field.id] = raw_field
+    return raw_fields
+
+
+def _dump_ref(ref: Ref) -> str:
+    if ref.namespace is None:
+        return ref.id
+    return ref.namespace + "." + ref.id
+
+
+def dump_attrs(node: Any, attrs: tuple[str, ...]) -> dict[str, Any]:
+    prototype = _PROTOTYPES[type(node)]
+    raw_node = {}
+    for attr in attrs:
+        value = getattr(node, attr)
+        if value != getattr(prototype, attr):
+            raw_node[attr] = value
+    return raw_node
+
+
+SERVICE_ATTRS = ("version", "description", "rpc_path_template")
+_METHOD_ATTRS = ("service_ids", "summary", "description")
+_ERROR_CASE_ATTRS = ("description",)
+_MODEL_ATTRS = ("type", "description")
+_FIELD_ATTRS = (
+    "is_optional",
+    "is_repeated",
+    "min_count",
+    "max_count",
+    "description",
+    "example",
+)
+_CONSTANT_ATTRS = ("value", "description")
+ERROR_ATTRS = ("code", "status_code", "description")
+
+# nodes in their initial states, which tell the default values of attributes
+_PROTOTYPES: dict[type, Any] = {
+    Spec: Spec(NodeURI("")),
+    Service: Service(NodeURI(""), ""),
+    Method: Method(NodeURI(""), ""),
+    ErrorCase: ErrorCase(NodeURI(""), Ref(None, "")),
+    Model: Model(NodeURI(""), ""),
+    PrimitiveConstraints: PrimitiveConstraints(),
+    Field: Field(NodeURI(""), ""),
+    Constant: Constant(NodeURI(""), ""),
+    Error: Error(NodeURI(""), ""),
+}
+
+
+class SpecTreeLoader:
+    # builds spec trees the same way as the parser does, with no validation, since
+    # the trees dumped are of validated specs
+    def __init__(self) -> None:
+        self._primitive_constraints_pool: dict[tuple, PrimitiveConstraints] = {}
+
+    def load_spec(self, raw_spec: dict[str, Any], file_path: str) -> Spec:
+        spec = Spec(NodeURI(file_path + "#/"))
+        spec.namespace = raw_spec.get("namespace", spec.namespace)
+        spec.imports = raw_spec.get("imports", spec.imports)
+        node_uri = spec.node_uri + "services"
+        for service_id, raw_service in raw_spec.get("services", {}).items():
+            service = Service(node_uri + sys.intern(f"/{service_id}"), service_id)
+            load_attrs(service, raw_service)
+            spec.services.append(service)
+        node_uri = spec.node_uri + "methods"
+        for method_id, raw_method in raw_spec.get("methods", {}).items():
+            spec.methods.append(
+                self.load_method(
+                    raw_method, method_id, node_uri + sys.intern(f"/{method_id}")
+                )
+            )
+        node_uri = spec.node_uri + "models"
+        for model_id, raw_model in raw_spec.get("models", {}).items():
+            spec.models.append(
+                self.load_model(
+                    raw_model, model_id, node_uri + sys.intern(f"/{model_id}")
+                )
+            )
+        node_uri = spec.node_uri + "errors"
+        for error_id, raw_error in raw_spec.get("errors", {}).items():
+            error = Error(node_uri + sys.intern(f"/{error_id}"), error_id)
+            load_attrs(error, raw_error)
+            spec.errors.append(error)
+        return spec
+
+    def load_method(
+        self, raw_method: dict[str, Any], method_id: str, node_uri: NodeURI
+    ) -> Method:
+        method = Method(node_uri, method_id)
+        raw_params = raw_method.pop("params", None)
+        if raw_params is not None:
+            params = Params(node_uri + "/params")
+            self._load_fields(params.fields, raw_params, params.node_uri)
+            method.params = params
+        raw_results = raw_method.pop("results", None)
+        if raw_results is not None:
+            results = Results(node_uri + "/results")
+            self._load_fields(results.fields, raw_results, results.node_uri)
+            method.results = results
+        raw_error_cases = raw_method.pop("error_cases", None)
+        if raw_error_cases is not None:
+            node_uri2 = node_uri + "/error_cases"
+            for raw_error_ref, raw_error_case in raw_error_cases.items():
+                error_case = ErrorCase(
+                    node_uri2 + sys.intern(f"/{raw_error_ref}"),
+                    _load_ref(raw_error_ref),
+                )
+                load_attrs(error_case, raw_error_case)
+                method.error_cases.append(error_case)
+        load_attrs(method, raw_method)
+        return method
+
+    def load_model(
+        self, raw_model: dict[str, Any], model_id: str, node_uri: NodeURI
+    ) -> Model:
+        model = Model(node_uri, model_id)
+        model.type = raw_model["type"]
+        model.description = raw_model.get("description")
+        if model.type == STRUCT:
+            struct = Struct()
+            self._load_fields(struct.fields, raw_model["fields"], node_uri + "/fields")
+            model.definition = struct
+        elif model.type == ENUM:
+            enum = Enum()
+            enum.underlying_type = raw_model["underlying_type"]
+            node_uri2 = node_uri + "/constants"
+            for constant_id, raw_constant in raw_model["constants"].items():
+                constant = Constant(
+                    node_uri2 + sys.intern(f"/{constant_id}"), constant_id
+                )
+                load_attrs(constant, raw_constant)
+                enum.constants.append(constant)
+            model.definition = enum
+        else:
+            assert model.type == XPRIMIT, model.type
+            xprimit = Xprimit(raw_model["primitive_type"])
+            raw_constraints = raw_model.get("constraints")
+            if raw_constraints is not None:
+                xprimit.constraints = self._load_primitive_constraints(raw_constraints)
+            xprimit.example = raw_model.get("example")
+            model.definition = xprimit
+        return model
+
+    def _load_fields(
+        self, fields: list[Field], raw_fields: dict[str, Any], node_uri: NodeURI
+    ) -> None:
+        for field_id, raw_field in raw_fields.items():
+            field = Field(node_uri + sys.intern(f"/{field_id}"), sys.intern(field_id))
+            field.type.value = _load_field_type(raw_field.pop("type"))
+            raw_constraints = raw_field.pop("constraints", None)
+            if raw_constraints is not None:
+                field.constraints = self._load_primitive_constraints(raw_constraints)
+            load_attrs(field, raw_field)
+            fields.append(field)
+
+    def _load_primitive_constraints(
+        self, raw_constraints: dict[str, Any]
+    ) -> PrimitiveConstraints:
+        # types are part of the key, since 1 == 1.0 == True
+        key = tuple(
+            (attr, type(value), value) for attr, value in raw_constraints.items()
+        )
+        primitive_constraints = self._primitive_constraints_pool.get(key)
+        if primitive_constraints is None:
+            primitive_constraints = PrimitiveConstraints()
+            load_attrs(primitive_constraints, raw_constraints)
+            self._primitive_constraints_pool[key] = primitive_constraints
+        return primitive_constraints
+
+
+def load_attrs(node: Any, raw_node: dict[str, Any]) -> None:
+    for attr, value in raw_node.items():
+        setattr(node, attr, value)
+
+
+def _load_ref(raw_ref: str) -> Ref:
+    if (i := raw_ref.find(".")) < 0:
+        return Ref(namespace=None, id=sys.intern(raw_ref))
+    return Ref(namespace=sys.intern(raw_ref[:i]), id=sys.intern(raw_ref[i + 1 :]))
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_field_type(raw_field_type: str) -> Union[str, Ref]:
+    if raw_field_type[0].islower():
+        return sys.intern(raw_field_type)
+    return _load_ref(raw_field_type)
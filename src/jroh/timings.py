@@ -0,0 +1,138 @@
+import contextlib
+import json
+import time
+from typing import Any, Callable, ContextManager, Iterator, Optional, TypeVar
+
+STAGE = "stage"
+INPUT_FILE = "input_file"
+NAMESPACE = "namespace"
+OUTPUT_FILE = "output_file"
+TEMPLATE = "template"
+SUBPROCESS = "subprocess"
+
+Records = dict[str, dict[str, dict[str, float]]]
+
+
+class Timings:
+    def __init__(self) -> None:
+        self._records: Records = {}
+
+    @contextlib.contextmanager
+    def measure(self, category: str, name: str) -> Iterator[None]:
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(
+                category,
+                name,
+                time.perf_counter() - wall_time,
+                time.process_time() - cpu_time,
+            )
+
+    def add(self, category: str, name: str, wall_time: float, cpu_time: float) -> None:
+        record = self._records.setdefault(category, {}).get(name)
+        if record is None:
+            self._records[category][name] = {
+                "wall_time": wall_time,
+                "cpu_time": cpu_time,
+                "count": 1,
+            }
+        else:
+            record["wall_time"] += wall_time
+            record["cpu_time"] += cpu_time
+            record["count"] += 1
+
+    def merge(self, records: Records) -> None:
+        for category, name_2_record in records.items():
+            for name, record in name_2_record.items():
+                record2 = self._records.setdefault(category, {}).get(name)
+                if record2 is None:
+                    self._records[category][name] = dict(record)
+                else:
+                    for key, value in record.items():
+                        record2[key] += value
+
+    def records(self) -> Records:
+        return self._records
+
+    def dump(self, file_path: str) -> None:
+        with open(file_path, "w") as f:
+            json.dump(self._records, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+class Stopwatch:
+    def __init__(self) -> None:
+        self._wall_time = 0.0
+        self._cpu_time = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        self._wall_time = time.perf_counter()
+        self._cpu_time = time.process_time()
+
+    def lap(self, category: str, name: str) -> None:
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        add(category, name, wall_time - self._wall_time, cpu_time - self._cpu_time)
+        self._wall_time = wall_time
+        self._cpu_time = cpu_time
+
+
+_timings: Optional[Timings] = None
+
+
+def enable() -> Timings:
+    global _timings
+    _timings = Timings()
+    return _timings
+
+
+def disable() -> None:
+    global _timings
+    _timings = None
+
+
+def enabled() -> bool:
+    return _timings is not None
+
+
+def measure(category: str, name: str) -> ContextManager[None]:
+    if _timings is None:
+        return contextlib.nullcontext()
+    return _timings.measure(category, name)
+
+
+def add(category: str, name: str, wall_time: float, cpu_time: float) -> None:
+    if _timings is not None:
+        _timings.add(category, name, wall_time, cpu_time)
+
+
+def merge(records: Optional[Records]) -> None:
+    if _timings is not None and records is not None:
+        _timings.merge(records)
+
+
+_T = TypeVar("_T")
+
+
+def dump(file_path: str) -> None:
+    if _timings is not None:
+        _timings.dump(file_path)
+
+
+def call_with_timings(
+    enabled: bool, function: Callable[..., _T], *args: Any
+) -> tuple[_T, Optional[Records]]:
+    # for use in worker processes, whose timings are handed back to the parent process
+    if not enabled:
+        return function(*args), None
+    global _timings
+    timings = _timings = Timings()
+    try:
+        result = function(*args)
+    finally:
+        _timings = None
+    return result, timings.records()
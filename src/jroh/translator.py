@@ -3,7 +3,7 @@ from typing import Optional
 
 import yaml
 
-from . import utils
+from . import timings, utils
 from .spec import (
     BOOL,
     ENUM,
@@ -56,6 +56,22 @@ def translate_specs(
     )
 
 
+def translate_spec(spec: Spec) -> TranslateSpecsResults:
+    translateer = _Translator(False)
+    translateer.translate_spec(spec)
+    return TranslateSpecsResults(
+        file_path_2_file_data=translateer.file_path_2_file_data(),
+    )
+
+
+def translate_common() -> TranslateSpecsResults:
+    translateer = _Translator(False)
+    translateer.translate_common()
+    return TranslateSpecsResults(
+        file_path_2_file_data=translateer.file_path_2_file_data(),
+    )
+
+
 class _Translator:
     def __init__(self, test_mode: bool) -> None:
         self._test_mode = test_mode
@@ -66,31 +82,38 @@ class _Translator:
 
     def translate_specs(self, specs: list[Spec]) -> None:
         for spec in specs:
-            self._namespace = spec.namespace
-            self._common_file_path = "../" + _COMMON_YAML
-            open_apis: dict[str, dict] = {}
-            schemas = {}
-            self._schemas = schemas
-            for service in spec.services:
-                open_api = {}
-                file_name = _SERVICE_YAML_TEMPLATE.format(utils.snake_case(service.id))
-                open_apis[file_name] = open_api
-                self._translate_service(service, open_api)
-            self._translate_models(spec.models, schemas)
-            if len(schemas) >= 1:
-                open_api = {}
-                open_apis[_MODELS_YAML] = open_api
-                _save_schemas(schemas, open_api)
-            for file_name, open_api in open_apis.items():
-                file_path = utils.snake_case(spec.namespace) + "/" + file_name
+            self.translate_spec(spec)
+        if not self._test_mode:
+            self.translate_common()
+
+    def translate_spec(self, spec: Spec) -> None:
+        self._namespace = spec.namespace
+        self._common_file_path = "../" + _COMMON_YAML
+        open_apis: dict[str, dict] = {}
+        schemas = {}
+        self._schemas = schemas
+        for service in spec.services:
+            open_api = {}
+            file_name = _SERVICE_YAML_TEMPLATE.format(utils.snake_case(service.id))
+            open_apis[file_name] = open_api
+            self._translate_service(service, open_api)
+        self._translate_models(spec.models, schemas)
+        if len(schemas) >= 1:
+            open_api = {}
+            open_apis[_MODELS_YAML] = open_api
+            _save_schemas(schemas, open_api)
+        for file_name, open_api in open_apis.items():
+            file_path = utils.snake_case(spec.namespace) + "/" + file_name
+            with timings.measure(timings.OUTPUT_FILE, file_path):
                 _fix_dollar_refs(open_api)
                 self._file_path_2_file_data[file_path] = yaml.dump(
                     open_api, sort_keys=False
                 )
-        if not self._test_mode:
-            self._file_path_2_file_data[_COMMON_YAML] = yaml.dump(
-                _COMMON_OPEN_API, sort_keys=False
-            )
+
+    def translate_common(self) -> None:
+        self._file_path_2_file_data[_COMMON_YAML] = yaml.dump(
+            _COMMON_OPEN_API, sort_keys=False
+        )
 
     def _translate_service(self, service: Service, open_api: dict) -> None:
         open_api["openapi"] = "3.0.0"
@@ -262,7 +285,7 @@ class _Translator:
         field_type = field.type
         if field_type.is_primitive():
             _translate_primitive_type_and_constraints(
-                field_type.primitive_type(), field, schema2
+                field_type.primitive_type(), field.constraints, schema2
             )
         else:
             model_ref = field_type.model_ref()
@@ -324,7 +347,7 @@ class _Translator:
 
     def _translate_xprimit(self, xprimit: Xprimit, schema: dict) -> None:
         _translate_primitive_type_and_constraints(
-            xprimit.primitive_type, xprimit, schema
+            xprimit.primitive_type, xprimit.constraints, schema
         )
         if xprimit.example is not None:
             schema["example"] = xprimit.example
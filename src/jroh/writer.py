@@ -0,0 +1,159 @@
+import glob
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+@dataclass
+class WriteFilesResults:
+    written_file_paths: list[str] = field(default_factory=list)
+    unchanged_file_paths: list[str] = field(default_factory=list)
+    deleted_file_paths: list[str] = field(default_factory=list)
+
+    def merge(self, other: "WriteFilesResults") -> None:
+        self.written_file_paths.extend(other.written_file_paths)
+        self.unchanged_file_paths.extend(other.unchanged_file_paths)
+        self.deleted_file_paths.extend(other.deleted_file_paths)
+
+
+def write_files(
+    output_dir_path: str,
+    file_path_2_file_data: dict[str, str],
+    header: str,
+    stale_file_path_patterns: list[str],
+    format_files: Optional[Callable[[list[str]], None]] = None,
+) -> WriteFilesResults:
+    results = WriteFilesResults()
+    output_file_path_2_file_data: dict[str, bytes] = {}
+    for file_path, file_data in file_path_2_file_data.items():
+        output_file_path = os.path.join(output_dir_path, file_path)
+        output_file_path_2_file_data[output_file_path] = (header + file_data).encode()
+    if format_files is None:
+        for output_file_path, file_data in output_file_path_2_file_data.items():
+            if _file_has_data(output_file_path, file_data):
+                results.unchanged_file_paths.append(output_file_path)
+            else:
+                temp_file_path = _write_temp_file(output_file_path, file_data)
+                os.replace(temp_file_path, output_file_path)
+                results.written_file_paths.append(output_file_path)
+    else:
+        output_file_path_2_temp_file_path: dict[str, str] = {}
+        try:
+            for output_file_path, file_data in output_file_path_2_file_data.items():
+                output_file_path_2_temp_file_path[output_file_path] = _write_temp_file(
+                    output_file_path, file_data
+                )
+            if len(output_file_path_2_temp_file_path) >= 1:
+                format_files(list(output_file_path_2_temp_file_path.values()))
+            for (
+                output_file_path,
+                temp_file_path,
+            ) in output_file_path_2_temp_file_path.items():
+                with open(temp_file_path, "rb") as f:
+                    file_data = f.read()
+                if _file_has_data(output_file_path, file_data):
+                    results.unchanged_file_paths.append(output_file_path)
+                else:
+                    os.replace(temp_file_path, output_file_path)
+                    results.written_file_paths.append(output_file_path)
+        finally:
+            for temp_file_path in output_file_path_2_temp_file_path.values():
+                try:
+                    os.unlink(temp_file_path)
+                except FileNotFoundError:
+                    pass
+    results.deleted_file_paths = _delete_stale_files(
+        output_dir_path,
+        set(map(os.path.normpath, output_file_path_2_file_data.keys())),
+        header.split("\n", 1)[0] + "\n",
+        stale_file_path_patterns,
+    )
+    return results
+
+
+def write_file(file_path: str, file_data: str) -> bool:
+    file_path = os.path.abspath(file_path)
+    file_data2 = file_data.encode()
+    if _file_has_data(file_path, file_data2):
+        return False
+    temp_file_path = _write_temp_file(file_path, file_data2)
+    os.replace(temp_file_path, file_path)
+    return True
+
+
+def _file_has_data(file_path: str, file_data: bytes) -> bool:
+    try:
+        if os.path.getsize(file_path) != len(file_data):
+            return False
+        with open(file_path, "rb") as f:
+            return f.read() == file_data
+    except FileNotFoundError:
+        return False
+
+
+def _write_temp_file(file_path: str, file_data: bytes) -> str:
+    dir_path, file_name = os.path.split(file_path)
+    os.makedirs(dir_path, exist_ok=True)
+    fd, temp_file_path = tempfile.mkstemp(
+        dir=dir_path, prefix="." + file_name + ".", suffix=".tmp"
+    )
+    try:
+        os.fchmod(fd, _get_file_mode())
+        with os.fdopen(fd, "wb") as f:
+            f.write(file_data)
+    except BaseException:
+        os.unlink(temp_file_path)
+        raise
+    return temp_file_path
+
+
+_file_mode: Optional[int] = None
+
+
+def _get_file_mode() -> int:
+    global _file_mode
+    if _file_mode is None:
+        umask = os.umask(0)
+        os.umask(umask)
+        _file_mode = 0o666 & ~umask
+    return _file_mode
+
+
+def _delete_stale_files(
+    output_dir_path: str,
+    output_file_paths: set[str],
+    header_line: str,
+    stale_file_path_patterns: list[str],
+) -> list[str]:
+    header_line2 = header_line.encode()
+    stale_file_paths: list[str] = []
+    for stale_file_path_pattern in stale_file_path_patterns:
+        for file_path in sorted(
+            glob.glob(os.path.join(output_dir_path, stale_file_path_pattern))
+        ):
+            if os.path.normpath(file_path) in output_file_paths:
+                continue
+            with open(file_path, "rb") as f:
+                if f.read(len(header_line2)) != header_line2:
+                    continue
+            stale_file_paths.append(os.path.relpath(file_path, output_dir_path))
+    return delete_files(output_dir_path, stale_file_paths)
+
+
+def delete_files(output_dir_path: str, file_paths: list[str]) -> list[str]:
+    deleted_file_paths: list[str] = []
+    for file_path in file_paths:
+        output_file_path = os.path.join(output_dir_path, file_path)
+        try:
+            os.unlink(output_file_path)
+        except FileNotFoundError:
+            continue
+        deleted_file_paths.append(output_file_path)
+        dir_path = os.path.dirname(output_file_path)
+        if os.path.normpath(dir_path) != os.path.normpath(output_dir_path):
+            try:
+                os.rmdir(dir_path)
+            except OSError:
+                pass
+    return deleted_file_paths
@@ -1,9 +1,28 @@
+import glob
+import os
 from dataclasses import dataclass, field
 from typing import Optional, Type
 from unittest import TestCase
 
 from ..jroh import parser, resolver, translator
 
+EXAMPLES_DIR_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+EXAMPLES_GO_PACKAGE_PATH = "github.com/go-tk/jroh/examples/output/go"
+
+
+def example_file_paths() -> list[str]:
+    return sorted(glob.glob(os.path.join(EXAMPLES_DIR_PATH, "[0-9]-*", "*.yaml")))
+
+
+def read_tree(dir_path: str) -> dict[str, bytes]:
+    tree = {}
+    for dir_path2, _, file_names in os.walk(dir_path):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path2, file_name)
+            with open(file_path, "rb") as f:
+                tree[os.path.relpath(file_path, dir_path)] = f.read()
+    return tree
+
 
 @dataclass
 class TestData:
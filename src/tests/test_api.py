@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from .. import jroh
+from ..jroh import compiler, parse_cache
+from . import common
+
+
+class TestAPI(unittest.TestCase):
+    def test_compile(self):
+        file_paths = common.example_file_paths()
+        file_path_2_file_data = compiler._load_files(file_paths)
+        cache = parse_cache.MemoryParseCache()
+        results1 = jroh.compile(
+            file_path_2_file_data,
+            go_output_package_path=common.EXAMPLES_GO_PACKAGE_PATH,
+            cache=cache,
+        )
+        results2 = jroh.compile(
+            file_path_2_file_data,
+            go_output_package_path=common.EXAMPLES_GO_PACKAGE_PATH,
+            cache=cache,
+        )
+        self.assertEqual(results2, results1)
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            compiler._compile_files(
+                file_paths,
+                os.path.join(temp_dir_path, "oapi3"),
+                os.path.join(temp_dir_path, "go")
+                + ":"
+                + common.EXAMPLES_GO_PACKAGE_PATH,
+            )
+            output_tree = common.read_tree(temp_dir_path)
+        output_tree2 = {}
+        for file_path, file_data in results1.oapi3_file_path_2_file_data.items():
+            output_tree2[os.path.join("oapi3", file_path)] = file_data.encode()
+        for file_path, file_data in results1.go_file_path_2_file_data.items():
+            output_tree2[os.path.join("go", file_path)] = file_data.encode()
+        self.assertDictEqual(output_tree2, output_tree)
+
+    def test_compile_oapi3_only(self):
+        results = jroh.compile(
+            {
+                "foo.yaml": """
+namespace: Foo
+models:
+  Bar:
+    type: struct
+xyz: 1
+"""
+            }
+        )
+        self.assertListEqual(results.ignored_node_uris, ["foo.yaml#/xyz"])
+        self.assertListEqual(results.unused_node_uris, ["foo.yaml#/models/Bar"])
+        self.assertIn("common.yaml", results.oapi3_file_path_2_file_data)
+        self.assertDictEqual(results.go_file_path_2_file_data, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from ..benchmarks.spec_generator import SpecConfig, generate_specs
+from ..jroh import bundle, compiler, parser, resolver, translator
+from ..jroh.parser import InvalidSpecError
+from . import common
+from .test_parser import _dump_node
+
+
+class TestBundle(unittest.TestCase):
+    def test_round_trip(self):
+        file_path_2_file_data = {}
+        for file_path in common.example_file_paths():
+            with open(file_path, "r") as f:
+                file_path_2_file_data[file_path] = f.read()
+        file_path_2_file_data.update(
+            generate_specs(SpecConfig(namespace_count=2, cross_namespace_ref_count=1))
+        )
+        file_path_2_file_data["xyz.yaml"] = "namespace: Xyz\nxyz: 1\n"
+        results1 = parser.parse_files(file_path_2_file_data)
+        bundle_data = bundle.dump_bundle(results1.file_path_2_results)
+        results2 = parser.parse_files({"all.jrohb": bundle_data})
+        self.assertListEqual(
+            list(results2.file_path_2_results), list(file_path_2_file_data)
+        )
+        self.assertDictEqual(
+            results2.bundle_file_path_2_file_paths,
+            {"all.jrohb": list(file_path_2_file_data)},
+        )
+        self.assertListEqual(results2.ignored_node_uris, results1.ignored_node_uris)
+        self.assertIn("xyz.yaml#/xyz", results2.ignored_node_uris)
+        for spec1, spec2 in zip(results1.specs, results2.specs):
+            self.assertEqual(_dump_node(spec2), _dump_node(spec1))
+        outputs = []
+        for results in (results1, results2):
+            merged_specs = resolver.resolve_specs(results.specs).merged_specs
+            outputs.append(translator.translate_specs(merged_specs))
+        self.assertEqual(outputs[1], outputs[0])
+
+    def test_invalid_bundle(self):
+        results = parser.parse_files({"foo.yaml": "namespace: Foo\n"})
+        bundle_data = bundle.dump_bundle(results.file_path_2_results)
+        header_data, payload = bundle_data.split("\n", 1)
+        header = json.loads(header_data)
+        for bundle_data2, exception_re in (
+            ("namespace: Foo\n", r"not a bundle: file_path='foo\.jrohb'"),
+            (
+                json.dumps({**header, "format_version": 0}) + "\n" + payload,
+                r"unsupported bundle format version: file_path='foo\.jrohb' format_version=0 expected_format_version=1",
+            ),
+            (
+                header_data + "\n" + payload.replace("Foo", "Bar"),
+                r"bundle checksum mismatch: file_path='foo\.jrohb'",
+            ),
+        ):
+            with self.subTest(exception_re=exception_re):
+                with self.assertRaisesRegex(
+                    InvalidSpecError, r"^invalid specification: " + exception_re
+                ):
+                    parser.parse_files({"foo.jrohb": bundle_data2})
+                results2 = parser.parse_files(
+                    {"foo.jrohb": bundle_data2}, keep_going=True
+                )
+                self.assertEqual(len(results2.errors), 1)
+                self.assertSetEqual(results2.specs[0].broken_ids, {("namespace", "*")})
+
+    def test_bundle_command(self):
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            shared_file_path = os.path.join(temp_dir_path, "shared.yaml")
+            _write_file(shared_file_path, _SHARED_SPEC)
+            app_file_path = os.path.join(temp_dir_path, "app.yaml")
+            _write_file(app_file_path, _APP_SPEC)
+            bundle_file_path = os.path.join(temp_dir_path, "shared.jrohb")
+            stderr = io.StringIO()
+            with mock.patch.object(
+                sys,
+                "argv",
+                ["jrohc", "bundle", shared_file_path, "--out", bundle_file_path],
+            ), contextlib.redirect_stderr(stderr):
+                compiler.main()
+            self.assertIn("file_count=1", stderr.getvalue())
+            output_trees = []
+            for file_path in (shared_file_path, bundle_file_path):
+                output_dir_path = os.path.join(temp_dir_path, "output")
+                with mock.patch.object(
+                    parser, "parse_file", wraps=parser.parse_file
+                ) as parse_file:
+                    compiler._compile_files(
+                        [file_path, app_file_path],
+                        os.path.join(output_dir_path, "oapi3"),
+                        os.path.join(output_dir_path, "go") + ":example.com/x",
+                    )
+                self.assertEqual(
+                    parse_file.call_count, 2 if file_path == shared_file_path else 1
+                )
+                output_trees.append(common.read_tree(output_dir_path))
+            self.assertIn(
+                os.path.join("go", "sharedapi", "models_generated.go"), output_trees[0]
+            )
+            self.assertDictEqual(output_trees[1], output_trees[0])
+
+            _write_file(shared_file_path, "namespace: Shared\nmodels: {}\n")
+            with mock.patch.object(
+                sys,
+                "argv",
+                ["jrohc", "bundle", shared_file_path, "--out", bundle_file_path],
+            ), self.assertRaises(InvalidSpecError):
+                compiler.main()
+
+
+_SHARED_SPEC = """\
+namespace: Shared
+models:
+  Number:
+    type: int32
+    min: 1
+    example: 1
+  Unused:
+    type: string
+"""
+
+_APP_SPEC = """\
+namespace: App
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do-It:
+    service_id: Test
+    params:
+      X:
+        type: Shared.Number
+"""
+
+
+def _write_file(file_path: str, file_data: str) -> None:
+    with open(file_path, "w") as f:
+        f.write(file_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,392 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from ..jroh import api, compiler, parser, resolver
+from . import common
+
+
+class TestCompiler(unittest.TestCase):
+    def test_jobs(self):
+        file_paths = common.example_file_paths()
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            output_trees = []
+            for jobs in (1, 3):
+                output_dir_path = os.path.join(temp_dir_path, f"output{jobs}")
+                compiler._compile_files(
+                    list(file_paths),
+                    os.path.join(output_dir_path, "oapi3"),
+                    os.path.join(output_dir_path, "go")
+                    + ":"
+                    + common.EXAMPLES_GO_PACKAGE_PATH,
+                    jobs=jobs,
+                )
+                output_trees.append(common.read_tree(output_dir_path))
+            self.assertIn(os.path.join("oapi3", "common.yaml"), output_trees[0])
+            self.assertDictEqual(output_trees[1], output_trees[0])
+
+    def test_incremental_compilation(self):
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            input_dir_path = os.path.join(temp_dir_path, "input")
+            output_dir_path = os.path.join(temp_dir_path, "output")
+            os.mkdir(input_dir_path)
+            file_paths = []
+            for namespace in ("Foo", "Bar"):
+                file_path = os.path.join(input_dir_path, namespace.lower() + ".yaml")
+                _write_file(file_path, _SPEC_TEMPLATE.format(namespace=namespace))
+                file_paths.append(file_path)
+            compiler2 = compiler._Compiler(
+                os.path.join(output_dir_path, "oapi3"),
+                os.path.join(output_dir_path, "go") + ":github.com/go-tk/jroh/x",
+                None,
+                1,
+            )
+            self.assertTrue(compiler2.update_files(file_paths))
+            compiler2.compile()
+            output_tree1 = common.read_tree(output_dir_path)
+            self.assertIn(
+                os.path.join("go", "barapi", "models_generated.go"), output_tree1
+            )
+            self.assertFalse(compiler2.update_files(file_paths))
+            os.utime(file_paths[0], (1, 1))
+            self.assertFalse(compiler2.update_files(file_paths))
+
+            _write_file(file_paths[0], "namespace: 1\n")
+            with self.assertRaises(parser.InvalidSpecError):
+                compiler2.update_files(file_paths)
+            self.assertFalse(compiler2.update_files(file_paths))
+            with self.assertRaises(parser.InvalidSpecError):
+                compiler2.compile()
+
+            _write_file(
+                file_paths[0],
+                _SPEC_TEMPLATE.format(namespace="Foo").replace("int32", "int64"),
+            )
+            self.assertTrue(compiler2.update_files(file_paths))
+            output_file_path = os.path.join(
+                output_dir_path, "go", "barapi", "models_generated.go"
+            )
+            os.utime(output_file_path, (1, 1))
+            with mock.patch.object(
+                api,
+                "translate_and_generate",
+                wraps=api.translate_and_generate,
+            ) as translate_and_generate:
+                compiler2.compile()
+            merged_specs = translate_and_generate.call_args.args[0]
+            self.assertListEqual([spec.namespace for spec in merged_specs], ["Foo"])
+            self.assertEqual(os.path.getmtime(output_file_path), 1)
+            output_tree2 = common.read_tree(output_dir_path)
+            self.assertNotEqual(output_tree2, output_tree1)
+
+            file_paths.pop()
+            self.assertTrue(compiler2.update_files(file_paths))
+            compiler2.compile()
+            output_tree3 = common.read_tree(output_dir_path)
+            self.assertNotIn(
+                os.path.join("go", "barapi", "models_generated.go"), output_tree3
+            )
+
+            output_dir_path2 = os.path.join(temp_dir_path, "output2")
+            compiler._compile_files(
+                list(file_paths),
+                os.path.join(output_dir_path2, "oapi3"),
+                os.path.join(output_dir_path2, "go") + ":github.com/go-tk/jroh/x",
+            )
+            self.assertDictEqual(output_tree3, common.read_tree(output_dir_path2))
+
+            # half-saved files, parsed one by one to find out which ones are invalid
+            _write_file(file_paths[0], "namespace: Foo\nmodels: [\n")
+            file_paths.append(os.path.join(input_dir_path, "baz.json"))
+            _write_file(file_paths[1], '{"namespace": "Baz"')
+            self.assertTrue(compiler2.update_files(file_paths))
+            with self.assertRaisesRegex(
+                parser.InvalidSpecError, r"^invalid specification: malformed file:"
+            ):
+                compiler2.compile()
+
+    def test_incremental_spec_order(self):
+        # a file added sorts before the ones of its namespace compiled already, as it
+        # does when all the files are compiled from scratch
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            input_dir_path = os.path.join(temp_dir_path, "input")
+            os.mkdir(input_dir_path)
+            file_paths = []
+            for file_name, method_id in (("b.yaml", "Do-B"), ("a.yaml", "Do-A")):
+                file_path = os.path.join(input_dir_path, file_name)
+                _write_file(
+                    file_path,
+                    f"namespace: Foo\nmethods:\n  {method_id}:\n    service_id: Test\n",
+                )
+                file_paths.append(file_path)
+            _write_file(
+                file_paths[0],
+                _SPEC_TEMPLATE.format(namespace="Foo").replace("Do-It", "Do-B"),
+            )
+            output_trees = []
+            for i in range(2):
+                output_dir_path = os.path.join(temp_dir_path, f"output{i}")
+                compiler2 = compiler._Compiler(
+                    os.path.join(output_dir_path, "oapi3"),
+                    os.path.join(output_dir_path, "go") + ":github.com/go-tk/jroh/x",
+                    None,
+                    1,
+                )
+                if i == 0:
+                    self.assertTrue(compiler2.update_files(file_paths[:1]))
+                    compiler2.compile()
+                self.assertTrue(compiler2.update_files(file_paths))
+                compiler2.compile()
+                output_trees.append(common.read_tree(output_dir_path))
+            self.assertIn(
+                b"Test_DoA = 0",
+                output_trees[1][os.path.join("go", "fooapi", "misc_generated.go")],
+            )
+            self.assertDictEqual(output_trees[0], output_trees[1])
+
+    def test_imports(self):
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            file_path_2_file_data = {
+                "a.yaml": _SPEC_TEMPLATE.format(namespace="A").replace(
+                    "type: Number", "type: B.Number"
+                )
+                + "imports: [sub/b.yaml, c.yaml]\n",
+                "sub/b.yaml": "namespace: B\nimports: [../c.yaml]\nmodels:\n  Number:\n    type: struct\n    fields:\n      X:\n        type: C.Number\n",
+                "c.yaml": _SPEC_TEMPLATE.format(namespace="C"),
+                "d.yaml": _SPEC_TEMPLATE.format(namespace="D"),
+            }
+            for file_path, file_data in file_path_2_file_data.items():
+                file_path = os.path.join(temp_dir_path, file_path)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                _write_file(file_path, file_data)
+            output_dir_path = os.path.join(temp_dir_path, "output")
+            compiler2 = compiler._Compiler(
+                os.path.join(output_dir_path, "oapi3"), None, None, 1
+            )
+            root_file_path = os.path.join(temp_dir_path, "a.yaml")
+            self.assertTrue(compiler2.update_files([root_file_path]))
+            self.assertListEqual(
+                [str(results.spec.node_uri) for results in compiler2.parse_results()],
+                [
+                    os.path.join(temp_dir_path, file_path) + "#/"
+                    for file_path in ("a.yaml", "c.yaml", "sub/b.yaml")
+                ],
+            )
+            compiler2.compile()
+            self.assertSetEqual(
+                {
+                    file_path.split(os.sep)[1]
+                    for file_path in common.read_tree(output_dir_path)
+                },
+                {"a", "b", "c", "common.yaml"},
+            )
+            self.assertFalse(compiler2.update_files([root_file_path]))
+
+            _write_file(
+                os.path.join(temp_dir_path, "sub/b.yaml"),
+                "namespace: B\nmodels:\n  Number:\n    type: int32\n",
+            )
+            _write_file(
+                root_file_path,
+                file_path_2_file_data["a.yaml"].replace(", c.yaml", ""),
+            )
+            self.assertTrue(compiler2.update_files([root_file_path]))
+            self.assertEqual(len(compiler2.parse_results()), 2)
+
+            _write_file(
+                root_file_path,
+                file_path_2_file_data["a.yaml"].replace("c.yaml", "e.yaml"),
+            )
+            with self.assertRaisesRegex(
+                parser.InvalidSpecError,
+                r"imported file not found: node_uri='.*a\.yaml#/imports\[1\]' file_path='.*e\.yaml'",
+            ):
+                compiler2.update_files([root_file_path])
+
+    def test_keep_going(self):
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            file_paths = []
+            for namespace in ("Foo", "Bar"):
+                file_path = os.path.join(temp_dir_path, namespace.lower() + ".yaml")
+                _write_file(
+                    file_path,
+                    _SPEC_TEMPLATE.format(namespace=namespace).replace(
+                        "type: Number", "type: Numbr"
+                    ),
+                )
+                file_paths.append(file_path)
+            _write_file(file_paths[0], "namespace: Foo\nmodels: {}\n")
+            output_dir_path = os.path.join(temp_dir_path, "output")
+            stderr = io.StringIO()
+            with mock.patch.object(
+                sys,
+                "argv",
+                ["jrohc", *file_paths, "--oapi3_out", output_dir_path, "--keep_going"],
+            ), contextlib.redirect_stderr(stderr), self.assertRaises(
+                SystemExit
+            ) as context:
+                compiler.main()
+            self.assertEqual(context.exception.code, 1)
+            self.assertListEqual(
+                stderr.getvalue().splitlines(),
+                [
+                    f"ERROR: invalid specification: non-empty mapping required: node_uri='{file_paths[0]}#/models'",
+                    f"ERROR: invalid spec: model not found; node_uri='{file_paths[1]}#/methods/Do-It/params/X/type' namespace='Bar' model_id='Numbr'",
+                ],
+            )
+            self.assertFalse(os.path.exists(output_dir_path))
+            with self.assertRaises(parser.InvalidSpecError):
+                compiler._compile_files(file_paths, output_dir_path, None)
+
+    def test_only(self):
+        file_paths = common.example_file_paths()
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            output_dir_path = os.path.join(temp_dir_path, "output")
+            stderr = io.StringIO()
+            with mock.patch.object(
+                sys,
+                "argv",
+                [
+                    "jrohc",
+                    *file_paths,
+                    "--oapi3_out",
+                    os.path.join(output_dir_path, "oapi3"),
+                    "--go_out",
+                    os.path.join(output_dir_path, "go")
+                    + ":"
+                    + common.EXAMPLES_GO_PACKAGE_PATH,
+                    "--only",
+                    "Petstore.Store",
+                ],
+            ), contextlib.redirect_stderr(stderr):
+                compiler.main()
+            self.assertNotIn("WARNING: node unused", stderr.getvalue())
+            output_tree = common.read_tree(output_dir_path)
+            self.assertSetEqual(
+                {
+                    file_path
+                    for file_path in output_tree.keys()
+                    if file_path.startswith(
+                        ("oapi3", os.path.join("go", "petstoreapi"))
+                    )
+                },
+                {
+                    os.path.join("oapi3", "common.yaml"),
+                    os.path.join("oapi3", "petstore", "store_service.yaml"),
+                    os.path.join("oapi3", "petstore", "models.yaml"),
+                    os.path.join("go", "petstoreapi", "storeactor_generated.go"),
+                    os.path.join("go", "petstoreapi", "storeclient_generated.go"),
+                    os.path.join("go", "petstoreapi", "models_generated.go"),
+                    os.path.join("go", "petstoreapi", "misc_generated.go"),
+                },
+            )
+            models_file_data = output_tree[
+                os.path.join("go", "petstoreapi", "models_generated.go")
+            ].decode()
+            self.assertIn("type Order struct", models_file_data)
+            self.assertNotIn("type User struct", models_file_data)
+
+            with mock.patch.object(
+                sys, "argv", ["jrohc", *file_paths, "--only", "Petstore.Foo"]
+            ), self.assertRaisesRegex(
+                resolver.InvalidSpecError, r"target not found; target='Petstore\.Foo'"
+            ):
+                compiler.main()
+
+    def test_persistent_worker(self):
+        file_paths = common.example_file_paths()
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            output_dir_paths = []
+            requests = []
+            for i in range(2):
+                output_dir_path = os.path.join(temp_dir_path, f"output{i}")
+                output_dir_paths.append(output_dir_path)
+                arguments = [
+                    *file_paths,
+                    "--oapi3_out",
+                    os.path.join(output_dir_path, "oapi3"),
+                    "--go_out",
+                    os.path.join(output_dir_path, "go")
+                    + ":"
+                    + common.EXAMPLES_GO_PACKAGE_PATH,
+                ]
+                requests.append(
+                    json.dumps(
+                        {"arguments": arguments, "requestId": i}, indent=i or None
+                    )
+                )
+            requests.append(json.dumps({"arguments": [], "requestId": 2}))
+            # the invalid requests are answered, and the ones after them still are
+            requests.append("garbage")
+            requests.append(json.dumps({"arguments": [], "requestId": 3}))
+            requests.append("[1]")
+            requests.append(json.dumps({"arguments": [1], "requestId": 4}))
+            requests.append(
+                json.dumps({"arguments": [*file_paths, "--watch"], "requestId": 5})
+            )
+            process = subprocess.run(
+                [sys.executable, "-m", "src.jroh.compiler", "--persistent_worker"],
+                cwd=os.path.join(os.path.dirname(__file__), "..", ".."),
+                input="\n".join(requests) + "\n",
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            responses = [json.loads(line) for line in process.stdout.splitlines()]
+            self.assertListEqual(
+                [
+                    (response.get("requestId"), response["exitCode"])
+                    for response in responses
+                ],
+                [(0, 0), (1, 0), (2, 2), (None, 1), (3, 2), (None, 1), (4, 1), (5, 2)],
+            )
+            self.assertIn("written=21", responses[0]["output"])
+            self.assertIn(
+                "the following arguments are required", responses[2]["output"]
+            )
+            self.assertIn(
+                "invalid work request: error='Expecting value", responses[3]["output"]
+            )
+            self.assertIn(
+                "invalid work request: error='not an object'", responses[5]["output"]
+            )
+            self.assertIn(
+                "invalid work request: error='arguments not strings'",
+                responses[6]["output"],
+            )
+            self.assertIn("not allowed in work requests", responses[7]["output"])
+            output_tree = common.read_tree(output_dir_paths[0])
+            self.assertGreaterEqual(len(output_tree), 1)
+            self.assertDictEqual(common.read_tree(output_dir_paths[1]), output_tree)
+
+
+_SPEC_TEMPLATE = """\
+namespace: {namespace}
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do-It:
+    service_id: Test
+    params:
+      X:
+        type: Number
+models:
+  Number:
+    type: int32
+"""
+
+
+def _write_file(file_path: str, file_data: str) -> None:
+    with open(file_path, "w") as f:
+        f.write(file_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from .. import jroh
+from ..benchmarks.spec_generator import SpecConfig, generate_specs
+from ..jroh import compiler, go_generator, ir, parser, resolver, translator
+from ..jroh.ir import InvalidIRError
+from . import common
+from .test_parser import _dump_node
+
+
+class TestIR(unittest.TestCase):
+    def test_round_trip(self):
+        file_path_2_file_data = {}
+        for file_path in common.example_file_paths():
+            with open(file_path, "r") as f:
+                file_path_2_file_data[file_path] = f.read()
+        file_path_2_file_data.update(
+            generate_specs(
+                SpecConfig(
+                    namespace_count=2,
+                    method_count=2,
+                    model_count=2,
+                    nesting_depth=1,
+                    cross_namespace_ref_count=1,
+                )
+            )
+        )
+        specs = parser.parse_files(file_path_2_file_data).specs
+        merged_specs1 = resolver.resolve_specs(specs).merged_specs
+        ir_data = ir.dump_ir(merged_specs1)
+        merged_specs2 = ir.load_ir(ir_data)
+        self.assertEqual(ir.dump_ir(merged_specs2), ir_data)
+        # including node URIs, and the nodes linked by resolution
+        self.assertEqual(_dump_node(merged_specs2), _dump_node(merged_specs1))
+        models = [model for spec in merged_specs2 for model in spec.models]
+        errors = [error for spec in merged_specs2 for error in spec.errors]
+        for merged_spec in merged_specs2:
+            for service in merged_spec.services:
+                for method in service.methods:
+                    self.assertIn(method, merged_spec.methods)
+            for method in merged_spec.methods:
+                assert method.params is not None
+                for field in method.params.fields:
+                    if not field.type.is_primitive():
+                        self.assertIn(field.type.model, models)
+                for error_case in method.error_cases:
+                    self.assertIn(error_case.error, errors)
+        self.assertEqual(
+            translator.translate_specs(merged_specs2),
+            translator.translate_specs(merged_specs1),
+        )
+        self.assertEqual(
+            go_generator.generate_code(common.EXAMPLES_GO_PACKAGE_PATH, merged_specs2),
+            go_generator.generate_code(common.EXAMPLES_GO_PACKAGE_PATH, merged_specs1),
+        )
+
+    def test_invalid_ir(self):
+        ir_data = ir.dump_ir([])
+        file_path_2_file_data = {}
+        for file_path in common.example_file_paths():
+            with open(file_path, "r") as f:
+                file_path_2_file_data[file_path] = f.read()
+        specs = parser.parse_files(file_path_2_file_data).specs
+        raw_ir = json.loads(ir.dump_ir(resolver.resolve_specs(specs).merged_specs))
+        # well-formed, but truncated or foreign
+        raw_ir2 = {
+            **raw_ir,
+            "specs": [{**raw_spec, "models": {}} for raw_spec in raw_ir["specs"]],
+        }
+        raw_ir3 = {**raw_ir, "file_paths": []}
+        raw_ir4 = {**raw_ir, "specs": [{"name": "Foo"}]}
+        del raw_ir["specs"]
+        for ir_data2, exception_re in (
+            ("namespace: Foo\n", r"not an IR"),
+            (
+                json.dumps({**json.loads(ir_data), "format_version": 0}),
+                r"unsupported IR format version: format_version=0 expected_format_version=1",
+            ),
+            (json.dumps(raw_ir), r"malformed IR: error=KeyError\('specs'\)"),
+            (json.dumps(raw_ir2), r"malformed IR: error=KeyError\(.+\)"),
+            (json.dumps(raw_ir3), r"malformed IR: error=IndexError\(.+\)"),
+            (json.dumps(raw_ir4), r"malformed IR: error=KeyError\('namespace'\)"),
+        ):
+            with self.subTest(exception_re=exception_re):
+                with self.assertRaisesRegex(
+                    InvalidIRError, r"^invalid IR: " + exception_re + "$"
+                ):
+                    ir.load_ir(ir_data2)
+
+    def test_ir_out(self):
+        file_paths = common.example_file_paths()
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            ir_file_path = os.path.join(temp_dir_path, "specs.json")
+            for i in range(2):
+                stderr = io.StringIO()
+                with mock.patch.object(
+                    sys, "argv", ["jrohc", *file_paths, "--ir_out", ir_file_path]
+                ), contextlib.redirect_stderr(stderr):
+                    compiler.main()
+                self.assertIn(
+                    "written=1 unchanged=0" if i == 0 else "written=0 unchanged=1",
+                    stderr.getvalue(),
+                )
+            with open(ir_file_path, "r") as f:
+                merged_specs = jroh.load_ir(f.read())
+            self.assertListEqual(
+                [merged_spec.namespace for merged_spec in merged_specs],
+                ["Hello-World", "Petstore"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
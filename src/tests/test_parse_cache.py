@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from ..jroh import compiler, parser
+from ..jroh.parse_cache import ParseCache
+from . import common
+
+
+class TestParseCache(unittest.TestCase):
+    def test_byte_identical_output(self):
+        file_paths = common.example_file_paths()
+        self.assertGreaterEqual(len(file_paths), 1)
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            cache_dir_path = os.path.join(temp_dir_path, "cache")
+            output_trees = []
+            for i, use_cache in enumerate((False, True, True)):
+                output_dir_path = os.path.join(temp_dir_path, f"output{i}")
+                if use_cache:
+                    cache = ParseCache(cache_dir_path)
+                else:
+                    cache = None
+                compiler._compile_files(
+                    list(file_paths),
+                    os.path.join(output_dir_path, "oapi3"),
+                    os.path.join(output_dir_path, "go")
+                    + ":"
+                    + common.EXAMPLES_GO_PACKAGE_PATH,
+                    cache,
+                )
+                output_trees.append(common.read_tree(output_dir_path))
+            self.assertEqual(len(os.listdir(cache_dir_path)), len(file_paths))
+            self.assertGreaterEqual(len(output_trees[0]), 1)
+            self.assertDictEqual(output_trees[1], output_trees[0])
+            self.assertDictEqual(output_trees[2], output_trees[0])
+
+    def test_hit_and_miss(self):
+        file_path_2_file_data = {
+            "foo.yaml": """
+models:
+  Foo:
+    type: struct
+xyz: 1
+"""
+        }
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            cache = ParseCache(temp_dir_path)
+            results1 = parser.parse_files(file_path_2_file_data, cache)
+            self.assertIsNone(cache.get("bar.yaml", file_path_2_file_data["foo.yaml"]))
+            self.assertIsNone(cache.get("foo.yaml", "xyz: 2\n"))
+            results2 = cache.get("foo.yaml", file_path_2_file_data["foo.yaml"])
+            assert results2 is not None
+            self.assertListEqual(results2.ignored_node_uris, results1.ignored_node_uris)
+            self.assertListEqual(results2.ignored_node_uris, ["foo.yaml#/xyz"])
+            self.assertEqual(results2.spec.node_uri, "foo.yaml#/")
+            self.assertEqual(results2.spec.models[0].id, "Foo")
+            self.assertIsNot(results2.spec, results1.specs[0])
+
+    def test_lru_eviction(self):
+        file_data = "namespace: Foo\n"
+        results = parser.parse_file(file_data, "foo.yaml")
+        file_paths = ("foo.yaml", "bar.yaml", "baz.yaml")
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            cache = ParseCache(temp_dir_path)
+            for i, file_path in enumerate(file_paths):
+                cache.put(file_path, file_data, results)
+                entry_file_path = cache._make_entry_file_path(file_path, file_data)
+                os.utime(entry_file_path, (i + 1, i + 1))
+            entry_size = os.path.getsize(entry_file_path)
+            cache = ParseCache(temp_dir_path, size_limit=2 * entry_size)
+            self.assertIsNotNone(cache.get("foo.yaml", file_data))
+            cache.trim()
+            self.assertEqual(len(os.listdir(temp_dir_path)), 2)
+            self.assertIsNotNone(cache.get("foo.yaml", file_data))
+            self.assertIsNone(cache.get("bar.yaml", file_data))
+            self.assertIsNotNone(cache.get("baz.yaml", file_data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,14 @@
+import json
 import unittest
+from typing import Any
+from unittest import mock
 
+import yaml
+
+from ..benchmarks.spec_generator import SpecConfig, generate_specs
+from ..jroh import parser, resolver, translator
 from ..jroh.parser import InvalidSpecError
+from ..jroh.spec import ID_PATTERN
 from . import common
 
 
@@ -37,6 +45,24 @@ namespace: aaa
             common.TestData(
                 in_file_path_2_file_data={
                     "foo.yaml": """
+imports: foo.yaml
+"""
+                },
+                out_exception_type=InvalidSpecError,
+                out_exception_re=r"invalid specification: invalid node kind: node_uri='foo\.yaml#/imports' node_kind=string expected_node_kind=sequence",
+            ),
+            common.TestData(
+                in_file_path_2_file_data={
+                    "foo.yaml": """
+imports: [bar.yaml, ""]
+"""
+                },
+                out_exception_type=InvalidSpecError,
+                out_exception_re=r"invalid specification: string too short: node_uri='foo\.yaml#/imports\[1\]' string_length=0 min_string_length=1",
+            ),
+            common.TestData(
+                in_file_path_2_file_data={
+                    "foo.yaml": """
 services: 1
 """
                 },
@@ -1774,6 +1800,353 @@ errors:
         ]
         common.test(self, test_data_list)
 
+    def test_node_shapes(self):
+        # nodes of the same shape share a plan, unless they have null values
+        results = parser.parse_files(
+            {
+                "foo.yaml": """
+models:
+  MMM:
+    type: struct
+    fields:
+      A:
+        type: int32
+        is_optional: true
+        is_repeated: true
+        min_count: 1
+        xyz: 1
+      B:
+        type: int32
+        is_optional: null
+        is_repeated: true
+        min_count: 1
+        xyz: 1
+      C:
+        type: int32
+        is_optional: false
+        is_repeated: true
+        min_count: 1
+        xyz: 1
+      D:
+        type: Foo.Bar
+        min: 1
+        example: 1
+"""
+            }
+        )
+        self.assertEqual(
+            results.ignored_node_uris,
+            [
+                "foo.yaml#/models/MMM/fields/A/is_repeated",
+                "foo.yaml#/models/MMM/fields/A/min_count",
+                "foo.yaml#/models/MMM/fields/A/xyz",
+                "foo.yaml#/models/MMM/fields/B/xyz",
+                "foo.yaml#/models/MMM/fields/C/is_repeated",
+                "foo.yaml#/models/MMM/fields/C/min_count",
+                "foo.yaml#/models/MMM/fields/C/xyz",
+                "foo.yaml#/models/MMM/fields/D/min",
+                "foo.yaml#/models/MMM/fields/D/example",
+            ],
+        )
+        a, b, c, d = results.specs[0].models[0].struct().fields
+        self.assertEqual((a.is_optional, a.is_repeated, a.min_count), (True, False, 0))
+        self.assertEqual((b.is_optional, b.is_repeated, b.min_count), (False, True, 1))
+        self.assertEqual((c.is_optional, c.is_repeated, c.min_count), (False, False, 0))
+        self.assertEqual(d.type.model_ref().namespace, "Foo")
+        with self.assertRaisesRegex(
+            InvalidSpecError,
+            r"^invalid specification: number too small: node_uri='foo\.yaml#/models/MMM/fields/B/min_count'",
+        ):
+            parser.parse_files(
+                {
+                    "foo.yaml": """
+models:
+  MMM:
+    type: struct
+    fields:
+      A:
+        type: int32
+        is_optional: true
+        is_repeated: true
+        min_count: -1
+      B:
+        type: int32
+        is_optional: null
+        is_repeated: true
+        min_count: -1
+"""
+                }
+            )
+
+    def test_jobs(self):
+        file_path_2_file_data = {}
+        for file_path in common.example_file_paths():
+            with open(file_path, "r") as f:
+                file_path_2_file_data[file_path] = f.read()
+        file_path_2_file_data["xyz.yaml"] = "namespace: Xyz\nxyz: 1\n"
+        results_list = []
+        for jobs in (1, 3):
+            results1 = parser.parse_files(file_path_2_file_data, jobs=jobs)
+            results2 = resolver.resolve_specs(results1.specs)
+            results3 = translator.translate_specs(results2.merged_specs)
+            results_list.append(
+                (
+                    results1.ignored_node_uris,
+                    [spec.node_uri for spec in results1.specs],
+                    results3.file_path_2_file_data,
+                )
+            )
+        self.assertIn("xyz.yaml#/xyz", results_list[0][0])
+        self.assertEqual(results_list[1], results_list[0])
+        file_path_2_file_data["foo.yaml"] = "namespace: 1\n"
+        with self.assertRaisesRegex(
+            InvalidSpecError,
+            r"^invalid specification: invalid node kind: node_uri='foo\.yaml#/namespace'",
+        ):
+            parser.parse_files(file_path_2_file_data, jobs=3)
+
+    def test_keep_going(self):
+        file_path_2_file_data = {}
+        for file_path in common.example_file_paths():
+            with open(file_path, "r") as f:
+                file_path_2_file_data[file_path] = f.read()
+        for file_path, file_data in file_path_2_file_data.items():
+            results = parser.parse_file(file_data, file_path, keep_going=True)
+            self.assertListEqual(results.errors, [])
+            self.assertEqual(
+                _dump_node(results.spec),
+                _dump_node(parser.parse_file(file_data, file_path).spec),
+            )
+
+        file_path_2_file_data = {
+            "foo.yaml": """
+namespace: Foo
+services:
+  Test:
+    version: 1
+  Test2:
+    version: 1.0.0
+methods: {}
+models:
+  Bar:
+    type: struct
+    fields:
+      X:
+        type: string
+        pattern: "("
+      Y:
+        type: int32
+        min: 10
+        max: 1
+        example: 5
+      Z:
+        type: Bar
+  Qux:
+    type: enum
+    underlying_type: int32
+    constants:
+      One:
+        value: x
+      Two:
+        value: 2
+errors:
+  Oops:
+    code: 1
+    status_code: 500
+""",
+            "bar.yaml": "namespace: Bar\nmodels: [\n",
+            "baz.yaml": "",
+            "qux.yaml": "namespace: qux\nmodels:\n  X:\n    type: int32\n",
+        }
+        for jobs in (1, 3):
+            results = parser.parse_files(
+                file_path_2_file_data, jobs=jobs, keep_going=True
+            )
+            self.assertListEqual(
+                [str(error) for error in results.errors][:5],
+                [
+                    "invalid specification: invalid node kind: node_uri='foo.yaml#/services/Test/version' node_kind=integer expected_node_kind=string",
+                    "invalid specification: non-empty mapping required: node_uri='foo.yaml#/methods'",
+                    "invalid specification: invalid regular expression (re2): node_uri='foo.yaml#/models/Bar/fields/X' reg_exp='('",
+                    "invalid specification: invalid primitive constraints, min > max: node_uri='foo.yaml#/models/Bar/fields/Y' min=10 max=1",
+                    "invalid specification: invalid node kind: node_uri='foo.yaml#/models/Qux/constants/One/value' node_kind=string expected_node_kind=integer",
+                ],
+            )
+            self.assertRegex(
+                str(results.errors[5]),
+                r"^invalid specification: number too small: node_uri='foo\.yaml#/errors/Oops/code'",
+            )
+            self.assertRegex(
+                str(results.errors[6]),
+                r"^invalid specification: malformed file: node_uri='bar\.yaml#/' error=",
+            )
+            self.assertListEqual(
+                [str(error) for error in results.errors][7:],
+                [
+                    "invalid specification: invalid node kind: node_uri='baz.yaml#/' node_kind=null expected_node_kind=mapping",
+                    "invalid specification: invalid id; node_uri='qux.yaml#/namespace' id='qux' expected_pattern="
+                    + repr(ID_PATTERN.pattern),
+                ],
+            )
+            spec = results.specs[0]
+            self.assertListEqual([x.id for x in spec.services], ["Test2"])
+            self.assertListEqual(spec.methods, [])
+            self.assertListEqual([x.id for x in spec.models], ["Bar", "Qux"])
+            self.assertListEqual([x.id for x in spec.models[0].struct().fields], ["Z"])
+            self.assertListEqual(
+                [x.id for x in spec.models[1].enum().constants], ["Two"]
+            )
+            self.assertListEqual(spec.errors, [])
+            self.assertSetEqual(
+                spec.broken_ids,
+                {("services", "Test"), ("methods", "*"), ("errors", "Oops")},
+            )
+            for spec in results.specs[1:]:
+                self.assertSetEqual(spec.broken_ids, {("namespace", "*")})
+                self.assertListEqual(spec.models, [])
+        with self.assertRaisesRegex(
+            InvalidSpecError,
+            r"^invalid specification: invalid node kind: node_uri='foo\.yaml#/services/Test/version'",
+        ):
+            parser.parse_files(file_path_2_file_data)
+
+    def test_yaml_loaders(self):
+        file_path_2_file_data = {}
+        for file_path in common.example_file_paths():
+            with open(file_path, "r") as f:
+                file_path_2_file_data[file_path] = f.read()
+        file_path_2_file_data.update(
+            generate_specs(SpecConfig(namespace_count=2, cross_namespace_ref_count=1))
+        )
+        for i, file_data in enumerate(_YAML_CORPUS):
+            file_path_2_file_data[f"corpus{i}.yaml"] = file_data
+        self.assertTrue(hasattr(yaml, "CSafeLoader"))
+        for file_path, file_data in file_path_2_file_data.items():
+            with self.subTest(file_path=file_path):
+                outcomes = []
+                for yaml_loader in (yaml.SafeLoader, yaml.CSafeLoader):
+                    with mock.patch.object(parser, "_YAML_LOADER", yaml_loader):
+                        try:
+                            results = parser.parse_file(file_data, file_path)
+                        except Exception as e:
+                            outcomes.append((type(e), str(e)))
+                        else:
+                            outcomes.append(
+                                (
+                                    results.ignored_node_uris,
+                                    _dump_node(results.spec),
+                                )
+                            )
+                self.assertEqual(outcomes[1], outcomes[0])
+
+    def test_json_input(self):
+        file_path_2_file_data = {}
+        for file_path in common.example_file_paths():
+            with open(file_path, "r") as f:
+                file_path_2_file_data[file_path] = f.read()
+        file_path_2_file_data["xyz.yaml"] = "namespace: Xyz\nxyz: 1\n"
+        file_path_2_file_data2 = {
+            file_path.removesuffix(".yaml")
+            + ".json": json.dumps(yaml.safe_load(file_data))
+            for file_path, file_data in file_path_2_file_data.items()
+        }
+        results_list = []
+        for file_path_2_file_data3 in (file_path_2_file_data, file_path_2_file_data2):
+            results1 = parser.parse_files(file_path_2_file_data3)
+            results2 = resolver.resolve_specs(results1.specs)
+            results3 = translator.translate_specs(results2.merged_specs)
+            results_list.append(
+                (
+                    [
+                        node_uri.replace(".json#/", ".yaml#/")
+                        for node_uri in results1.ignored_node_uris
+                    ],
+                    results3.file_path_2_file_data,
+                )
+            )
+        self.assertIn("xyz.yaml#/xyz", results_list[0][0])
+        self.assertEqual(results_list[1], results_list[0])
+        with self.assertRaisesRegex(
+            InvalidSpecError,
+            r"^invalid specification: invalid node kind: node_uri='foo\.json#/namespace' node_kind=integer expected_node_kind=string",
+        ):
+            parser.parse_files({"foo.json": '{"namespace": 1}'})
+        for file_path, file_data in (
+            ("foo.json", "namespace: Foo\n"),
+            ("foo.yaml", "namespace: Foo\nmodels: [\n"),
+        ):
+            with self.assertRaisesRegex(
+                InvalidSpecError,
+                r"^invalid specification: malformed file: node_uri="
+                + repr(file_path + "#/").replace(".", r"\.")
+                + " error=",
+            ):
+                parser.parse_files({file_path: file_data})
+
+
+_YAML_CORPUS = [
+    "",
+    "namespace: Foo\n",
+    "namespace: Foo\nxyz: [1, 2.5, 1e3, .inf, -.nan, 0x1f, 0o17, 017]\n",
+    "namespace: Foo\nxyz: {a: yes, b: No, c: ~, d: null, e: 2001-12-14}\n",
+    "namespace: Foo\nxyz: !!binary aGVsbG8=\n",
+    "namespace: Foo\nxyz: !!set {a, b}\n",
+    'namespace: Foo\nxyz: "\\u00e9\\t\\x41"\n',
+    """\
+namespace: Foo
+services:
+  Bar: &service
+    version: 1.0.0
+  Baz: *service
+methods:
+  Do-It:
+    service_id: Bar
+    description: |
+      multi-line
+        literal
+    summary: >-
+      folded
+      text
+    params:
+      X: {type: Number, <<: {description: merged}}
+models:
+  Number:
+    type: int32
+    min: -0x10
+    example: 1_000
+""",
+    "namespace: Foo\nnamespace: Bar\n",
+    "namespace: 'Foo\n",
+    "namespace: Foo\n  xyz: 1\n",
+    "namespace: Foo\n\txyz: 1\n",
+    "- a\nb: c\n",
+    "namespace: [Foo\n",
+    "namespace: *undefined\n",
+    "namespace: !!python/name:os.system\n",
+    "--- 1\n--- 2\n",
+    "namespace: 1\n",
+    "\ufeffnamespace: Foo\n",
+]
+
+
+def _dump_node(node: Any) -> Any:
+    if isinstance(node, list):
+        return [_dump_node(x) for x in node]
+    if isinstance(node, dict):
+        return {k: _dump_node(v) for k, v in node.items()}
+    if hasattr(node, "__dict__"):
+        return (type(node).__name__, _dump_node(vars(node)))
+    if hasattr(node, "__slots__"):
+        return (
+            type(node).__name__,
+            {
+                slot: _dump_node(getattr(node, slot))
+                for cls in type(node).__mro__
+                for slot in getattr(cls, "__slots__", ())
+            },
+        )
+    return (type(node).__name__, node)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+import re2
+
+from ..jroh import go_generator, parser, patterns, resolver
+from ..jroh.parser import InvalidSpecError
+
+
+class TestPatterns(unittest.TestCase):
+    def test_registry(self):
+        registry = patterns.PatternRegistry()
+        pattern1 = registry.get("^[a-z]+$")
+        pattern2 = registry.get("[0-9]+")
+        self.assertIs(registry.get("^[a-z]+$"), pattern1)
+        self.assertEqual((pattern1.id, pattern2.id), (0, 1))
+        self.assertEqual(len(registry), 2)
+        with mock.patch.object(re2, "compile", wraps=re2.compile) as compile:
+            self.assertTrue(pattern1.is_valid())
+            self.assertTrue(pattern1.fullmatch("abc"))
+            self.assertFalse(pattern1.fullmatch("abc1"))
+            self.assertTrue(pattern2.fullmatch("123"))
+            self.assertFalse(pattern2.fullmatch("a123"))
+            self.assertEqual(compile.call_count, 2)
+        pattern3 = registry.get("(")
+        self.assertFalse(pattern3.is_valid())
+        self.assertFalse(pattern3.is_valid())
+
+    def test_anchored(self):
+        pattern = patterns.get("[a-z]+")
+        self.assertEqual(pattern.anchored().pattern, "^[a-z]+$")
+        self.assertIs(pattern.anchored(), patterns.get("^[a-z]+$"))
+        self.assertIs(patterns.get("^[a-z]+").anchored(), pattern.anchored())
+        self.assertIs(pattern.anchored().anchored(), pattern.anchored())
+
+    def test_parser_and_go_generator(self):
+        file_path_2_file_data = {
+            "foo.yaml": """
+namespace: Foo
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do:
+    service_id: Test
+    params:
+      Bar:
+        type: Bar
+models:
+  Code:
+    type: string
+    pattern: ^[A-Z]{3}$
+    example: ABC
+  Bar:
+    type: struct
+    fields:
+      X:
+        type: string
+        pattern: "[A-Z]{3}"
+        is_repeated: true
+        example: [ABC, DEF, GHI]
+      Y:
+        type: string
+        pattern: ^[A-Z]{3}$
+      Z:
+        type: Code
+"""
+        }
+        with mock.patch.object(re2, "compile", wraps=re2.compile) as compile:
+            specs = parser.parse_files(file_path_2_file_data).specs
+            self.assertLessEqual(compile.call_count, 2)
+        merged_specs = resolver.resolve_specs(specs).merged_specs
+        file_data = go_generator.generate_code(
+            "example.com/foo", merged_specs
+        ).file_path_2_file_data["fooapi/models_generated.go"]
+        self.assertEqual(file_data.count("MustCompile("), 1)
+        self.assertIn('0: regexp.MustCompile("^[A-Z]{3}$"),', file_data)
+        with self.assertRaisesRegex(
+            InvalidSpecError,
+            r"^invalid specification: unexpected string: node_uri='foo\.yaml#/models/Bar/fields/X/example\[1\]'",
+        ):
+            parser.parse_files(
+                {"foo.yaml": file_path_2_file_data["foo.yaml"].replace("DEF", "DEFG")}
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
+import json
+import random
 import unittest
 
+from ..benchmarks.spec_generator import SpecConfig, generate_specs
+from ..jroh import ir, parser, resolver
 from ..jroh.resolver import InvalidSpecError
+from ..jroh.spec import STRUCT
 from . import common
 
 
@@ -598,6 +603,684 @@ errors:
         ]
         common.test(self, test_data_list)
 
+    def test_dependency_graph(self):
+        results1 = parser.parse_files(
+            {
+                "a.yaml": """
+namespace: A
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do-It:
+    service_id: Test
+    params:
+      X:
+        type: B.X
+    error_cases:
+      E.Fail: {}
+""",
+                "b.yaml": """
+namespace: B
+models:
+  X:
+    type: struct
+    fields:
+      Y:
+        type: C.Y
+      Z:
+        type: Z
+  Z:
+    type: string
+""",
+                "c.yaml": """
+namespace: C
+models:
+  Y:
+    type: int32
+""",
+                "d.yaml": """
+namespace: D
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do-It:
+    service_id: Test
+""",
+                "e.yaml": """
+namespace: E
+errors:
+  Fail:
+    code: 1000
+    status_code: 500
+""",
+            }
+        )
+        results2 = resolver.resolve_specs(results1.specs)
+        dependency_graph = results2.dependency_graph
+        self.assertDictEqual(
+            dependency_graph.namespace_2_dependencies,
+            {"A": {"B", "E"}, "B": {"C"}, "C": set(), "D": set(), "E": set()},
+        )
+        self.assertDictEqual(
+            dependency_graph.model_2_dependencies,
+            {("B", "X"): {("C", "Y"), ("B", "Z")}},
+        )
+        self.assertSetEqual(dependency_graph.namespaces_of_files(["b.yaml"]), {"B"})
+        self.assertSetEqual(
+            dependency_graph.affected_namespaces(["b.yaml"]), {"A", "B", "C"}
+        )
+        self.assertSetEqual(
+            dependency_graph.affected_namespaces(["c.yaml"]), {"B", "C"}
+        )
+        self.assertSetEqual(
+            dependency_graph.affected_namespaces(["a.yaml"]), {"A", "B", "C", "E"}
+        )
+        self.assertSetEqual(dependency_graph.affected_namespaces(["d.yaml"]), {"D"})
+
+        results1 = parser.parse_files({"d.yaml": "namespace: D2\n"})
+        dependency_graph2 = resolver.resolve_specs(results1.specs).dependency_graph
+        self.assertSetEqual(
+            dependency_graph2.affected_namespaces(["d.yaml"], dependency_graph),
+            {"D", "D2"},
+        )
+
+    def test_only(self):
+        results1 = parser.parse_files(
+            {
+                "a.yaml": """
+namespace: A
+services:
+  Test:
+    version: 1.0.0
+  Test2:
+    version: 1.0.0
+methods:
+  Do-It:
+    service_ids: [Test, Test2]
+    params:
+      X:
+        type: B.X
+    error_cases:
+      E.Fail: {}
+  Do-It2:
+    service_id: Test2
+    params:
+      X:
+        type: B.W
+""",
+                "b.yaml": """
+namespace: B
+models:
+  X:
+    type: struct
+    fields:
+      Y:
+        type: C.Y
+  W:
+    type: string
+  V:
+    type: string
+""",
+                "c.yaml": """
+namespace: C
+models:
+  Y:
+    type: int32
+""",
+                "d.yaml": """
+namespace: D
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do-It:
+    service_id: Test
+""",
+                "e.yaml": """
+namespace: E
+errors:
+  Fail:
+    code: 1000
+    status_code: 500
+""",
+            }
+        )
+
+        def dump_merged_specs(merged_specs):
+            return {
+                merged_spec.namespace: [
+                    node.id
+                    for nodes in (
+                        merged_spec.services,
+                        merged_spec.methods,
+                        merged_spec.models,
+                        merged_spec.errors,
+                    )
+                    for node in nodes
+                ]
+                for merged_spec in merged_specs
+            }
+
+        results2 = resolver.resolve_specs(results1.specs, only=["A.Test"])
+        self.assertDictEqual(
+            dump_merged_specs(results2.merged_specs),
+            {"A": ["Test", "Do-It"], "B": ["X"], "C": ["Y"], "E": ["Fail"]},
+        )
+        self.assertListEqual(
+            [method.id for method in results2.merged_specs[0].services[0].methods],
+            ["Do-It"],
+        )
+        self.assertListEqual(results2.unused_node_uris, [])
+        self.assertDictEqual(
+            results2.dependency_graph.namespace_2_dependencies,
+            {"A": {"B", "E"}, "B": {"C"}, "C": set(), "D": set(), "E": set()},
+        )
+        results2 = resolver.resolve_specs(results1.specs, only=["A.Test2", "D"])
+        self.assertDictEqual(
+            dump_merged_specs(results2.merged_specs),
+            {
+                "A": ["Test2", "Do-It", "Do-It2"],
+                "D": ["Test", "Do-It"],
+                "B": ["X", "W"],
+                "C": ["Y"],
+                "E": ["Fail"],
+            },
+        )
+        results2 = resolver.resolve_specs(results1.specs)
+        self.assertListEqual(results2.unused_node_uris, ["b.yaml#/models/V"])
+        for target in ("A.Test3", "B", "X"):
+            with self.subTest(target=target), self.assertRaisesRegex(
+                InvalidSpecError,
+                rf"^invalid spec: target not found; target={target!r}$",
+            ):
+                resolver.resolve_specs(results1.specs, only=[target])
+
+    def test_model_recursion(self):
+        spec_template = """
+namespace: Foo
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do:
+    service_id: Test
+    params:
+      X:
+        type: A
+models:
+  A:
+    type: struct
+    fields:
+      B:
+        type: B
+      A:
+        type: A
+        {a_flag}
+  B:
+    type: struct
+    fields:
+      C:
+        type: C
+  C:
+    type: struct
+    fields:
+      B:
+        type: B
+        {b_flag}
+"""
+        for a_flag, b_flag, exception_re in (
+            ("is_optional: true", "is_repeated: true", ""),
+            ("is_repeated: true", "is_optional: true", ""),
+            (
+                "is_optional: true",
+                "is_optional: false",
+                r"^invalid spec: infinitely recursive model; node_uri='foo\.yaml#/models/B' model_ids=\['Foo\.B', 'Foo\.C'\]$",
+            ),
+            (
+                "is_optional: false",
+                "is_optional: true",
+                r"^invalid spec: infinitely recursive model; node_uri='foo\.yaml#/models/A' model_ids=\['Foo\.A'\]$",
+            ),
+        ):
+            with self.subTest(a_flag=a_flag, b_flag=b_flag):
+                specs = parser.parse_files(
+                    {"foo.yaml": spec_template.format(a_flag=a_flag, b_flag=b_flag)}
+                ).specs
+                if exception_re == "":
+                    merged_specs = resolver.resolve_specs(specs).merged_specs
+                    self.assertListEqual(
+                        [model.id for model in merged_specs[0].models], ["A", "B", "C"]
+                    )
+                else:
+                    with self.assertRaisesRegex(InvalidSpecError, exception_re):
+                        resolver.resolve_specs(specs)
+
+    def test_deep_models(self):
+        # far deeper than the recursion limit
+        depth = 10000
+        raw_models = {
+            f"M{i}": {
+                "type": "struct",
+                "fields": {"Next": {"type": f"M{i + 1}", "is_optional": True}},
+            }
+            for i in range(depth)
+        }
+        raw_models[f"M{depth}"] = {
+            "type": "struct",
+            "fields": {"First": {"type": "M0", "is_repeated": True}},
+        }
+        raw_spec = {
+            "namespace": "Foo",
+            "services": {"Test": {"version": "1.0.0"}},
+            "methods": {"Do": {"service_id": "Test", "params": {"X": {"type": "M0"}}}},
+            "models": raw_models,
+        }
+        specs = parser.parse_files({"foo.json": json.dumps(raw_spec)}).specs
+        results = resolver.resolve_specs(specs)
+        self.assertEqual(len(results.merged_specs[0].models), depth + 1)
+        self.assertListEqual(results.unused_node_uris, [])
+        self.assertEqual(
+            results.dependency_graph.model_2_dependencies[("Foo", f"M{depth}")],
+            {("Foo", "M0")},
+        )
+        raw_models[f"M{depth}"]["fields"]["First"]["is_repeated"] = False
+        specs = parser.parse_files({"foo.json": json.dumps(raw_spec)}).specs
+        # one optional field in the cycle suffices
+        resolver.resolve_specs(specs)
+        raw_models = {
+            f"M{i}": {"type": "struct", "fields": {"Next": {"type": f"M{i + 1}"}}}
+            for i in range(depth)
+        }
+        raw_models[f"M{depth}"] = {
+            "type": "struct",
+            "fields": {"First": {"type": "M0"}},
+        }
+        raw_spec["models"] = raw_models
+        specs = parser.parse_files({"foo.json": json.dumps(raw_spec)}).specs
+        with self.assertRaisesRegex(
+            InvalidSpecError, r"^invalid spec: infinitely recursive model;"
+        ):
+            resolver.resolve_specs(specs)
+
+    def test_keep_going(self):
+        file_path_2_file_data = {
+            "foo.yaml": """
+namespace: Foo
+services:
+  Test:
+    version: 1
+methods:
+  Do:
+    service_id: Test
+    params:
+      A:
+        type: Bar
+      B:
+        type: Missing
+      C:
+        type: Baz.X
+    error_cases:
+      Oops: {}
+      Other: {}
+      Other2: {}
+  Do2:
+    service_id: Test2
+models:
+  Bar:
+    type: struct
+    fields:
+      X:
+        type: string
+        pattern: "("
+errors:
+  Oops:
+    code: 1
+    status_code: 500
+  Other:
+    code: 1001
+    status_code: 500
+""",
+            "foo2.yaml": """
+namespace: Foo
+models:
+  Bar:
+    type: int32
+errors:
+  Other2:
+    code: 1001
+    status_code: 500
+""",
+        }
+        results1 = parser.parse_files(file_path_2_file_data, keep_going=True)
+        self.assertEqual(len(results1.errors), 3)
+        results2 = resolver.resolve_specs(results1.specs, keep_going=True)
+        self.assertListEqual(
+            [str(error) for error in results2.errors],
+            [
+                "invalid spec: duplicate model id; node_uri1='foo2.yaml#/models/Bar' node_uri2='foo.yaml#/models/Bar'",
+                "invalid spec: duplicate error code; node_uri1='foo2.yaml#/errors/Other2/code' node_uri2='foo.yaml#/errors/Other/code' error_code=1001",
+                "invalid spec: model not found; node_uri='foo.yaml#/methods/Do/params/B/type' namespace='Foo' model_id='Missing'",
+                "invalid spec: model not found; node_uri='foo.yaml#/methods/Do/params/C/type' namespace='Baz' model_id='X'",
+                "invalid spec: error code conflict; node_uri1='foo.yaml#/methods/Do/error_cases/Other2' node_uri2='foo.yaml#/methods/Do/error_cases/Other' error_code=1001",
+                "invalid spec: service not found; node_uri='foo.yaml#/methods/Do2/service_ids[0]' service_id='Test2'",
+            ],
+        )
+        with self.assertRaisesRegex(
+            InvalidSpecError, r"^invalid spec: duplicate model id;"
+        ):
+            resolver.resolve_specs(results1.specs)
+
+        file_path_2_file_data["foo2.yaml"] = "namespace: Foo\n"
+        results1 = parser.parse_files(file_path_2_file_data, keep_going=True)
+        results2 = resolver.resolve_specs(results1.specs, keep_going=True)
+        self.assertListEqual(
+            [str(error) for error in results2.errors],
+            [
+                "invalid spec: model not found; node_uri='foo.yaml#/methods/Do/params/B/type' namespace='Foo' model_id='Missing'",
+                "invalid spec: model not found; node_uri='foo.yaml#/methods/Do/params/C/type' namespace='Baz' model_id='X'",
+                "invalid spec: error not found; node_uri='foo.yaml#/methods/Do/error_cases/Other2' namespace='Foo' error_id='Other2'",
+                "invalid spec: service not found; node_uri='foo.yaml#/methods/Do2/service_ids[0]' service_id='Test2'",
+            ],
+        )
+
+        # any model may be in a file which can't be parsed
+        file_path_2_file_data["bar.yaml"] = "namespace: Bar\nmodels: [\n"
+        results1 = parser.parse_files(file_path_2_file_data, keep_going=True)
+        results2 = resolver.resolve_specs(results1.specs, keep_going=True)
+        self.assertListEqual(results2.errors, [])
+
+    def test_incremental(self):
+        # differential: after each change, the results are the ones of resolving all
+        # the specs from scratch
+        generated_file_path_2_file_data = generate_specs(
+            SpecConfig(
+                namespace_count=3,
+                service_count=1,
+                method_count=2,
+                model_count=3,
+                field_count=3,
+            )
+        )
+        file_paths = ["a.yaml", "b.yaml", "c.yaml", "d.yaml", "e.yaml"]
+        for only in (None, ["Foo.Test", "Bar"]):
+            for seed in range(3):
+                with self.subTest(only=only, seed=seed):
+                    rand = random.Random(seed)
+                    resolver1 = resolver.IncrementalResolver(True, only)
+                    resolver2 = resolver.IncrementalResolver(False, only)
+                    file_path_2_file_data: dict[str, str] = {}
+                    for _ in range(60):
+                        if rand.random() < 0.2:
+                            file_path = rand.choice(
+                                list(generated_file_path_2_file_data)
+                            )
+                            file_data = generated_file_path_2_file_data[file_path]
+                        else:
+                            file_path = rand.choice(file_paths)
+                            file_data = rand.choice(_INCREMENTAL_FILE_DATAS)
+                        if file_path not in file_path_2_file_data:
+                            file_path_2_file_data[file_path] = file_data
+                            for resolver3 in (resolver1, resolver2):
+                                resolver3.add_spec(_parse_spec(file_path, file_data))
+                        elif rand.random() < 0.3:
+                            del file_path_2_file_data[file_path]
+                            for resolver3 in (resolver1, resolver2):
+                                resolver3.remove_spec(file_path)
+                        else:
+                            file_path_2_file_data[file_path] = file_data
+                            for resolver3 in (resolver1, resolver2):
+                                resolver3.replace_spec(
+                                    _parse_spec(file_path, file_data)
+                                )
+                        results1 = resolver1.resolve()
+                        _check_links(self, results1.merged_specs)
+                        # the specs are in the order of their file paths, not in
+                        # the one they are added in
+                        specs = parser.parse_files(
+                            dict(sorted(file_path_2_file_data.items())),
+                            keep_going=True,
+                        ).specs
+                        results2 = resolver.resolve_specs(specs, True, only)
+                        self.assertEqual(
+                            _dump_results(results1), _dump_results(results2)
+                        )
+                        # the error raised is the one raised first from scratch
+                        try:
+                            resolver.resolve_specs(specs, False, only)
+                        except InvalidSpecError as e:
+                            with self.assertRaises(InvalidSpecError) as cm:
+                                resolver2.resolve()
+                            self.assertEqual(str(cm.exception), str(e))
+                        else:
+                            self.assertListEqual(results1.errors, [])
+                            resolver2.resolve()
+
+    def test_incremental_first_error(self):
+        # the error raised is the one resolve_specs raises first, though the errors of
+        # Foo are kept track of before the ones of Bar
+        file_path_2_file_data = {
+            "b.yaml": """
+namespace: Bar
+models:
+  Item:
+    type: struct
+    fields:
+      X:
+        type: Missing
+""",
+            "a.yaml": """
+namespace: Foo
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do:
+    service_id: Test
+    params:
+      X:
+        type: Bar.Item
+  Do2:
+    service_id: Test
+    error_cases:
+      Missing: {}
+""",
+        }
+        resolver1 = resolver.IncrementalResolver()
+        for file_path, file_data in file_path_2_file_data.items():
+            resolver1.add_spec(_parse_spec(file_path, file_data))
+        for _ in range(2):
+            with self.assertRaisesRegex(
+                InvalidSpecError,
+                r"^invalid spec: model not found; node_uri='b\.yaml#/models/Item/fields/X/type' namespace='Bar' model_id='Missing'$",
+            ):
+                resolver1.resolve()
+
+
+def _parse_spec(file_path, file_data):
+    return parser.parse_files({file_path: file_data}, keep_going=True).specs[0]
+
+
+def _dump_results(results):
+    dependency_graph = results.dependency_graph
+    return (
+        ir.dump_ir(results.merged_specs),
+        results.unused_node_uris,
+        sorted(str(error) for error in results.errors),
+        dependency_graph.file_path_2_namespace,
+        dependency_graph.namespace_2_dependencies,
+        dependency_graph.model_2_dependencies,
+    )
+
+
+def _check_links(test_case, merged_specs):
+    # the refs of the merged specs are linked to their nodes
+    models = {id(model) for spec in merged_specs for model in spec.models}
+    errors = {id(error) for spec in merged_specs for error in spec.errors}
+    fields_list = []
+    for spec in merged_specs:
+        for method in spec.methods:
+            if method.params is not None:
+                fields_list.append(method.params.fields)
+            if method.results is not None:
+                fields_list.append(method.results.fields)
+            for error_case in method.error_cases:
+                if error_case.error is not None:
+                    test_case.assertIn(id(error_case.error), errors)
+                    test_case.assertEqual(error_case.error.id, error_case.error_ref.id)
+        for model in spec.models:
+            if model.type == STRUCT:
+                fields_list.append(model.struct().fields)
+    for fields in fields_list:
+        for field in fields:
+            model = field.type.model
+            if model is not None:
+                test_case.assertIn(id(model), models)
+                test_case.assertEqual(model.id, field.type.model_ref().id)
+
+
+_INCREMENTAL_FILE_DATAS = [
+    """
+namespace: Foo
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Do:
+    service_id: Test
+    params:
+      X:
+        type: Bar.Item
+      Y:
+        type: Local
+    error_cases:
+      Oops: {}
+      Bar.Oops: {}
+models:
+  Local:
+    type: struct
+    fields:
+      Z:
+        type: Baz.Deep
+        is_optional: true
+  Unused:
+    type: string
+errors:
+  Oops:
+    code: 1
+    status_code: 500
+""",
+    """
+namespace: Foo
+services:
+  Test2:
+    version: 1.0.0
+methods:
+  Do2:
+    service_id: Test2
+    results:
+      X:
+        type: Qux.X
+      Y:
+        type: Local
+  Do3:
+    service_ids: [Test, Test3]
+models:
+  Local:
+    type: int32
+errors:
+  Oops2:
+    code: 1
+    status_code: 500
+""",
+    """
+namespace: Bar
+services:
+  Test:
+    version: 1.0.0
+methods:
+  Get:
+    service_id: Test
+    results:
+      Item:
+        type: Item
+models:
+  Item:
+    type: struct
+    fields:
+      Next:
+        type: Baz.Deep
+      Back:
+        type: Foo.Local
+        is_repeated: true
+errors:
+  Oops:
+    code: 2
+    status_code: 500
+""",
+    """
+namespace: Bar
+models:
+  Item:
+    type: string
+  Other:
+    type: struct
+    fields:
+      Item:
+        type: Item
+""",
+    """
+namespace: Bar
+models:
+  Item:
+    type: struct
+    fields: 1
+""",
+    """
+namespace: Baz
+models:
+  Deep:
+    type: struct
+    fields:
+      Item:
+        type: Bar.Item
+      Self:
+        type: Deep
+        is_optional: true
+""",
+    """
+namespace: Baz
+models:
+  Deep:
+    type: struct
+    fields:
+      Self:
+        type: Deep
+""",
+    """
+namespace: Baz
+models:
+  Deep:
+    type: enum
+    underlying_type: int32
+    constants:
+      One:
+        value: 1
+""",
+    """
+namespace: Qux
+models:
+  X:
+    type: struct
+    fields:
+      Y:
+        type: Foo.Local
+""",
+    "namespace: Qux\nmodels: [\n",
+    "namespace: Foo\n",
+]
+
 
 if __name__ == "__main__":
     unittest.main()
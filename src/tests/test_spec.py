@@ -0,0 +1,80 @@
+import pickle
+import unittest
+
+from ..jroh import parser
+from ..jroh.spec import NO_PRIMITIVE_CONSTRAINTS, NodeURI
+
+
+class TestNodeURI(unittest.TestCase):
+    def test_node_uri(self):
+        node_uri1 = NodeURI("foo.yaml#/")
+        node_uri2 = node_uri1 + "models"
+        node_uri3 = node_uri2 + "/Bar"
+        node_uri4 = node_uri3 + "/fields" + "/X" + "/example" + "[1]"
+        self.assertEqual(str(node_uri1), "foo.yaml#/")
+        self.assertEqual(str(node_uri4), "foo.yaml#/models/Bar/fields/X/example[1]")
+        self.assertEqual(repr(node_uri3), repr("foo.yaml#/models/Bar"))
+        self.assertEqual(f"node_uri={node_uri3!r}", "node_uri='foo.yaml#/models/Bar'")
+        self.assertEqual(node_uri3, "foo.yaml#/models/Bar")
+        self.assertEqual("foo.yaml#/models/Bar", node_uri3)
+        self.assertEqual(node_uri3, NodeURI("foo.yaml#/models/Bar"))
+        self.assertNotEqual(node_uri3, node_uri2)
+        self.assertNotEqual(node_uri3, 1)
+        self.assertEqual(hash(node_uri3), hash("foo.yaml#/models/Bar"))
+        node_uri5 = pickle.loads(pickle.dumps(node_uri4))
+        self.assertEqual(node_uri5, node_uri4)
+        self.assertFalse(hasattr(node_uri5, "__dict__"))
+
+
+class TestSpec(unittest.TestCase):
+    def test_slots(self):
+        results = parser.parse_files(
+            {
+                "foo.yaml": """
+namespace: Foo
+models:
+  Bar:
+    type: struct
+    fields:
+      X:
+        type: int32
+      Y:
+        type: int32
+        min: 1
+      Z:
+        type: string
+        is_optional: true
+      W:
+        type: int32
+        min: 1
+      V:
+        type: int64
+        min: 1
+  Code:
+    type: string
+  Pattern:
+    type: string
+    pattern: ^[a-z]+$
+"""
+            }
+        )
+        spec2 = pickle.loads(pickle.dumps(results.specs[0]))
+        for spec3 in (results.specs[0], spec2):
+            self.assertFalse(hasattr(spec3, "__dict__"))
+            bar, code, pattern = spec3.models
+            self.assertFalse(hasattr(bar, "__dict__"))
+            x, y, z, w, v = bar.struct().fields
+            for field in (x, y, z, w, v):
+                self.assertFalse(hasattr(field, "__dict__"))
+                self.assertFalse(hasattr(field.type, "__dict__"))
+            self.assertIs(x.constraints, z.constraints)
+            self.assertIs(x.constraints, NO_PRIMITIVE_CONSTRAINTS)
+            self.assertEqual(y.constraints.min, 1)
+            self.assertIs(w.constraints, y.constraints)
+            self.assertIsNot(v.constraints, NO_PRIMITIVE_CONSTRAINTS)
+            self.assertIs(code.xprimit().constraints, NO_PRIMITIVE_CONSTRAINTS)
+            self.assertEqual(pattern.xprimit().constraints.pattern, "^[a-z]+$")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from ..benchmarks.spec_generator import SpecConfig, generate_specs
+from ..jroh import go_generator, parser, resolver, translator
+
+
+class TestSpecGenerator(unittest.TestCase):
+    def test_generate_specs(self):
+        config = SpecConfig(
+            namespace_count=4, cross_namespace_ref_count=2, nesting_depth=3
+        )
+        file_path_2_file_data = generate_specs(config)
+        self.assertEqual(len(file_path_2_file_data), 4)
+        self.assertDictEqual(generate_specs(config), file_path_2_file_data)
+        results1 = parser.parse_files(file_path_2_file_data)
+        self.assertListEqual(results1.ignored_node_uris, [])
+        results2 = resolver.resolve_specs(results1.specs)
+        self.assertListEqual(results2.unused_node_uris, [])
+        self.assertSetEqual(
+            results2.dependency_graph.namespace_2_dependencies["Ns3"], {"Ns2", "Ns1"}
+        )
+        results3 = translator.translate_specs(results2.merged_specs)
+        self.assertIn("ns3/service0_service.yaml", results3.file_path_2_file_data)
+        results4 = go_generator.generate_code(
+            "example.com/bench", results2.merged_specs
+        )
+        self.assertGreaterEqual(len(results4.file_path_2_file_data), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
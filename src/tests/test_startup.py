@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from ..benchmarks import startup
+from . import common
+
+
+class TestStartup(unittest.TestCase):
+    def test_cold_start(self):
+        # the time budget is checked by the benchmark, as timings are too noisy here
+        _, module_2_import_time = startup.measure_import_time()
+        heavy_modules = {
+            module
+            for module in module_2_import_time.keys()
+            if module.split(".", 1)[0] in startup.HEAVY_MODULES
+        }
+        self.assertSetEqual(heavy_modules, set())
+
+    def test_heavy_modules(self):
+        file_path = os.path.join(
+            common.EXAMPLES_DIR_PATH, "1-hello_world", "greeter_service.yaml"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            oapi3_out = os.path.join(temp_dir_path, "oapi3")
+            for argv, exit_code, heavy_modules in (
+                (["--help"], 0, set()),
+                ([], 2, set()),
+                ([file_path, "--jobs", "0"], 2, set()),
+                ([file_path, "--oapi3_out", oapi3_out], 0, {"yaml"}),
+            ):
+                with self.subTest(argv=argv):
+                    exit_code2, modules = startup.run_compiler(argv)
+                    self.assertEqual(exit_code2, exit_code)
+                    heavy_modules2 = {
+                        module for module in modules if module in startup.HEAVY_MODULES
+                    }
+                    self.assertSetEqual(heavy_modules2, heavy_modules)
+            self.assertTrue(os.path.isdir(oapi3_out))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+from ..jroh import compiler, timings
+from . import common
+
+
+class TestTimings(unittest.TestCase):
+    def test_compile_files(self):
+        for jobs in (1, 3):
+            with self.subTest(
+                jobs=jobs
+            ), tempfile.TemporaryDirectory() as temp_dir_path:
+                timings.enable()
+                try:
+                    compiler._compile_files(
+                        common.example_file_paths(),
+                        os.path.join(temp_dir_path, "oapi3"),
+                        os.path.join(temp_dir_path, "go")
+                        + ":"
+                        + common.EXAMPLES_GO_PACKAGE_PATH,
+                        jobs=jobs,
+                    )
+                    timings_file_path = os.path.join(temp_dir_path, "timings.json")
+                    timings.dump(timings_file_path)
+                finally:
+                    timings.disable()
+                with open(timings_file_path, "r") as f:
+                    records = json.load(f)
+                self.assertSetEqual(
+                    set(records.keys()),
+                    {
+                        timings.STAGE,
+                        timings.INPUT_FILE,
+                        timings.NAMESPACE,
+                        timings.OUTPUT_FILE,
+                        timings.TEMPLATE,
+                        timings.SUBPROCESS,
+                    },
+                )
+                self.assertSetEqual(
+                    set(records[timings.STAGE].keys()),
+                    {"load", "parse", "resolve", "translate_and_generate", "write"},
+                )
+                self.assertIn("Petstore/generation", records[timings.NAMESPACE])
+                self.assertIn("gofmt", records[timings.SUBPROCESS])
+                for name_2_record in records.values():
+                    for record in name_2_record.values():
+                        self.assertSetEqual(
+                            set(record.keys()), {"wall_time", "cpu_time", "count"}
+                        )
+                        self.assertGreaterEqual(record["count"], 1)
+
+    def test_disabled(self):
+        self.assertFalse(timings.enabled())
+        with timings.measure(timings.STAGE, "foo"):
+            pass
+        timings.add(timings.STAGE, "foo", 1.0, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from ..jroh import writer
+
+_HEADER = "# File generated by test. DO NOT EDIT.\n"
+
+
+class TestWriter(unittest.TestCase):
+    def test_write_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            results = writer.write_files(
+                temp_dir_path,
+                {"a/x.yaml": "x: 1\n", "a/y.yaml": "y: 1\n", "b/z.yaml": "z: 1\n"},
+                _HEADER,
+                ["*/*.yaml"],
+            )
+            self.assertEqual(len(results.written_file_paths), 3)
+            with open(os.path.join(temp_dir_path, "a", "user.yaml"), "w") as f:
+                f.write("user: 1\n")
+            x_file_path = os.path.join(temp_dir_path, "a", "x.yaml")
+            os.utime(x_file_path, (1, 1))
+            results = writer.write_files(
+                temp_dir_path,
+                {"a/x.yaml": "x: 1\n", "a/y.yaml": "y: 2\n"},
+                _HEADER,
+                ["*/*.yaml"],
+            )
+            self.assertListEqual(
+                results.unchanged_file_paths, [os.path.join(temp_dir_path, "a/x.yaml")]
+            )
+            self.assertListEqual(
+                results.written_file_paths, [os.path.join(temp_dir_path, "a/y.yaml")]
+            )
+            self.assertListEqual(
+                results.deleted_file_paths, [os.path.join(temp_dir_path, "b/z.yaml")]
+            )
+            self.assertEqual(os.path.getmtime(x_file_path), 1)
+            self.assertListEqual(sorted(os.listdir(temp_dir_path)), ["a"])
+            self.assertListEqual(
+                sorted(os.listdir(os.path.join(temp_dir_path, "a"))),
+                ["user.yaml", "x.yaml", "y.yaml"],
+            )
+            with open(os.path.join(temp_dir_path, "a", "y.yaml"), "r") as f:
+                self.assertEqual(f.read(), _HEADER + "y: 2\n")
+
+    def test_format_files(self):
+        def format_files(file_paths: list[str]) -> None:
+            for file_path in file_paths:
+                with open(file_path, "r+") as f:
+                    file_data = f.read().upper()
+                    f.seek(0)
+                    f.write(file_data)
+
+        with tempfile.TemporaryDirectory() as temp_dir_path:
+            for i in range(2):
+                results = writer.write_files(
+                    temp_dir_path,
+                    {"a/x.go": "package a\n"},
+                    "// header\n\n",
+                    ["*/*.go"],
+                    format_files,
+                )
+                self.assertEqual(len(results.written_file_paths), 1 - i)
+                self.assertEqual(len(results.unchanged_file_paths), i)
+            self.assertListEqual(os.listdir(os.path.join(temp_dir_path, "a")), ["x.go"])
+            with open(os.path.join(temp_dir_path, "a", "x.go"), "r") as f:
+                self.assertEqual(f.read(), "// HEADER\n\nPACKAGE A\n")
+
+
+if __name__ == "__main__":
+    unittest.main()